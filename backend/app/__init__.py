@@ -1 +1,5 @@
 # Candidate Profile API
+import time
+
+# Reference point for the cold-start report logged at startup
+IMPORT_STARTED = time.perf_counter()
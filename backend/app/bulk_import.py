@@ -0,0 +1,276 @@
+"""
+Streaming NDJSON bulk import for profiles.
+Lines are parsed incrementally, validated with ProfileCreate in a worker
+thread and written in unordered bulk_write batches with bounded concurrency,
+so memory stays proportional to batch_size * concurrency however large the
+input is.
+
+Run with: python -m app.bulk_import profiles.ndjson [--batch-size N] [--concurrency N] [--upsert]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+from motor.motor_asyncio import AsyncIOMotorClient
+from pydantic import ValidationError
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from .changes import TOUCH, insert_operation
+from .config import get_settings
+from .models import ProfileCreate, assign_item_ids
+
+settings = get_settings()
+
+# Cap on per-batch error details so a bad file can't bloat the report
+MAX_ERRORS_PER_BATCH = 20
+MAX_LINE_BYTES = 1024 * 1024
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Split a byte stream into (line_number, line) pairs without buffering it whole.
+    Lines longer than MAX_LINE_BYTES are dropped and yielded as None.
+    """
+    buffer = b""
+    line_number = 0
+    oversized = False
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            yield line_number, None if oversized else line
+            oversized = False
+        if len(buffer) > MAX_LINE_BYTES:
+            buffer = b""
+            oversized = True
+    if buffer or oversized:
+        yield line_number + 1, None if oversized else buffer
+
+
+async def iter_file_chunks(stream, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+    """Read a binary file object in chunks."""
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+
+class BatchReport:
+    """Outcome of one bulk_write batch."""
+
+    def __init__(self, number: int, first_line: int):
+        self.number = number
+        self.first_line = first_line
+        self.last_line = first_line
+        self.received = 0
+        self.written = 0
+        self.validation_errors: List[dict] = []
+        self.write_errors: List[dict] = []
+        self.failed = 0
+
+    def add_error(self, errors: List[dict], line: int, message: str):
+        self.failed += 1
+        if len(errors) < MAX_ERRORS_PER_BATCH:
+            errors.append({"line": line, "error": message})
+
+    def fail_write(self, lines: List[int], message: str):
+        """Count every line of a batch whose bulk_write raised as failed."""
+        for line in lines:
+            self.add_error(self.write_errors, line, message)
+
+    def to_dict(self) -> dict:
+        return {
+            "batch": self.number,
+            "lines": [self.first_line, self.last_line],
+            "received": self.received,
+            "written": self.written,
+            "failed": self.failed,
+            "validation_errors": self.validation_errors,
+            "write_errors": self.write_errors,
+        }
+
+
+class ImportReport:
+    """Per-batch reports plus a throughput summary."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.batches: List[BatchReport] = []
+
+    def summary(self) -> dict:
+        elapsed = time.perf_counter() - self.started
+        written = sum(b.written for b in self.batches)
+        return {
+            "lines": sum(b.received for b in self.batches),
+            "written": written,
+            "failed": sum(b.failed for b in self.batches),
+            "batches": len(self.batches),
+            "elapsed_seconds": round(elapsed, 3),
+            "records_per_second": round(written / elapsed, 1) if elapsed else 0.0,
+        }
+
+    def to_dict(self) -> dict:
+        return {
+            "summary": self.summary(),
+            # Clean batches add nothing beyond the summary
+            "batches": [b.to_dict() for b in self.batches if b.failed],
+        }
+
+
+def _operation(document: dict, upsert: bool):
+    if upsert:
+        return UpdateOne(
+            {"email": document["email"]},
+            {"$set": document, "$currentDate": TOUCH, "$inc": {"version": 1}},
+            upsert=True,
+        )
+    return insert_operation({**document, "version": 1})
+
+
+async def _write_batch(collection, batch: BatchReport, lines: List[int], operations: list):
+    try:
+        result = await collection.bulk_write(operations, ordered=False)
+        batch.written = result.inserted_count + result.upserted_count + result.modified_count
+    except BulkWriteError as e:
+        details = e.details
+        batch.written = (
+            details.get("nInserted", 0) + details.get("nUpserted", 0) + details.get("nModified", 0)
+        )
+        for error in details.get("writeErrors", []):
+            batch.add_error(batch.write_errors, lines[error["index"]], error.get("errmsg", ""))
+
+
+def _parse_batch(batch: BatchReport, raw: Iterable[Tuple[int, Optional[bytes]]], upsert: bool):
+    lines, operations = [], []
+    for line_number, line in raw:
+        batch.received += 1
+        if line is None:
+            message = f"Line exceeds {MAX_LINE_BYTES} bytes"
+            batch.add_error(batch.validation_errors, line_number, message)
+            continue
+        try:
+            profile = ProfileCreate.model_validate(json.loads(line))
+        except json.JSONDecodeError as e:
+            batch.add_error(batch.validation_errors, line_number, f"Invalid JSON: {e.msg}")
+            continue
+        except UnicodeDecodeError as e:
+            batch.add_error(batch.validation_errors, line_number, f"Invalid UTF-8: {e.reason}")
+            continue
+        except ValidationError as e:
+            batch.add_error(batch.validation_errors, line_number, str(e.errors()[0]["msg"]))
+            continue
+        lines.append(line_number)
+        operations.append(_operation(assign_item_ids(profile.model_dump()), upsert))
+    return lines, operations
+
+
+async def import_profiles(
+    collection,
+    lines: AsyncIterator[Tuple[int, Optional[bytes]]],
+    batch_size: int = None,
+    concurrency: int = None,
+    upsert: bool = False,
+) -> ImportReport:
+    """
+    Import NDJSON profile lines into a collection.
+    At most `concurrency` batches are in flight; reading pauses until one
+    finishes, which bounds memory for arbitrarily large inputs.
+    """
+    batch_size = batch_size or settings.import_batch_size
+    semaphore = asyncio.Semaphore(concurrency or settings.import_concurrency)
+    report = ImportReport()
+    tasks = set()
+
+    async def flush(batch: BatchReport, raw: List[Tuple[int, bytes]]):
+        written_lines = [line_number for line_number, _ in raw]
+        try:
+            # Validation is CPU-bound; keep it off the event loop
+            written_lines, operations = await asyncio.to_thread(_parse_batch, batch, raw, upsert)
+            if operations:
+                await _write_batch(collection, batch, written_lines, operations)
+        except Exception as e:
+            # Network errors and timeouts don't say which rows landed; report
+            # the batch failed rather than let the task swallow the error
+            batch.fail_write(written_lines, f"Batch failed: {e}")
+        finally:
+            semaphore.release()
+
+    pending: List[Tuple[int, bytes]] = []
+    try:
+        async for line_number, line in lines:
+            if line is not None and not line.strip():
+                continue
+            pending.append((line_number, line))
+            if len(pending) >= batch_size:
+                await semaphore.acquire()
+                batch = BatchReport(len(report.batches) + 1, pending[0][0])
+                batch.last_line = line_number
+                report.batches.append(batch)
+                task = asyncio.create_task(flush(batch, pending))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                pending = []
+    except BaseException:
+        # The input failed (or the request was cancelled): stop the batches in flight
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+    if pending:
+        await semaphore.acquire()
+        batch = BatchReport(len(report.batches) + 1, pending[0][0])
+        batch.last_line = pending[-1][0]
+        report.batches.append(batch)
+        await flush(batch, pending)
+
+    if tasks:
+        await asyncio.gather(*tasks)
+    return report
+
+
+async def run_import(path: str, batch_size: int, concurrency: int, upsert: bool):
+    """Import an NDJSON file (or stdin with '-') and print the report."""
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    db = client[settings.database_name]
+
+    stream = sys.stdin.buffer if path == "-" else open(path, "rb")
+    try:
+        report = await import_profiles(
+            db.profiles,
+            iter_lines(iter_file_chunks(stream)),
+            batch_size=batch_size,
+            concurrency=concurrency,
+            upsert=upsert,
+        )
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+        client.close()
+
+    for batch in report.to_dict()["batches"]:
+        print(f"✗ Batch {batch['batch']} (lines {batch['lines'][0]}-{batch['lines'][1]}): "
+              f"{batch['failed']} failed")
+        for error in batch["validation_errors"] + batch["write_errors"]:
+            print(f"    line {error['line']}: {error['error']}")
+    summary = report.summary()
+    print(f"✓ Imported {summary['written']} of {summary['lines']} profiles "
+          f"in {summary['elapsed_seconds']}s ({summary['records_per_second']} records/s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import profiles from NDJSON")
+    parser.add_argument("path", help="NDJSON file, one profile per line ('-' for stdin)")
+    parser.add_argument("--batch-size", type=int, default=settings.import_batch_size)
+    parser.add_argument("--concurrency", type=int, default=settings.import_concurrency)
+    parser.add_argument("--upsert", action="store_true", help="Update existing profiles matched by email")
+    args = parser.parse_args()
+    asyncio.run(run_import(args.path, args.batch_size, args.concurrency, args.upsert))
+
+
+if __name__ == "__main__":
+    main()
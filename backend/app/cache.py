@@ -0,0 +1,216 @@
+"""
+In-process snapshot cache for the candidate profile document.
+Read endpoints get the decoded profile from here instead of calling
+find_one() on every request. Write handlers invalidate the snapshot, and a
+TTL bounds staleness when a write happens in another process.
+"""
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+from .config import get_settings
+from .database import get_database
+
+settings = get_settings()
+
+
+class ItemEdit(NamedTuple):
+    """One list entry changed by a write: None for `old` on an add, for `new` on a delete."""
+    section: str
+    old: Optional[dict]
+    new: Optional[dict]
+
+
+def _entry(document: dict, section: str, item_id: str) -> Optional[dict]:
+    return next((item for item in document.get(section) or [] if item.get("id") == item_id), None)
+
+
+class ProfileSnapshot:
+    """A loaded profile document plus structures derived from it."""
+
+    def __init__(
+        self,
+        document: Optional[dict],
+        version: int,
+        previous: Optional["ProfileSnapshot"] = None,
+        edit: Optional[ItemEdit] = None,
+    ):
+        self.document = document
+        self.version = version
+        # The single entry change that turned the previous snapshot into this
+        # one, when known, so builders can update instead of re-diffing
+        self.edit = edit
+        self.loaded_at = time.monotonic()
+        self._derived: Dict[str, Any] = {}
+        self._building: Dict[str, asyncio.Future] = {}
+        # Structures built for the snapshot this one replaced, for incremental rebuilds
+        self._previous_derived: Dict[str, Any] = dict(previous._derived) if previous else {}
+
+    def derive(self, name: str, builder: Callable[[Optional[dict], Any], Any]) -> Any:
+        """
+        Return the structure registered under name, building it on first use.
+        The builder receives the document and the value built for the previous
+        snapshot (or None), so it can reuse work that is still valid.
+        """
+        if name not in self._derived:
+            previous = self._previous_derived.pop(name, None)
+            self._derived[name] = builder(self.document, previous)
+        return self._derived[name]
+
+    async def derive_in_executor(
+        self,
+        name: str,
+        builder: Callable[[Optional[dict], Any], Any],
+        executor: Optional[Executor] = None,
+    ) -> Any:
+        """
+        Like derive(), but run the builder in an executor so an expensive
+        build never blocks the event loop. Concurrent callers share one build.
+        """
+        if name in self._derived:
+            return self._derived[name]
+        building = self._building.get(name)
+        if building is None:
+            previous = self._previous_derived.pop(name, None)
+            loop = asyncio.get_running_loop()
+            building = loop.run_in_executor(executor, builder, self.document, previous)
+            self._building[name] = building
+        try:
+            # A cancelled request must not cancel the build other requests wait on
+            value = await asyncio.shield(building)
+        finally:
+            if building.done():
+                self._building.pop(name, None)
+        self._derived[name] = value
+        return value
+
+
+class ProfileCache:
+    """Process-local cache holding a single profile snapshot."""
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._snapshot: Optional[ProfileSnapshot] = None
+        self._retired: Optional[ProfileSnapshot] = None
+        self._version = 0
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self, snapshot: Optional[ProfileSnapshot]) -> bool:
+        if snapshot is None or self.ttl_seconds <= 0:
+            return False
+        return time.monotonic() - snapshot.loaded_at < self.ttl_seconds
+
+    async def get(self) -> ProfileSnapshot:
+        """Return the current snapshot, loading it from MongoDB if stale."""
+        snapshot = self._snapshot
+        if self._is_fresh(snapshot):
+            self.hits += 1
+            return snapshot
+        if self.ttl_seconds <= 0:
+            # Caching is off, so there is no shared refresh to wait for
+            return await self._load()
+
+        # Only one coroutine reloads; the others wait and reuse its result
+        async with self._lock:
+            snapshot = self._snapshot
+            if self._is_fresh(snapshot):
+                self.hits += 1
+                return snapshot
+            return await self._load()
+
+    async def _load(self) -> ProfileSnapshot:
+        self.misses += 1
+        version = self._version
+        document = await get_database().profiles.find_one()
+        snapshot = ProfileSnapshot(document, version, previous=self._snapshot or self._retired)
+
+        # Don't publish a document read before a concurrent invalidation
+        if version == self._version:
+            self._snapshot = snapshot
+            self._retired = None
+        return snapshot
+
+    def publish(self, document: Optional[dict], edit: Optional[ItemEdit] = None):
+        """
+        Install a freshly written document as the current snapshot.
+        Used by write handlers, which already hold the new document, so the
+        next read neither goes to MongoDB nor loses incremental rebuilds.
+        """
+        self._version += 1
+        previous = self._snapshot or self._retired
+        self._snapshot = ProfileSnapshot(document, self._version, previous=previous, edit=edit)
+        self._retired = None
+        self.invalidations += 1
+
+    def holds(self, document_id) -> bool:
+        """Whether the current snapshot is of the document with this _id."""
+        snapshot = self._snapshot
+        return bool(snapshot and snapshot.document and snapshot.document["_id"] == document_id)
+
+    def document_id(self):
+        """_id of the cached document, if a profile is cached."""
+        snapshot = self._snapshot
+        return snapshot.document["_id"] if snapshot and snapshot.document else None
+
+    def apply(
+        self,
+        document_id,
+        version: int,
+        change: Callable[[dict], dict],
+        edited: Optional[Tuple[str, str]] = None,
+    ):
+        """
+        Publish a partial write without re-reading the document.
+        `version` is the document's version after the write. The change is
+        applied to the cached copy only if that copy is exactly one version
+        behind; otherwise the snapshot is dropped. `edited` names the
+        (section, item id) of the one entry the write touched, so the new
+        snapshot carries the entry before and after as its ItemEdit.
+        """
+        snapshot = self._snapshot
+        if snapshot is None:
+            # A load may be in flight with the pre-write document
+            self.invalidate()
+        elif snapshot.document and snapshot.document["_id"] == document_id:
+            if snapshot.document.get("version", 0) == version - 1:
+                document = {**change(snapshot.document), "version": version}
+                edit = None
+                if edited is not None:
+                    section, item_id = edited
+                    edit = ItemEdit(
+                        section, _entry(snapshot.document, section, item_id), _entry(document, section, item_id)
+                    )
+                self.publish(document, edit)
+            else:
+                self.invalidate()
+
+    def is_empty(self) -> bool:
+        """Whether the current snapshot recorded that no profile exists."""
+        snapshot = self._snapshot
+        return bool(snapshot and not snapshot.document)
+
+    def invalidate(self):
+        """Drop the snapshot so the next read goes to MongoDB."""
+        self._version += 1
+        self._retired = self._snapshot or self._retired
+        self._snapshot = None
+        self.invalidations += 1
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "ttl_seconds": self.ttl_seconds,
+        }
+
+
+# Global profile cache instance
+profile_cache = ProfileCache(ttl_seconds=settings.profile_cache_ttl_seconds)
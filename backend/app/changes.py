@@ -0,0 +1,63 @@
+"""
+Change tracking for incremental exports.
+Every profile write sets updated_at with $currentDate, so the time comes
+from the MongoDB server as the write is applied, in the same round trip.
+An export hands out a watermark that trails the newest visible updated_at
+by EXPORT_WATERMARK_LAG_MS: a write stamped earlier but not yet visible
+when the export ran is still after the watermark, so the next export
+picks it up. The per-document version can't serve here: it only counts a
+profile's own edits.
+"""
+from datetime import datetime, timezone
+from bson import ObjectId
+from pymongo import UpdateOne
+from .config import get_settings
+
+settings = get_settings()
+
+# Use as {"$currentDate": TOUCH} in every profile update
+TOUCH = {"updated_at": True}
+
+
+def _stamped_insert(document: dict) -> dict:
+    return {"$setOnInsert": document, "$currentDate": TOUCH}
+
+
+def insert_operation(document: dict) -> UpdateOne:
+    """
+    Insert a profile as an upsert on a fresh _id. insert_one can't use
+    $currentDate, so this is how new documents get a server-side updated_at.
+    """
+    return UpdateOne({"_id": ObjectId()}, _stamped_insert(document), upsert=True)
+
+
+async def insert_stamped(collection, document: dict) -> ObjectId:
+    """Insert one profile with a server-side updated_at; returns its _id."""
+    object_id = ObjectId()
+    await collection.update_one({"_id": object_id}, _stamped_insert(document), upsert=True)
+    return object_id
+
+
+def to_millis(value: datetime) -> int:
+    # Motor returns naive datetimes in UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp() * 1000)
+
+
+def from_millis(millis: int) -> datetime:
+    return datetime.fromtimestamp(millis / 1000, tz=timezone.utc)
+
+
+async def export_watermark(db) -> int:
+    """
+    Milliseconds since the epoch up to which every profile change is
+    visible: the newest updated_at, less the configured lag. Pass it as
+    ?since= to the next export.
+    """
+    latest = await db.profiles.find_one(
+        {"updated_at": {"$exists": True}}, {"updated_at": 1}, sort=[("updated_at", -1)]
+    )
+    if not latest:
+        return 0
+    return max(0, to_millis(latest["updated_at"]) - settings.export_watermark_lag_ms)
@@ -0,0 +1,271 @@
+"""
+Negotiated response compression (zstd, brotli, gzip).
+CompressionMiddleware compresses responses on the fly above a minimum size.
+Bodies that only change with the profile version are compressed once per
+encoding instead: handlers hand them to snapshot_response(), which
+compresses them in an executor, stores the bytes on the snapshot, and the
+middleware passes responses that already carry a Content-Encoding through
+untouched.
+
+brotli needs the brotli (or brotlicffi) package and zstd the zstandard
+package; encodings whose package is missing are not offered.
+"""
+import gzip
+import zlib
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from fastapi import Request, Response
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .cache import ProfileSnapshot
+from .config import get_settings
+from .responses import FastJSONResponse, fast_json
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - depends on the environment
+    zstandard = None
+
+settings = get_settings()
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "application/javascript",
+    "image/svg+xml",
+    "text/",
+)
+
+
+class Codec:
+    """One content coding: a one-shot compressor and a streaming one."""
+
+    def __init__(self, name: str, compress: Callable[[bytes], bytes], stream: Callable[[], "StreamCompressor"]):
+        self.name = name
+        self._compress = compress
+        self._stream = stream
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compress(data)
+
+    def stream(self) -> "StreamCompressor":
+        return self._stream()
+
+
+class StreamCompressor:
+    """
+    Uniform process()/finish() over zlib, brotli and zstandard stream objects.
+    Each chunk is flushed so it reaches the client as soon as it is produced.
+    """
+
+    def __init__(self, compressor, flush_mode=None):
+        self._compressor = compressor
+        self._flush_mode = flush_mode
+
+    def process(self, chunk: bytes) -> bytes:
+        if self._flush_mode is None:
+            # brotli
+            return self._compressor.process(chunk) + self._compressor.flush()
+        return self._compressor.compress(chunk) + self._compressor.flush(self._flush_mode)
+
+    def finish(self) -> bytes:
+        if self._flush_mode is None:
+            return self._compressor.finish()
+        return self._compressor.flush()
+
+
+def _available_codecs() -> Dict[str, Codec]:
+    codecs = {
+        "gzip": Codec(
+            "gzip",
+            lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+            lambda: StreamCompressor(zlib.compressobj(6, zlib.DEFLATED, 31), zlib.Z_SYNC_FLUSH),
+        ),
+    }
+    if brotli is not None:
+        codecs["br"] = Codec(
+            "br",
+            lambda data: brotli.compress(data, quality=4),
+            lambda: StreamCompressor(brotli.Compressor(quality=4)),
+        )
+    if zstandard is not None:
+        codecs["zstd"] = Codec(
+            "zstd",
+            lambda data: zstandard.ZstdCompressor(level=3).compress(data),
+            lambda: StreamCompressor(
+                zstandard.ZstdCompressor(level=3).compressobj(), zstandard.COMPRESSOBJ_FLUSH_BLOCK
+            ),
+        )
+    return codecs
+
+
+CODECS = _available_codecs()
+
+
+def enabled_encodings() -> List[str]:
+    """Configured encodings, in server preference order, that this process can produce."""
+    names = [name.strip() for name in settings.compression_encodings.split(",")]
+    return [name for name in names if name in CODECS]
+
+
+def parse_accept_encoding(header: str) -> Dict[str, float]:
+    """Map each coding in an Accept-Encoding header to its q-value."""
+    accepted = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted[coding] = quality
+    return accepted
+
+
+def negotiate(header: Optional[str], encodings: Iterable[str]) -> Optional[str]:
+    """
+    Pick the encoding to use for a request, or None for identity.
+    The client's q-values decide; ties go to the first of `encodings`.
+    """
+    if not header:
+        return None
+    accepted = parse_accept_encoding(header)
+    wildcard = accepted.get("*", 0.0)
+    best, best_quality = None, 0.0
+    for encoding in encodings:
+        quality = accepted.get(encoding, wildcard)
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def is_compressible(content_type: Optional[str]) -> bool:
+    return bool(content_type) and content_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def weak_etag(etag: str) -> str:
+    """Compressed bytes differ from the identity body, so a strong validator no longer applies."""
+    return etag if etag.startswith("W/") else f"W/{etag}"
+
+
+def _compressed_headers(headers: MutableHeaders, encoding: str):
+    headers["Content-Encoding"] = encoding
+    if "etag" in headers:
+        headers["ETag"] = weak_etag(headers["etag"])
+
+
+async def snapshot_response(
+    request: Request,
+    response: Response,
+    snapshot: ProfileSnapshot,
+    name: str,
+    builder: Callable[[Optional[dict], Any], Optional[bytes]],
+) -> Optional[FastJSONResponse]:
+    """
+    Serve the JSON body registered on the snapshot under `name`, compressed
+    with the negotiated encoding. The encoded and compressed bytes are built
+    once per profile version and encoding; compression runs in an executor
+    so a large body does not stall the event loop. Returns None when the
+    builder has nothing to serve (no profile).
+    """
+    body = snapshot.derive(name, builder)
+    if body is None:
+        return None
+    encoding = None
+    if len(body) >= settings.compression_minimum_size:
+        encoding = negotiate(request.headers.get("accept-encoding"), enabled_encodings())
+    if encoding is None:
+        served = fast_json(body, response)
+    else:
+        compressed = await snapshot.derive_in_executor(
+            f"{name}.{encoding}",
+            lambda document, previous: CODECS[encoding].compress(body)
+        )
+        served = fast_json(compressed, response)
+        _compressed_headers(served.headers, encoding)
+    served.headers["Vary"] = "Accept-Encoding"
+    return served
+
+
+class CompressionMiddleware:
+    """
+    ASGI middleware compressing response bodies with the negotiated encoding.
+    Bodies under minimum_size, HEAD requests, non-text content and responses
+    that already carry a Content-Encoding pass through unchanged. Streaming
+    bodies are compressed chunk by chunk.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = None, encodings: List[str] = None):
+        self.app = app
+        self.minimum_size = settings.compression_minimum_size if minimum_size is None else minimum_size
+        self.encodings = enabled_encodings() if encodings is None else encodings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["method"] == "HEAD" or not self.encodings:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        compressor: Optional[StreamCompressor] = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, compressor, passthrough
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message.get("headers", []))
+                if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+                    passthrough = True
+                    await send(message)
+                else:
+                    # Hold the start until the first body chunk shows the size
+                    start = message
+                return
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if start is not None:
+                headers = MutableHeaders(raw=start.setdefault("headers", []))
+                headers.add_vary_header("Accept-Encoding")
+                if not more_body and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                _compressed_headers(headers, encoding)
+                del headers["Content-Length"]
+                if not more_body:
+                    body = CODECS[encoding].compress(body)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                compressor = CODECS[encoding].stream()
+                await send(start)
+                start = None
+
+            chunk = compressor.process(body) if body else b""
+            if not more_body:
+                chunk += compressor.finish()
+            await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
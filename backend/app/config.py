@@ -1,29 +1,112 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Literal
 
 
 class Settings(BaseSettings):
     app_name: str = "Candidate Profile API"
     mongodb_url: str = "mongodb://localhost:27017"
     database_name: str = "candidate_profile"
+    
+    # MongoDB connection pool (0 disables the idle / wait-queue timeouts)
+    mongo_min_pool_size: int = 0
+    mongo_max_pool_size: int = 100
+    mongo_max_idle_time_ms: int = 300000
+    mongo_wait_queue_timeout_ms: int = 5000
+    mongo_server_selection_timeout_ms: int = 10000
+    # Connections opened at startup so the first requests don't pay for them
+    mongo_warmup_connections: int = 4
+    # Wire compression, in order of preference, e.g. "zstd,snappy,zlib"
+    # (zstd needs the zstandard package, snappy needs python-snappy)
+    mongo_compressors: str = ""
+    # Read routing for the read-only routers (/projects, /skills, /search, /export)
+    mongo_read_preference: Literal[
+        "primary", "primaryPreferred", "secondary", "secondaryPreferred", "nearest"
+    ] = "primary"
+    mongo_read_concern: Literal["local", "available", "majority"] = "local"
+    # Write concern for the profile write paths: a number of nodes or "majority"
+    mongo_write_concern: str = "majority"
+    mongo_write_concern_timeout_ms: int = 5000
     cors_origins: str = "http://localhost:5173,http://localhost:3000,https://profile-oragniser.vercel.app"
     
+    # Process import to warm connection pool, in ms; exceeding it logs a warning
+    cold_start_budget_ms: float = 3000.0
+    
     # Auth settings
     admin_username: str = "admin"
     admin_password: str = "secret123"
     
+    # Secret used to sign pagination cursors
+    cursor_secret: str = "change-me-cursor-secret"
+    
     # Rate limiting
     rate_limit_per_minute: int = 60
+    rate_limit_max_clients: int = 10000
+    # Tokens charged per route, e.g. "/search:3,/export:10"; others cost 1
+    rate_limit_route_costs: str = "/search:2,/bundle:2,/export:10,/profiles/import:10"
+    # "memory" limits per process; "mongo" and "shm" (one host) share the budget
+    rate_limit_backend: Literal["memory", "mongo", "shm"] = "memory"
+    # Tokens a worker leases from the shared store at a time
+    rate_limit_lease_size: int = 5
+    rate_limit_shm_name: str = "candidate_profile_rate_limit"
+    rate_limit_shm_slots: int = 65536
+    
+    # Bulk import (python -m app.bulk_import and POST /profiles/import)
+    import_batch_size: int = 1000
+    import_concurrency: int = 4
+    
+    # Documents per MongoDB cursor batch for GET /export
+    export_batch_size: int = 500
+    # How far an export's watermark trails the newest updated_at, so writes
+    # still in flight when it runs are picked up by the next ?since= export
+    export_watermark_lag_ms: int = 5000
+    
+    # Logging: "json" lines or "text"; successful requests are logged with
+    # probability log_sample_rate; 4xx, 5xx and slow requests always
+    log_level: str = "INFO"
+    log_format: Literal["json", "text"] = "json"
+    log_sample_rate: float = 1.0
+    slow_request_ms: float = 1000.0
+    
+    # MongoDB commands slower than this (ms) go to the slow-ops log,
+    # which keeps the most recent mongo_slow_log_size entries
+    mongo_slow_ms: float = 100.0
+    mongo_slow_log_size: int = 200
+    
+    # /search?mode=fuzzy: minimum similarity (1 - edits / length) of a match,
+    # and the most matches returned per list (skills, projects, work)
+    fuzzy_search_threshold: float = 0.7
+    fuzzy_search_top_k: int = 10
+    
+    # Response compression: encodings in server preference order (br needs
+    # brotli, zstd needs zstandard) and the smallest body worth compressing
+    compression_encodings: str = "zstd,br,gzip"
+    compression_minimum_size: int = 1024
     
     # Pagination defaults
     default_page_size: int = 10
     max_page_size: int = 100
 
+    # Profile snapshot cache (seconds; 0 disables caching)
+    profile_cache_ttl_seconds: float = 30.0
+
+    # /projects backend: "memory" filters the cached snapshot in-process,
+    # "pipeline" pushes filtering and pagination into a MongoDB aggregation
+    projects_query_mode: Literal["memory", "pipeline"] = "memory"
+
     @property
     def cors_origins_list(self) -> List[str]:
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def rate_limit_route_costs_map(self) -> Dict[str, int]:
+        costs = {}
+        for entry in self.rate_limit_route_costs.split(","):
+            if entry.strip():
+                path, cost = entry.rsplit(":", 1)
+                costs[path.strip()] = int(cost)
+        return costs
+
     class Config:
         env_file = ".env"
 
@@ -0,0 +1,70 @@
+"""
+Opaque, signed continuation cursors for keyset pagination.
+A cursor carries the last-seen sort key, the profile version it was issued
+against and a fingerprint of the query, signed with HMAC so clients can't
+forge or edit them.
+"""
+import base64
+import hashlib
+import hmac
+import json
+from typing import Iterable, Tuple
+from fastapi import HTTPException, status
+from .config import get_settings
+
+settings = get_settings()
+
+
+def _b64encode(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+def _sign(payload: bytes) -> bytes:
+    key = settings.cursor_secret.encode("utf8")
+    return hmac.new(key, payload, hashlib.sha256).digest()[:16]
+
+
+def query_fingerprint(*parts: Iterable[Tuple[str, object]]) -> str:
+    """Short hash of the query parameters a cursor is only valid for."""
+    items = sorted(f"{k}={v}" for group in parts for k, v in group)
+    return hashlib.blake2b("&".join(items).encode("utf8"), digest_size=6).hexdigest()
+
+
+def item_key(item: dict) -> str:
+    """Stable identity of a list entry, used to re-find it after edits."""
+    if item.get("id"):
+        return item["id"]
+    # Entries written before item ids existed
+    text = f"{item.get('title', '')}\x00{item.get('description', '')}"
+    return hashlib.blake2b(text.encode("utf8"), digest_size=6).hexdigest()
+
+
+def encode_cursor(payload: dict) -> str:
+    """Serialize and sign a cursor payload."""
+    data = json.dumps(payload, separators=(",", ":")).encode("utf8")
+    return f"{_b64encode(data)}.{_b64encode(_sign(data))}"
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> dict:
+    """
+    Verify and decode a cursor issued for the same query.
+    Raises a 400 if the cursor was tampered with or belongs to another query.
+    """
+    try:
+        data_part, signature_part = cursor.split(".")
+        data = _b64decode(data_part)
+        valid = hmac.compare_digest(_sign(data), _b64decode(signature_part))
+        payload = json.loads(data) if valid else None
+    except (ValueError, TypeError):
+        payload = None
+
+    if not isinstance(payload, dict) or payload.get("q") != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor for this query"
+        )
+    return payload
@@ -1,31 +1,125 @@
+import asyncio
+import logging
+import time
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReadPreference
+from pymongo.read_concern import ReadConcern
+from pymongo.write_concern import WriteConcern
 from .config import get_settings
+from .migrations import verify_schema
+from .mongo_monitoring import command_monitor
 
 settings = get_settings()
+logger = logging.getLogger("app.database")
 
 client: AsyncIOMotorClient = None
 db = None
+# Same database with the read-only routers' routing and the write paths' concern
+read_db = None
+write_db = None
+# Set by prepare_database once the pool is warm; schema is the background check's result
+pool_ready = False
+schema_status: dict = None
+# Backoff between warm-up attempts while MongoDB is unreachable
+WARMUP_RETRY_SECONDS = 1.0
+WARMUP_RETRY_MAX_SECONDS = 30.0
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+
+def client_options() -> dict:
+    """Pool, compression and timeout options for the MongoDB client."""
+    options = {
+        "minPoolSize": settings.mongo_min_pool_size,
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "maxIdleTimeMS": settings.mongo_max_idle_time_ms or None,
+        "waitQueueTimeoutMS": settings.mongo_wait_queue_timeout_ms or None,
+        "serverSelectionTimeoutMS": settings.mongo_server_selection_timeout_ms,
+        "event_listeners": [command_monitor],
+    }
+    if settings.mongo_compressors:
+        options["compressors"] = settings.mongo_compressors
+    return options
+
+
+def write_concern() -> WriteConcern:
+    w = settings.mongo_write_concern
+    return WriteConcern(
+        w=int(w) if w.isdigit() else w,
+        wtimeout=settings.mongo_write_concern_timeout_ms or None
+    )
+
+
+async def warm_up_pool(connections: int) -> bool:
+    """
+    Open connections before the first request needs them.
+    Concurrent pings each check out their own connection, so the pool
+    grows to `connections` instead of opening them lazily under load.
+    """
+    try:
+        await asyncio.gather(*(client.admin.command("ping") for _ in range(max(connections, 1))))
+    except Exception as e:
+        logger.warning("connection pool warm-up failed", extra={"fields": {"error": str(e)}})
+        return False
+    return True
+
+
+async def prepare_database() -> float:
+    """
+    Warm the pool, then check indexes, off the startup path.
+    Warm-up is retried with backoff until MongoDB answers, so a pod that
+    boots during an outage becomes ready once it is back. Readiness flips
+    as soon as the pool is warm; the index check only logs.
+    Returns the milliseconds until the pool was ready.
+    """
+    global pool_ready, schema_status
+    start = time.perf_counter()
+    connections = min(settings.mongo_warmup_connections, settings.mongo_max_pool_size)
+    delay = WARMUP_RETRY_SECONDS
+    while not await warm_up_pool(connections):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, WARMUP_RETRY_MAX_SECONDS)
+    pool_ready = True
+    ready_ms = (time.perf_counter() - start) * 1000
+    try:
+        schema_status = await verify_schema(db)
+    except Exception as e:
+        logger.warning("index verification failed", extra={"fields": {"error": str(e)}})
+    return ready_ms
+
+
+async def ping(timeout: float = 2.0) -> bool:
+    """Whether MongoDB answers a ping within timeout seconds."""
+    try:
+        await asyncio.wait_for(client.admin.command("ping"), timeout)
+    except Exception:
+        return False
+    return True
 
 
 async def connect_to_mongo():
-    global client, db
-    client = AsyncIOMotorClient(settings.mongodb_url)
+    global client, db, read_db, write_db
+    client = AsyncIOMotorClient(settings.mongodb_url, **client_options())
     db = client[settings.database_name]
-    
-    # Create indexes for better query performance
-    await db.profiles.create_index("email", unique=True)
-    await db.profiles.create_index([("skills", 1)])
-    await db.profiles.create_index([
-        ("name", "text"),
-        ("skills", "text"),
-        ("projects.title", "text"),
-        ("projects.description", "text")
-    ])
-    print(f"Connected to MongoDB: {settings.database_name}")
+    read_db = client.get_database(
+        settings.database_name,
+        read_preference=READ_PREFERENCES[settings.mongo_read_preference],
+        read_concern=ReadConcern(settings.mongo_read_concern)
+    )
+    write_db = client.get_database(settings.database_name, write_concern=write_concern())
+    # No I/O here: the driver connects lazily, prepare_database warms it up.
+    # Indexes are built by python -m app.migrations, not on every start.
 
 
 async def close_mongo_connection():
-    global client
+    global client, pool_ready
+    pool_ready = False
     if client:
         client.close()
         print("Disconnected from MongoDB")
@@ -33,3 +127,13 @@ async def close_mongo_connection():
 
 def get_database():
     return db
+
+
+def get_read_database():
+    """Database handle for read-only routes (configured read preference and concern)."""
+    return read_db
+
+
+def get_write_database():
+    """Database handle for write paths (configured write concern, primary reads)."""
+    return write_db
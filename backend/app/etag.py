@@ -0,0 +1,79 @@
+"""
+Conditional GET support for read endpoints.
+Each profile document carries a version that write handlers bump. Read
+endpoints emit an ETag derived from the document id, that version and the
+request URL, and answer a matching If-None-Match with 304 straight from the
+snapshot cache, without touching MongoDB or serializing a body.
+"""
+import hashlib
+from typing import Optional
+from fastapi import Request, Response
+from .cache import ProfileSnapshot, profile_cache
+from .database import get_read_database
+
+
+class NotModified(Exception):
+    """Raised by read dependencies when the client's copy is current."""
+
+    def __init__(self, etag: str):
+        self.etag = etag
+
+
+def document_etag(profile: Optional[dict], request: Request) -> Optional[str]:
+    """Strong ETag for a profile document as seen through this request's path and query."""
+    if not profile:
+        return None
+    # Repeated params (?skill=a&skill=b) don't depend on order
+    params = "&".join(sorted(f"{k}={v}" for k, v in request.query_params.multi_items()))
+    digest = hashlib.blake2b(
+        f"{request.url.path}?{params}".encode("utf8"), digest_size=8
+    ).hexdigest()
+    return f'"{profile["_id"]}-{profile.get("version", 0)}-{digest}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weak comparison against If-None-Match, as RFC 9110 specifies for GET."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
+
+
+def check_not_modified(profile: Optional[dict], request: Request, response: Response):
+    """Set the ETag header for a profile, or raise NotModified if the client is up to date."""
+    etag = document_etag(profile, request)
+    if etag:
+        if etag_matches(request, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        # Let browsers keep the body but revalidate on every use
+        response.headers["Cache-Control"] = "no-cache"
+
+
+async def conditional_snapshot(request: Request, response: Response) -> ProfileSnapshot:
+    """Dependency returning the current profile snapshot, with conditional GET handling."""
+    snapshot = await profile_cache.get()
+    check_not_modified(snapshot.document, request, response)
+    return snapshot
+
+
+async def conditional_version(request: Request, response: Response) -> ProfileSnapshot:
+    """
+    Like conditional_snapshot, but reads only the profile's id and version,
+    for routes that query MongoDB for the body anyway. The returned snapshot
+    holds just those two fields.
+    """
+    head = await get_read_database().profiles.find_one({}, {"version": 1})
+    check_not_modified(head, request, response)
+    return ProfileSnapshot(head, 0)
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": "no-cache"},
+    )
@@ -0,0 +1,109 @@
+"""
+Sparse fieldsets: ?fields=name,links,projects.title.
+A fieldset is validated against the response model's field paths. Routes
+that query MongoDB send it as a projection, so unrequested fields never
+leave the server. Routes served from the profile snapshot trim the cached
+document the same way the projection would.
+"""
+from typing import Dict, Iterable, Optional, Set, Type, get_args
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from .models import ProfileResponse, Project
+
+# Nested fieldset: field name -> None (whole value) or a nested tree
+Tree = Dict[str, Optional["Tree"]]
+
+
+def _model_of(annotation) -> Optional[Type[BaseModel]]:
+    """The model inside an annotation such as Links, list[Project] or Optional[Links]."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _model_of(arg)
+        if model is not None:
+            return model
+    return None
+
+
+def model_paths(model: Type[BaseModel]) -> Set[str]:
+    """Field paths a client may request: every field and, for nested models, their fields."""
+    paths = set()
+    for name, field in model.model_fields.items():
+        paths.add(name)
+        nested = _model_of(field.annotation)
+        if nested is not None:
+            paths.update(f"{name}.{sub}" for sub in nested.model_fields)
+    return paths
+
+
+# A profile's id is always returned, so it isn't a selectable field
+PROFILE_PATHS = model_paths(ProfileResponse) - {"id"}
+PROJECT_PATHS = model_paths(Project)
+
+
+class Fieldset:
+    """A validated set of field paths, with no path nested under another."""
+
+    def __init__(self, paths: Iterable[str]):
+        paths = set(paths)
+        # "projects" already covers "projects.title"
+        self.paths = sorted(
+            path for path in paths
+            if not any(path.startswith(f"{other}.") for other in paths)
+        )
+        self.tree: Tree = {}
+        for path in self.paths:
+            node = self.tree
+            *parents, leaf = path.split(".")
+            for parent in parents:
+                node = node.setdefault(parent, {})
+            node[leaf] = None
+
+    def projection(self, *also: str) -> dict:
+        """MongoDB inclusion projection for these paths plus the `also` fields."""
+        # _id is returned anyway; naming it keeps an empty fieldset from meaning "everything"
+        projection = {"_id": 1}
+        projection.update((path, 1) for path in self.paths)
+        projection.update((field, 1) for field in also if field not in self.tree)
+        return projection
+
+    def apply(self, document: dict) -> dict:
+        """Trim a document as MongoDB would apply projection()."""
+        return _trim(document, self.tree)
+
+
+def _trim(document: dict, tree: Tree) -> dict:
+    trimmed = {}
+    for name, subtree in tree.items():
+        if name not in document:
+            continue
+        value = document[name]
+        if subtree is None:
+            trimmed[name] = value
+        elif isinstance(value, dict):
+            trimmed[name] = _trim(value, subtree)
+        elif isinstance(value, list):
+            trimmed[name] = [_trim(item, subtree) for item in value if isinstance(item, dict)]
+    return trimmed
+
+
+def parse_fieldset(
+    fields: Optional[str],
+    allowed: Set[str],
+    implied: Iterable[str] = ()
+) -> Optional[Fieldset]:
+    """
+    Parse a comma-separated ?fields= value; None means all fields.
+    Names in `implied` (e.g. a profile's id) are returned regardless, so
+    asking for them is accepted and adds nothing to the projection.
+    """
+    if not fields:
+        return None
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed and f not in implied]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return Fieldset(f for f in requested if f not in implied)
@@ -0,0 +1,178 @@
+"""
+Typo-tolerant search behind GET /search?mode=fuzzy.
+Skills, project titles and work titles/companies are indexed as terms,
+both whole ("FastAPI", "Machine Learning" -> "machinelearning") and word
+by word. A character-trigram index prunes candidates by gram overlap
+(the q-gram lemma bounds how many grams k edits can destroy), and only the
+survivors are verified with a bit-parallel edit distance.
+"""
+import math
+import re
+from collections import Counter
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from .search_index import SearchResults, tokenize
+
+GRAM = 3
+# Terms sharing the most trigrams with a query word that are considered at all
+MAX_CANDIDATES = 200
+SQUASH_RE = re.compile(r"[^a-z0-9+#]+")
+# Slack for float error at the threshold, e.g. (1 - 0.9) * 10 = 0.999...
+EPSILON = 1e-9
+
+
+def squash(text: str) -> str:
+    """Lowercase and drop spaces and punctuation, so "fast api" and "FastAPI" agree."""
+    return SQUASH_RE.sub("", text.lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    padded = f"{' ' * (GRAM - 1)}{term}{' ' * (GRAM - 1)}"
+    return {padded[i:i + GRAM] for i in range(len(padded) - GRAM + 1)}
+
+
+class Pattern:
+    """
+    A query word prepared for bit-parallel edit distance (Myers/Hyyrö):
+    one bitmask per character, so each comparison costs one pass over
+    the other string with a few integer operations per character.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.masks: Dict[str, int] = {}
+        for i, char in enumerate(text):
+            self.masks[char] = self.masks.get(char, 0) | (1 << i)
+        self.full = (1 << len(text)) - 1
+        self.last = 1 << (len(text) - 1) if text else 0
+
+    def distance(self, other: str) -> int:
+        """Levenshtein distance between the pattern and other."""
+        if not self.text:
+            return len(other)
+        full, last, masks = self.full, self.last, self.masks
+        positive, negative = full, 0
+        score = len(self.text)
+        for char in other:
+            eq = masks.get(char, 0)
+            xv = eq | negative
+            xh = (((eq & positive) + positive) ^ positive) | eq
+            hp = negative | (~(xh | positive) & full)
+            hn = positive & xh
+            if hp & last:
+                score += 1
+            elif hn & last:
+                score -= 1
+            hp = ((hp << 1) | 1) & full
+            hn = (hn << 1) & full
+            positive = hn | (~(xv | hp) & full)
+            negative = hp & xv
+        return score
+
+
+def similarity(distance: int, a: str, b: str) -> float:
+    return 1.0 - distance / max(len(a), len(b), 1)
+
+
+class Source(NamedTuple):
+    """Where an indexed term came from: a list ("skills", "projects", "work") and a position."""
+
+    kind: str
+    position: int
+
+
+class TrigramIndex:
+    """Terms with their trigram postings, pruned and verified per query."""
+
+    def __init__(self):
+        self.terms: List[str] = []
+        self.gram_counts: List[int] = []
+        self.sources: List[List[Source]] = []
+        self.postings: Dict[str, List[int]] = {}
+        self._ids: Dict[str, int] = {}
+
+    def add(self, text: str, source: Source):
+        """Index text as a whole and word by word."""
+        for term in {squash(text), *tokenize(text)}:
+            if not term:
+                continue
+            term_id = self._ids.get(term)
+            if term_id is None:
+                term_id = self._ids[term] = len(self.terms)
+                grams = trigrams(term)
+                self.terms.append(term)
+                self.gram_counts.append(len(grams))
+                self.sources.append([])
+                for gram in grams:
+                    self.postings.setdefault(gram, []).append(term_id)
+            if source not in self.sources[term_id]:
+                self.sources[term_id].append(source)
+
+    def matches(self, query: str, threshold: float) -> List[Tuple[int, float]]:
+        """(term_id, similarity) for terms at least threshold similar to the query."""
+        grams = trigrams(query)
+        pattern = Pattern(query)
+        counts = Counter()
+        for gram in grams:
+            postings = self.postings.get(gram)
+            if postings:
+                counts.update(postings)
+
+        n = len(query)
+        matches = []
+        for term_id, common in counts.most_common(MAX_CANDIDATES):
+            term = self.terms[term_id]
+            m = len(term)
+            # Most edits the threshold allows between these two lengths
+            limit = math.floor((1.0 - threshold) * max(n, m) + EPSILON)
+            # Each edit removes at most GRAM distinct grams from either string
+            if abs(n - m) > limit or common < max(len(grams), self.gram_counts[term_id]) - GRAM * limit:
+                continue
+            distance = pattern.distance(term)
+            if distance <= limit:
+                score = similarity(distance, query, term)
+                if score >= threshold - EPSILON:
+                    matches.append((term_id, score))
+        return matches
+
+
+class FuzzyEngine:
+    """Trigram index over a profile's skills, project titles and work titles/companies."""
+
+    def __init__(self, profile: Optional[dict]):
+        profile = profile or {}
+        self.index = TrigramIndex()
+        for i, skill in enumerate(profile.get("skills", [])):
+            self.index.add(skill, Source("skills", i))
+        for i, project in enumerate(profile.get("projects", [])):
+            self.index.add(project.get("title", ""), Source("projects", i))
+        for i, work in enumerate(profile.get("work", [])):
+            self.index.add(work.get("title", ""), Source("work", i))
+            self.index.add(work.get("company", ""), Source("work", i))
+
+    def search(self, q: str, threshold: float, top_k: int) -> SearchResults:
+        """
+        Rank entries by their best-matching term. The query is tried whole
+        and, for several words, word by word.
+        """
+        variants = {squash(q), *tokenize(q)}
+        best: Dict[Source, float] = {}
+        for variant in variants:
+            if len(variant) < 2:
+                continue
+            for term_id, score in self.index.matches(variant, threshold):
+                for source in self.index.sources[term_id]:
+                    if score > best.get(source, 0.0):
+                        best[source] = score
+
+        ranked: Dict[str, List[Tuple[int, float]]] = {"skills": [], "projects": [], "work": []}
+        for source, score in best.items():
+            ranked[source.kind].append((source.position, score))
+        for kind, rows in ranked.items():
+            rows.sort(key=lambda row: (-row[1], row[0]))
+            del rows[top_k:]
+        return SearchResults(name=False, **ranked)
+
+
+def build_fuzzy_engine(profile: Optional[dict], previous: Optional[FuzzyEngine] = None) -> FuzzyEngine:
+    """Snapshot builder for the fuzzy engine; cheap enough to rebuild per version."""
+    return FuzzyEngine(profile)
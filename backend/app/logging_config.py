@@ -1,67 +1,169 @@
 """
 Logging configuration for the application.
-Sets up structured logging with request/response middleware.
+Records are handed to a queue on the calling thread and formatted and
+written by a background listener, so the event loop never blocks on
+stdout. Request logs are structured (JSON by default) and successful
+requests can be sampled.
 """
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
+import random
 import sys
 import time
-from datetime import datetime
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from datetime import datetime, timezone
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from .config import get_settings
+
+settings = get_settings()
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line; structured fields come from extra={"fields": {...}}."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(getattr(record, "fields", {}))
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with structured fields appended as key=value."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s | %(levelname)-8s | %(name)s | %(message)s", "%Y-%m-%d %H:%M:%S")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " | " + " ".join(f"{k}={v}" for k, v in fields.items())
+        return line
+
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    Queue records for the in-process listener without formatting them.
+    QueueHandler.prepare() formats the message (with basicConfig's default
+    "LEVEL:name:" format) and drops exc_info, which is only needed when the
+    queue crosses a process boundary.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        # Resolve %-args now, before the objects they refer to can change
+        record.msg = record.getMessage()
+        record.args = None
+        return record
 
 
 # Configure logging format
-def setup_logging(log_level: str = "INFO"):
-    """Configure application logging."""
+def setup_logging(log_level: str = "INFO", log_format: str = "json") -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue drained by a background thread.
+    Returns the started listener; it is stopped (and flushed) at exit.
+    """
+    output = logging.StreamHandler(sys.stdout)
+    output.setFormatter(JsonFormatter() if log_format == "json" else TextFormatter())
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+
     logging.basicConfig(
         level=getattr(logging, log_level.upper()),
-        format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S",
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-        ]
+        handlers=[LocalQueueHandler(log_queue)]
     )
-    
+
     # Set third-party loggers to warning
     logging.getLogger("uvicorn").setLevel(logging.WARNING)
     logging.getLogger("motor").setLevel(logging.WARNING)
-    
-    return logging.getLogger("app")
 
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+log_listener = setup_logging(settings.log_level, settings.log_format)
+logger = logging.getLogger("app")
+request_logger = logging.getLogger("app.requests")
+
+
+class LoggingMiddleware:
+    """
+    ASGI middleware logging one structured line per request.
+    Errors (5xx or an exception), client errors (4xx) and requests slower
+    than slow_request_ms are always logged; other requests are logged with
+    probability sample_rate.
+    """
 
-logger = setup_logging()
+    def __init__(self, app: ASGIApp, sample_rate: float = None, slow_request_ms: float = None):
+        self.app = app
+        self.sample_rate = settings.log_sample_rate if sample_rate is None else sample_rate
+        self.slow_request_ms = settings.slow_request_ms if slow_request_ms is None else slow_request_ms
 
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not request_logger.isEnabledFor(logging.INFO):
+            await self.app(scope, receive, send)
+            return
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware to log all incoming requests and their responses."""
-    
-    async def dispatch(self, request: Request, call_next):
         # Start timer
-        start_time = time.time()
-        
-        # Get request info
-        method = request.method
-        url = str(request.url.path)
-        query = str(request.url.query) if request.url.query else ""
-        client_ip = request.client.host if request.client else "unknown"
-        
-        # Log incoming request
-        logger.info(f"➡️  {method} {url}{'?' + query if query else ''} | IP: {client_ip}")
-        
+        start_time = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
         # Process request
         try:
-            response = await call_next(request)
-            
-            # Calculate duration
-            duration = (time.time() - start_time) * 1000
-            
-            # Log response
-            status_emoji = "✅" if response.status_code < 400 else "❌"
-            logger.info(f"{status_emoji} {method} {url} | Status: {response.status_code} | {duration:.2f}ms")
-            
-            return response
-            
+            await self.app(scope, receive, send_with_status)
         except Exception as e:
-            duration = (time.time() - start_time) * 1000
-            logger.error(f"❌ {method} {url} | Error: {str(e)} | {duration:.2f}ms")
+            self.log(scope, 500, start_time, error=e)
             raise
+
+        self.log(scope, status_code, start_time)
+
+    def log(self, scope: Scope, status_code: int, start_time: float, error: Exception = None):
+        # Duration covers the whole body for streamed responses
+        duration = (time.perf_counter() - start_time) * 1000
+        slow = duration >= self.slow_request_ms
+
+        if error is not None or status_code >= 500:
+            level = logging.ERROR
+        elif slow or status_code >= 400:
+            # 4xx is how auth failures, rate limiting and bad clients show up
+            level = logging.WARNING
+        elif self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return
+        else:
+            level = logging.INFO
+
+        # Only build the record once we know it will be written
+        client = scope.get("client")
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "query": scope.get("query_string", b"").decode("latin-1"),
+            "status": status_code,
+            "duration_ms": round(duration, 2),
+            "client": client[0] if client else "unknown",
+        }
+        if slow:
+            fields["slow"] = True
+        if error is not None:
+            fields["error"] = str(error)
+        elif level == logging.INFO and self.sample_rate < 1:
+            fields["sample_rate"] = self.sample_rate
+        request_logger.log(level, "request", extra={"fields": fields})
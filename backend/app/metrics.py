@@ -0,0 +1,209 @@
+"""
+In-process metrics rendered in the Prometheus text exposition format.
+Each thread writes to its own shard of every metric, so recording a value
+never takes a lock: request metrics are written by the event loop thread,
+MongoDB command timings by the driver's threads, and a scrape sums the shards.
+"""
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers cache hits (sub-millisecond) up to slow exports
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Metric:
+    """Base for sharded metrics: one dict of label values -> state per thread."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+        self._local = threading.local()
+        self._shards: List[dict] = []
+
+    def _shard(self) -> dict:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = {}
+            self._shards.append(shard)  # list.append is atomic
+        return shard
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1):
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0) + amount
+
+    def values(self) -> Dict[LabelValues, float]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in list(self._shards):
+            for labels, value in list(shard.items()):
+                totals[labels] = totals.get(labels, 0) + value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, value in sorted(self.values().items()):
+            lines.append(f"{self.name}{_labels(self.label_names, labels)} {value}")
+        return lines
+
+
+class Gauge(Counter):
+    """A counter that may go down; only ever written from the event loop."""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = buckets
+
+    def observe(self, value: float, *labels: str):
+        shard = self._shard()
+        state = shard.get(labels)
+        if state is None:
+            # Per-bucket counts (last is +Inf), then sum
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def values(self) -> Dict[LabelValues, list]:
+        totals: Dict[LabelValues, list] = {}
+        for shard in list(self._shards):
+            for labels, state in list(shard.items()):
+                total = totals.setdefault(labels, [0] * len(state[:-1]) + [0.0])
+                for i, value in enumerate(state):
+                    total[i] += value
+        return totals
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for labels, state in sorted(self.values().items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), state[:-1]):
+                cumulative += count
+                le = _labels(self.label_names, labels, f'le="{bound}"')
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            base = _labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{base} {state[-1]}")
+            lines.append(f"{self.name}_count{base} {cumulative}")
+        return lines
+
+
+http_requests = Counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_duration = Histogram(
+    "http_request_duration_seconds", "HTTP request latency, including streamed bodies.", ("method", "route")
+)
+http_in_flight = Gauge("http_requests_in_flight", "HTTP requests currently being served.")
+rate_limit_rejections = Counter("rate_limit_rejections_total", "Requests rejected with 429.")
+mongo_command_duration = Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency by command.", ("command",)
+)
+mongo_command_failures = Counter("mongodb_command_failures_total", "Failed MongoDB commands.", ("command",))
+mongo_slow_reply_bytes = Counter(
+    "mongodb_slow_reply_bytes_total", "BSON bytes in replies to slow MongoDB commands.", ("command",)
+)
+
+REGISTRY: List[Metric] = [
+    http_requests, http_request_duration, http_in_flight, rate_limit_rejections,
+    mongo_command_duration, mongo_command_failures, mongo_slow_reply_bytes,
+]
+
+# ASGI scope of the request being served, for code that runs below the
+# router (e.g. MongoDB command listeners) and wants its route
+request_scope: ContextVar = ContextVar("request_scope", default=None)
+
+# Requests that matched no route share one label, keeping cardinality bounded
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+def render_metrics(cache_stats: dict = None) -> str:
+    """The registry (plus profile cache counters) in the Prometheus text format."""
+    lines: List[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+
+    if cache_stats is not None:
+        lookups = cache_stats["hits"] + cache_stats["misses"]
+        lines += [
+            "# HELP profile_cache_hits_total Profile snapshot cache hits.",
+            "# TYPE profile_cache_hits_total counter",
+            f"profile_cache_hits_total {cache_stats['hits']}",
+            "# HELP profile_cache_misses_total Profile snapshot cache misses.",
+            "# TYPE profile_cache_misses_total counter",
+            f"profile_cache_misses_total {cache_stats['misses']}",
+            "# HELP profile_cache_hit_ratio Share of profile cache lookups served from memory.",
+            "# TYPE profile_cache_hit_ratio gauge",
+            f"profile_cache_hit_ratio {cache_stats['hits'] / lookups if lookups else 0.0}",
+        ]
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware counting and timing every HTTP request.
+    The route label is the matched route's path template (e.g. /profiles/{profile_id}),
+    read from the scope after routing, never the raw path.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        token = request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            request_scope.reset(token)
+            http_in_flight.dec()
+            route = scope.get("route")
+            route = getattr(route, "path", UNMATCHED_ROUTE)
+            method = scope["method"]
+            http_requests.inc(method, route, str(status_code))
+            http_request_duration.observe(time.perf_counter() - start, method, route)
@@ -0,0 +1,175 @@
+"""
+Versioned index and data migrations.
+Each migration runs once per database and is recorded in the
+schema_migrations collection, so the API process never builds indexes on
+startup; it only checks in the background that they exist.
+
+Run with: python -m app.migrations [status|up] [--to VERSION]
+"""
+import argparse
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, List, NamedTuple, Optional
+from motor.motor_asyncio import AsyncIOMotorClient
+from .changes import TOUCH
+from .config import get_settings
+from .models import ITEM_SECTIONS, assign_item_ids
+
+settings = get_settings()
+logger = logging.getLogger("app.migrations")
+
+MIGRATIONS_COLLECTION = "schema_migrations"
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    apply: Callable[..., Awaitable[None]]
+
+
+async def _profile_indexes(db):
+    await db.profiles.create_index("email", unique=True)
+    await db.profiles.create_index([("skills", 1)])
+    await db.profiles.create_index([
+        ("name", "text"),
+        ("skills", "text"),
+        ("projects.title", "text"),
+        ("projects.description", "text")
+    ])
+
+
+async def _rate_limit_ttl_index(db):
+    # Shared rate limit windows (RATE_LIMIT_BACKEND=mongo) expire on their own
+    await db.rate_limits.create_index("expire_at", expireAfterSeconds=0)
+
+
+async def _item_ids(db):
+    # Sub-resource routes (/profile/projects/{id}, ...) address entries by id
+    for section in ITEM_SECTIONS:
+        await db.profiles.create_index(f"{section}.id")
+    async for profile in db.profiles.find({}, {section: 1 for section in ITEM_SECTIONS}):
+        missing = {
+            section: profile[section] for section in ITEM_SECTIONS
+            if any(not item.get("id") for item in profile.get(section) or [])
+        }
+        if missing:
+            await db.profiles.update_one(
+                {"_id": profile["_id"]},
+                {"$set": assign_item_ids(missing), "$inc": {"version": 1}}
+            )
+
+
+async def _updated_at(db):
+    # Incremental exports (/export?since=) range over updated_at
+    await db.profiles.create_index("updated_at")
+    await db.profiles.update_many({"updated_at": {"$exists": False}}, {"$currentDate": TOUCH})
+
+
+async def _skill_sort_indexes(db):
+    # GET /profiles?skill= walks one skill's profiles in sort key order; with
+    # only skills_1 MongoDB would have to sort every match in memory
+    await db.profiles.create_index([("skills", 1), ("_id", 1)])
+    await db.profiles.create_index([("skills", 1), ("email", 1)])
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "profile indexes", _profile_indexes),
+    Migration(2, "rate limit window TTL index", _rate_limit_ttl_index),
+    Migration(3, "ids for projects, work and education entries", _item_ids),
+    Migration(4, "updated_at for incremental exports", _updated_at),
+    Migration(5, "skill + sort key indexes for /profiles", _skill_sort_indexes),
+]
+
+LATEST_VERSION = MIGRATIONS[-1].version
+
+# Indexes the API relies on, by collection, as named by MongoDB
+REQUIRED_INDEXES = {
+    "profiles": {
+        "email_1", "skills_1", "skills_1__id_1", "skills_1_email_1",
+        "projects.id_1", "work.id_1", "education.id_1", "updated_at_1",
+    },
+}
+
+
+async def applied_versions(db) -> List[int]:
+    cursor = db[MIGRATIONS_COLLECTION].find({}, {"_id": 1}).sort("_id", 1)
+    return [document["_id"] async for document in cursor]
+
+
+async def apply_migrations(db, target: Optional[int] = None) -> List[int]:
+    """Apply pending migrations up to target (default: all); returns the versions applied."""
+    done = set(await applied_versions(db))
+    applied = []
+    for migration in MIGRATIONS:
+        if migration.version in done or (target is not None and migration.version > target):
+            continue
+        start = time.perf_counter()
+        await migration.apply(db)
+        await db[MIGRATIONS_COLLECTION].insert_one({
+            "_id": migration.version,
+            "name": migration.name,
+            "applied_at": datetime.now(timezone.utc),
+            "duration_ms": round((time.perf_counter() - start) * 1000, 2),
+        })
+        applied.append(migration.version)
+    return applied
+
+
+async def missing_indexes(db) -> List[str]:
+    """Required indexes that don't exist, as collection.index_name."""
+    missing = []
+    for collection, names in REQUIRED_INDEXES.items():
+        existing = set((await db[collection].index_information()).keys())
+        missing.extend(f"{collection}.{name}" for name in sorted(names - existing))
+    return missing
+
+
+async def verify_schema(db) -> dict:
+    """
+    Compare the database with what this build expects, without changing it.
+    Cheap enough for a background check at startup: one small find and
+    one listIndexes per collection.
+    """
+    versions = await applied_versions(db)
+    current = versions[-1] if versions else 0
+    missing = await missing_indexes(db)
+    if current < LATEST_VERSION:
+        logger.warning("database has pending migrations; run python -m app.migrations up",
+                       extra={"fields": {"version": current, "latest": LATEST_VERSION}})
+    if missing:
+        logger.warning("required indexes are missing", extra={"fields": {"indexes": missing}})
+    return {"version": current, "latest": LATEST_VERSION, "missing_indexes": missing}
+
+
+async def run(command: str, target: Optional[int]):
+    client = AsyncIOMotorClient(settings.mongodb_url)
+    db = client[settings.database_name]
+    try:
+        if command == "up":
+            applied = await apply_migrations(db, target)
+            for version in applied:
+                name = next(m.name for m in MIGRATIONS if m.version == version)
+                print(f"✓ Applied {version}: {name}")
+            if not applied:
+                print("✓ Nothing to apply")
+        else:
+            done = set(await applied_versions(db))
+            for migration in MIGRATIONS:
+                mark = "✓" if migration.version in done else " "
+                print(f"[{mark}] {migration.version}: {migration.name}")
+    finally:
+        client.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply versioned index migrations")
+    parser.add_argument("command", nargs="?", choices=["status", "up"], default="status")
+    parser.add_argument("--to", type=int, default=None, help="Stop after this version")
+    args = parser.parse_args()
+    asyncio.run(run(args.command, args.to))
+
+
+if __name__ == "__main__":
+    main()
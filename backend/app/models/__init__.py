@@ -1,4 +1,8 @@
 from .profile import (
+    ITEM_SECTIONS,
+    assign_item_ids,
+    new_item_id,
+    ItemBatch,
     Education,
     Project,
     WorkExperience,
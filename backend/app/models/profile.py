@@ -1,7 +1,23 @@
 from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from typing import Generic, Optional, TypeVar
 from bson import ObjectId
 
+# Profile lists whose entries carry a stable id
+ITEM_SECTIONS = ("education", "projects", "work")
+
+
+def new_item_id() -> str:
+    return str(ObjectId())
+
+
+def assign_item_ids(profile: dict) -> dict:
+    """Give every education/project/work entry an id, keeping valid existing ones."""
+    for section in ITEM_SECTIONS:
+        for item in profile.get(section) or []:
+            if not ObjectId.is_valid(item.get("id") or ""):
+                item["id"] = new_item_id()
+    return profile
+
 
 class PyObjectId(str):
     @classmethod
@@ -16,6 +32,7 @@ class PyObjectId(str):
 
 
 class Education(BaseModel):
+    id: Optional[str] = None
     degree: str
     institution: str
     year: str
@@ -23,6 +40,7 @@ class Education(BaseModel):
 
 
 class Project(BaseModel):
+    id: Optional[str] = None
     title: str
     description: str
     links: list[str] = []
@@ -30,6 +48,7 @@ class Project(BaseModel):
 
 
 class WorkExperience(BaseModel):
+    id: Optional[str] = None
     title: str
     company: str
     duration: str
@@ -79,3 +98,13 @@ class ProfileResponse(ProfileBase):
 
     class Config:
         populate_by_name = True
+
+
+ItemT = TypeVar("ItemT")
+
+
+class ItemBatch(BaseModel, Generic[ItemT]):
+    """Many sub-resource changes applied in one bulk_write."""
+    add: list[ItemT] = []
+    update: list[ItemT] = Field([], description="Replacements; each item needs its id")
+    remove: list[str] = Field([], description="Ids of items to delete")
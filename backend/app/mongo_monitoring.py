@@ -0,0 +1,119 @@
+"""
+MongoDB command monitoring.
+A pymongo CommandListener times every command and tags it with the route
+that issued it. Results feed the /metrics counters, per-command aggregates
+and a rolling log of slow operations. Reply sizes are only measured for
+slow commands: re-encoding the reply costs milliseconds for a large getMore,
+and would make every fast query pay for the bookkeeping.
+"""
+import logging
+import time
+from collections import deque
+from typing import Dict, List, Optional
+import bson
+from pymongo import monitoring
+from .config import get_settings
+from .metrics import (
+    mongo_command_duration,
+    mongo_command_failures,
+    mongo_slow_reply_bytes,
+    request_scope,
+)
+
+settings = get_settings()
+logger = logging.getLogger("app.mongo")
+
+# Handshakes and heartbeats say nothing about query performance
+IGNORED_COMMANDS = {"hello", "ismaster", "isMaster", "ping", "endSessions", "saslStart", "saslContinue"}
+
+
+def current_route() -> Optional[str]:
+    """Route template of the request this code runs for, if any."""
+    scope = request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return getattr(route, "path", None) or scope["path"]
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Records command timings and keeps the slowest operations.
+    Motor runs the driver in executor threads with the caller's context
+    copied, so started() still sees the originating request. Only atomic
+    dict and deque operations are used across threads.
+    """
+
+    def __init__(self, slow_ms: float = None, slow_log_size: int = None):
+        self.slow_ms = settings.mongo_slow_ms if slow_ms is None else slow_ms
+        self.slow_ops: deque = deque(maxlen=slow_log_size or settings.mongo_slow_log_size)
+        # (connection, request id) -> (route, collection) between started and finished
+        self._pending: Dict[tuple, tuple] = {}
+
+    def started(self, event):
+        if event.command_name in IGNORED_COMMANDS:
+            return
+        collection = event.command.get(event.command_name)
+        self._pending[(event.connection_id, event.request_id)] = (
+            current_route(),
+            collection if isinstance(collection, str) else None,
+        )
+
+    def succeeded(self, event):
+        self._finish(event, reply=event.reply)
+
+    def failed(self, event):
+        mongo_command_failures.inc(event.command_name)
+        self._finish(event, error=str(event.failure.get("errmsg", "")))
+
+    def _finish(self, event, reply: dict = None, error: str = None):
+        pending = self._pending.pop((event.connection_id, event.request_id), None)
+        if pending is None:
+            return
+        route, collection = pending
+        seconds = event.duration_micros / 1e6
+        mongo_command_duration.observe(seconds, event.command_name)
+
+        duration_ms = seconds * 1000
+        if duration_ms >= self.slow_ms:
+            reply_bytes = len(bson.encode(reply)) if reply else 0
+            mongo_slow_reply_bytes.inc(event.command_name, amount=reply_bytes)
+            operation = {
+                "time": time.time(),
+                "command": event.command_name,
+                "database": event.database_name,
+                "collection": collection,
+                "route": route,
+                "duration_ms": round(duration_ms, 2),
+                "reply_bytes": reply_bytes,
+            }
+            if error is not None:
+                operation["error"] = error
+            self.slow_ops.append(operation)
+            logger.warning("slow mongodb command", extra={"fields": operation})
+
+    def recent_slow_ops(self, limit: int = None) -> List[dict]:
+        """Slow operations, newest first."""
+        operations = list(self.slow_ops)[::-1]
+        return operations[:limit] if limit else operations
+
+    @staticmethod
+    def command_stats() -> Dict[str, dict]:
+        """Aggregates per command name, derived from the metric shards."""
+        failures = mongo_command_failures.values()
+        reply_bytes = mongo_slow_reply_bytes.values()
+        stats = {}
+        for (command,), state in sorted(mongo_command_duration.values().items()):
+            count = sum(state[:-1])
+            total_ms = state[-1] * 1000
+            stats[command] = {
+                "count": count,
+                "failures": failures.get((command,), 0),
+                "total_ms": round(total_ms, 2),
+                "avg_ms": round(total_ms / count, 3) if count else 0.0,
+                "slow_reply_bytes": reply_bytes.get((command,), 0),
+            }
+        return stats
+
+
+command_monitor = CommandMonitor()
@@ -1,88 +1,239 @@
 """
-Rate limiting middleware using a simple in-memory sliding window approach.
+Rate limiting middleware.
+The default backend is an in-memory token bucket per client: O(1) state,
+idle clients evicted LRU-first past a configurable bound, and routes that
+can cost more than one token. The "mongo" and "shm" backends share one
+budget across workers and replicas via leased tokens.
 """
+import json
+import logging
+import math
 import time
-from typing import Dict, List
-from fastapi import Request, HTTPException, status
-from starlette.middleware.base import BaseHTTPMiddleware
+from collections import OrderedDict
+from typing import Callable, Dict, Optional, Tuple
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from .config import get_settings
+from .metrics import rate_limit_rejections
+from .rate_limit_store import MongoRateLimitStore, RateLimitStoreFull, SharedMemoryRateLimitStore
 
 settings = get_settings()
+logger = logging.getLogger("app.rate_limit")
 
 
 class RateLimiter:
-    """Simple in-memory rate limiter using sliding window."""
+    """Token bucket rate limiter with bounded, LRU-evicted client state."""
     
-    def __init__(self, requests_per_minute: int = 60):
+    def __init__(
+        self,
+        requests_per_minute: int = 60,
+        max_clients: int = 10000,
+        route_costs: Dict[str, int] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
         self.requests_per_minute = requests_per_minute
-        self.window_size = 60  # 1 minute window
-        self.requests: Dict[str, List[float]] = {}
+        self.capacity = float(requests_per_minute)
+        self.refill_per_second = requests_per_minute / 60
+        self.max_clients = max_clients
+        self.route_costs = route_costs or {}
+        self.clock = clock
+        # key -> (tokens, last refill time), most recently used last
+        self.buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()
     
-    def _get_client_key(self, request: Request) -> str:
+    def _get_client_key(self, scope: Scope) -> str:
         """Get unique client identifier."""
-        client_ip = request.client.host if request.client else "unknown"
-        return client_ip
+        client = scope.get("client")
+        return client[0] if client else "unknown"
     
-    def _clean_old_requests(self, key: str, current_time: float):
-        """Remove requests outside the sliding window."""
-        if key in self.requests:
-            cutoff = current_time - self.window_size
-            self.requests[key] = [t for t in self.requests[key] if t > cutoff]
+    def cost_of(self, path: str) -> int:
+        """Tokens a request to this path consumes."""
+        return self.route_costs.get(path, 1)
     
-    def is_allowed(self, request: Request) -> bool:
-        """Check if request is allowed under rate limit."""
-        key = self._get_client_key(request)
-        current_time = time.time()
+    def consume(self, key: str, cost: int = 1) -> Tuple[bool, int, float]:
+        """
+        Refill the client's bucket and try to take cost tokens in one step.
+        Returns (allowed, remaining, retry_after_seconds).
+        """
+        now = self.clock()
+        bucket = self.buckets.pop(key, None)
+        if bucket is None:
+            tokens = self.capacity
+        else:
+            tokens, last = bucket
+            tokens = min(self.capacity, tokens + (now - last) * self.refill_per_second)
         
-        self._clean_old_requests(key, current_time)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
         
-        if key not in self.requests:
-            self.requests[key] = []
+        # Re-inserting marks the key most recently used; drop the least recent
+        self.buckets[key] = (tokens, now)
+        while len(self.buckets) > self.max_clients:
+            self.buckets.popitem(last=False)
         
-        if len(self.requests[key]) >= self.requests_per_minute:
-            return False
-        
-        self.requests[key].append(current_time)
-        return True
+        retry_after = 0.0 if allowed else (cost - tokens) / self.refill_per_second
+        return allowed, int(tokens), retry_after
+    
+    async def hit(self, scope: Scope) -> Tuple[bool, int, float]:
+        """Charge a request (by its ASGI scope) against its client's budget."""
+        return self.consume(self._get_client_key(scope), self.cost_of(scope["path"]))
+    
+    def reset(self):
+        """Forget all clients."""
+        self.buckets.clear()
+
+
+class SharedRateLimiter(RateLimiter):
+    """
+    Fixed one-minute windows counted in a shared store.
+    Each worker leases a batch of tokens from the store and spends them
+    locally, so the store is only consulted when a lease runs out.
+    Windows are numbered from wall-clock time so every host agrees on them;
+    the monotonic clock only drives the local bucket and the retry timer.
+    If the store fails, requests fall back to this worker's token bucket
+    and the store is left alone for store_retry_seconds, so an outage
+    neither fails requests nor makes each one wait for a timeout.
+    """
+    
+    window_seconds = 60
+    store_retry_seconds = 5.0
     
-    def get_remaining(self, request: Request) -> int:
-        """Get remaining requests for client."""
-        key = self._get_client_key(request)
-        current_time = time.time()
-        self._clean_old_requests(key, current_time)
+    def __init__(self, store, lease_size: int = 5, wall_clock: Callable[[], float] = time.time, **kwargs):
+        super().__init__(**kwargs)
+        self.store = store
+        self.wall_clock = wall_clock
+        self.lease_size = lease_size
+        # key -> (window, leased tokens left, used in window as last seen by the store)
+        self.leases: "OrderedDict[str, Tuple[int, int, int]]" = OrderedDict()
+        self.store_down_until = 0.0
+    
+    async def consume_shared(self, key: str, cost: int = 1) -> Tuple[bool, int, float]:
+        now = self.wall_clock()
+        window = int(now // self.window_seconds)
+        lease_window, tokens, used = self.leases.pop(key, (window, 0, 0))
+        if lease_window != window:
+            tokens, used = 0, 0
+        
+        # Once the store reports the window spent, deny locally until it rolls over
+        if tokens < cost and used < self.requests_per_minute:
+            lease = await self._lease(key, window, max(cost - tokens, self.lease_size))
+            if lease is None:
+                # No shared count for this request; charge this worker's bucket
+                if tokens or used:
+                    self.leases[key] = (window, tokens, used)
+                return self.consume(key, cost)
+            granted, used = lease
+            tokens += granted
+        
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
         
-        used = len(self.requests.get(key, []))
-        return max(0, self.requests_per_minute - used)
+        self.leases[key] = (window, tokens, used)
+        while len(self.leases) > self.max_clients:
+            self.leases.popitem(last=False)
+        
+        remaining = tokens + max(0, self.requests_per_minute - used)
+        retry_after = 0.0 if allowed else (window + 1) * self.window_seconds - now
+        return allowed, remaining, retry_after
+    
+    async def _lease(self, key: str, window: int, want: int) -> Optional[Tuple[int, int]]:
+        """Lease from the store, or None when it can't be used right now."""
+        now = self.clock()
+        if now < self.store_down_until:
+            return None
+        try:
+            return await self.store.lease(key, window, want, self.requests_per_minute)
+        except RateLimitStoreFull:
+            return None
+        except Exception as e:
+            logger.warning(
+                "rate limit store failed; using local buckets",
+                extra={"fields": {"error": str(e), "retry_in_seconds": self.store_retry_seconds}}
+            )
+            self.store_down_until = now + self.store_retry_seconds
+            return None
+    
+    async def hit(self, scope: Scope) -> Tuple[bool, int, float]:
+        return await self.consume_shared(self._get_client_key(scope), self.cost_of(scope["path"]))
+    
+    def reset(self):
+        """Drop local leases (the shared counters expire with their window)."""
+        super().reset()
+        self.leases.clear()
+        self.store_down_until = 0.0
+
+
+def create_rate_limiter() -> RateLimiter:
+    """Build the limiter for the configured backend."""
+    options = dict(
+        requests_per_minute=settings.rate_limit_per_minute,
+        max_clients=settings.rate_limit_max_clients,
+        route_costs=settings.rate_limit_route_costs_map
+    )
+    if settings.rate_limit_backend == "mongo":
+        store = MongoRateLimitStore()
+    elif settings.rate_limit_backend == "shm":
+        store = SharedMemoryRateLimitStore(settings.rate_limit_shm_name, settings.rate_limit_shm_slots)
+    else:
+        return RateLimiter(**options)
+    return SharedRateLimiter(store, lease_size=settings.rate_limit_lease_size, **options)
 
 
 # Global rate limiter instance
-rate_limiter = RateLimiter(requests_per_minute=settings.rate_limit_per_minute)
+rate_limiter = create_rate_limiter()
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Middleware to enforce rate limiting."""
+# Everything about a 429 except Retry-After is the same every time
+REJECTED_BODY = json.dumps({"detail": "Rate limit exceeded. Please try again later."}).encode("utf8")
+REJECTED_HEADERS = [
+    (b"content-type", b"application/json"),
+    (b"content-length", str(len(REJECTED_BODY)).encode("latin-1")),
+    (b"x-ratelimit-remaining", b"0"),
+]
+
+
+class RateLimitMiddleware:
+    """
+    ASGI middleware enforcing the rate limit.
+    Rejected requests are answered here with a pre-built 429 and never reach
+    the app; allowed responses get their headers added as they are sent, so
+    streaming bodies pass through untouched.
+    """
+    
+    # Health checks and scrapes must keep working while a client is being throttled
+    exempt_paths = {"/health", "/health/live", "/health/ready", "/metrics"}
     
-    async def dispatch(self, request: Request, call_next):
-        # Skip rate limiting for health checks
-        if request.url.path == "/health":
-            return await call_next(request)
+    def __init__(self, app: ASGIApp, limiter: RateLimiter = None):
+        self.app = app
+        self.limiter = limiter
+        self.limit_header = (b"x-ratelimit-limit", str(settings.rate_limit_per_minute).encode("latin-1"))
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in self.exempt_paths:
+            await self.app(scope, receive, send)
+            return
         
-        if not rate_limiter.is_allowed(request):
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail="Rate limit exceeded. Please try again later.",
-                headers={
-                    "Retry-After": "60",
-                    "X-RateLimit-Limit": str(settings.rate_limit_per_minute),
-                    "X-RateLimit-Remaining": "0"
-                }
-            )
+        limiter = self.limiter or rate_limiter
+        allowed, remaining, retry_after = await limiter.hit(scope)
+        if not allowed:
+            rate_limit_rejections.inc()
+            await send({
+                "type": "http.response.start",
+                "status": 429,
+                "headers": [
+                    *REJECTED_HEADERS,
+                    self.limit_header,
+                    (b"retry-after", str(math.ceil(retry_after)).encode("latin-1")),
+                ],
+            })
+            await send({"type": "http.response.body", "body": REJECTED_BODY})
+            return
         
-        response = await call_next(request)
+        headers = [self.limit_header, (b"x-ratelimit-remaining", str(remaining).encode("latin-1"))]
         
-        # Add rate limit headers
-        remaining = rate_limiter.get_remaining(request)
-        response.headers["X-RateLimit-Limit"] = str(settings.rate_limit_per_minute)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        async def send_with_headers(message: Message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
         
-        return response
+        await self.app(scope, receive, send_with_headers)
@@ -0,0 +1,119 @@
+"""
+Shared counters for rate limiting across worker processes and replicas.
+Both stores count requests per client in fixed one-minute windows and hand
+out tokens in leases, so a worker only touches the shared store once per
+lease instead of once per request.
+"""
+import fcntl
+import hashlib
+import os
+import struct
+import tempfile
+from datetime import datetime, timezone
+from multiprocessing import resource_tracker, shared_memory
+from typing import Tuple
+from pymongo import ReturnDocument
+from .database import get_database
+
+
+class RateLimitStoreFull(Exception):
+    """No slot is free for a client; the limiter counts it locally instead."""
+
+
+class MongoRateLimitStore:
+    """
+    Window counters in MongoDB, one document per client and minute.
+    Leases are a single atomic $inc; a TTL index (migration 2) removes
+    expired windows. Windows are numbered from the Unix epoch
+    (time.time() // 60), so _id is the same on every replica and expire_at
+    is a real date.
+    """
+
+    def __init__(self, collection_name: str = "rate_limits", window_seconds: int = 60):
+        self.collection_name = collection_name
+        self.window_seconds = window_seconds
+
+    async def lease(self, key: str, window: int, want: int, limit: int) -> Tuple[int, int]:
+        """Take up to want tokens from the window; returns (granted, used_in_window)."""
+        collection = get_database()[self.collection_name]
+        expire_at = datetime.fromtimestamp((window + 2) * self.window_seconds, tz=timezone.utc)
+        document = await collection.find_one_and_update(
+            {"_id": f"{key}:{window}"},
+            {"$inc": {"count": want}, "$setOnInsert": {"expire_at": expire_at}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        used = document["count"]
+        # Concurrent leases may overshoot the limit; only grant what was left
+        granted = max(0, min(want, limit - (used - want)))
+        return granted, min(used, limit)
+
+
+class SharedMemoryRateLimitStore:
+    """
+    Window counters in a shared memory segment for workers on one host.
+    Clients hash into a fixed table of slots, so memory is bounded; the
+    table is guarded by an flock held only while a lease is taken. A
+    client whose slots are all held by others in the current window is
+    refused with RateLimitStoreFull rather than sharing a counter.
+    """
+
+    slot = struct.Struct("<QqQ")  # key hash, window, count
+    probe_limit = 8
+
+    def __init__(self, name: str, slots: int = 65536):
+        self.slots = slots
+        size = self.slot.size * slots
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            self.shm = shared_memory.SharedMemory(name=name)
+        # The segment outlives any single worker; don't let exit unlink it
+        resource_tracker.unregister(self.shm._name, "shared_memory")
+        self._lock_fd = os.open(
+            os.path.join(tempfile.gettempdir(), f"{name}.lock"), os.O_RDWR | os.O_CREAT, 0o600
+        )
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        value = int.from_bytes(hashlib.blake2b(key.encode("utf8"), digest_size=8).digest(), "little")
+        return value or 1  # 0 marks an empty slot
+
+    def _find_slot(self, key_hash: int, window: int) -> Tuple[int, int]:
+        """Offset of the slot for key_hash and its count in the current window."""
+        buffer = self.shm.buf
+        first = key_hash % self.slots
+        free = None
+        for probe in range(self.probe_limit):
+            offset = ((first + probe) % self.slots) * self.slot.size
+            slot_hash, slot_window, count = self.slot.unpack_from(buffer, offset)
+            if slot_hash == key_hash:
+                return offset, count if slot_window == window else 0
+            if free is None and (slot_hash == 0 or slot_window < window):
+                free = offset
+        if free is None:
+            # Every probed slot counts another client in this window; taking
+            # one over would reset its budget
+            raise RateLimitStoreFull(f"no free slot within {self.probe_limit} probes")
+        return free, 0
+
+    async def lease(self, key: str, window: int, want: int, limit: int) -> Tuple[int, int]:
+        """Take up to want tokens from the window; returns (granted, used_in_window)."""
+        key_hash = self._hash(key)
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+        try:
+            offset, used = self._find_slot(key_hash, window)
+            granted = max(0, min(want, limit - used))
+            self.slot.pack_into(self.shm.buf, offset, key_hash, window, used + granted)
+        finally:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        return granted, used + granted
+
+    def close(self, unlink: bool = False):
+        """Detach from the segment, removing it when unlink is set."""
+        os.close(self._lock_fd)
+        self.shm.close()
+        if unlink:
+            # unlink() unregisters the segment, so hand it back to the tracker first
+            resource_tracker.register(self.shm._name, "shared_memory")
+            self.shm.unlink()
@@ -0,0 +1,45 @@
+"""
+Fast JSON responses for documents we already trust.
+Returning a Response from a handler skips FastAPI's response_model
+validation and jsonable_encoder pass; orjson then encodes the content in
+one native call. Routes keep their response_model, so OpenAPI is unchanged.
+"""
+from typing import Any, Optional
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+
+def _default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse encoded with orjson; also accepts pre-encoded bytes."""
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def fast_json(content: Any, response: Optional[Response] = None, status_code: int = 200) -> FastJSONResponse:
+    """
+    Build the response directly, carrying over headers (e.g. ETag) that
+    dependencies set on the injected Response, which FastAPI only merges
+    into responses it builds itself.
+    """
+    fast = FastJSONResponse(content, status_code=status_code)
+    if response is not None:
+        for name, value in response.raw_headers:
+            if name != b"content-length":
+                fast.raw_headers.append((name, value))
+    return fast
+
@@ -0,0 +1,21 @@
+from fastapi import APIRouter, Depends, Query
+from ..auth import require_auth
+from ..mongo_monitoring import command_monitor
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@router.get("/mongo")
+async def mongo_stats(
+    limit: int = Query(50, ge=1, le=1000, description="Slow operations to return"),
+    username: str = Depends(require_auth)
+):
+    """
+    MongoDB command statistics and the most recent slow operations.
+    Requires HTTP Basic Auth.
+    """
+    return {
+        "slow_threshold_ms": command_monitor.slow_ms,
+        "commands": command_monitor.command_stats(),
+        "slow_ops": command_monitor.recent_slow_ops(limit)
+    }
@@ -0,0 +1,61 @@
+"""
+Several read endpoints in one request.
+GET /bundle?include=profile,projects,top_skills answers from a single
+profile snapshot, so a page load costs one middleware pass, one rate-limit
+hit (weighted by RATE_LIMIT_ROUTE_COSTS) and at most one document fetch.
+"""
+from typing import List, Optional
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from ..cache import ProfileSnapshot
+from ..etag import conditional_snapshot
+from ..responses import fast_json
+from .profile import build_profile_json
+from .query import projects_listing, skills_listing, top_skills_listing
+
+router = APIRouter(tags=["query"])
+
+PARTS = ("profile", "skills", "top_skills", "projects")
+
+
+def parse_include(include: str) -> List[str]:
+    parts = list(dict.fromkeys(part.strip() for part in include.split(",") if part.strip()))
+    unknown = [part for part in parts if part not in PARTS]
+    if unknown or not parts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"include must list some of: {', '.join(PARTS)}"
+        )
+    return parts
+
+
+@router.get("/bundle")
+async def get_bundle(
+    response: Response,
+    include: str = Query(",".join(PARTS), description="Comma-separated parts to return"),
+    top_limit: int = Query(5, ge=1, le=20, description="Number of top skills"),
+    skill: Optional[List[str]] = Query(None, description="Filter projects by skill (repeatable)"),
+    page: int = Query(1, ge=1, description="Projects page number"),
+    page_size: int = Query(None, ge=1, le=100, description="Projects per page"),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+):
+    """
+    Get the profile, skills, top skills and a page of projects in one response.
+    Each part has the same shape as its own endpoint (/profile, /skills,
+    /skills/top, /projects); profile is null when no profile exists.
+    """
+    bundle = {}
+    for part in parse_include(include):
+        if part == "profile":
+            # Reuse the body GET /profile already encoded for this version
+            body = snapshot.derive("profile_json", build_profile_json)
+            bundle["profile"] = orjson.Fragment(body) if body is not None else None
+        elif part == "skills":
+            bundle["skills"] = skills_listing(snapshot)
+        elif part == "top_skills":
+            bundle["top_skills"] = top_skills_listing(snapshot, top_limit)
+        else:
+            bundle["projects"] = await projects_listing(
+                snapshot, skill, page=page, page_size=page_size, query_mode="memory"
+            )
+    return fast_json(bundle, response)
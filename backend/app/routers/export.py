@@ -0,0 +1,147 @@
+import csv
+import io
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Literal, Optional
+from ..auth import require_auth
+from ..changes import export_watermark, from_millis
+from ..config import get_settings
+from ..database import get_read_database
+
+router = APIRouter(tags=["export"])
+settings = get_settings()
+
+PROFILE_FIELDS = ["name", "email", "version", "updated_at", "education", "skills", "projects", "work", "links"]
+ITEM_FIELDS = {
+    "projects": ["title", "description", "skills", "links"],
+    "work": ["title", "company", "duration", "description"],
+}
+
+# Flush the response roughly every this many bytes
+CHUNK_BYTES = 64 * 1024
+
+
+def _parse_fields(fields: Optional[str], allowed: List[str]) -> List[str]:
+    if not fields:
+        return allowed
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(unknown)}"
+        )
+    return requested
+
+
+def _csv_value(value) -> str:
+    if isinstance(value, list):
+        return ";".join(str(v) for v in value)
+    return "" if value is None else str(value)
+
+
+async def _chunked(lines: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    """Group small lines into larger chunks to cut per-write overhead."""
+    buffer: List[str] = []
+    size = 0
+    async for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield "".join(buffer).encode("utf8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf8")
+
+
+async def _documents(entity: str, fields: List[str], since: Optional[int], batch_size: int):
+    db = get_read_database()
+    projection = fields if entity == "profiles" else ["email", entity]
+    if since is None:
+        cursor = db.profiles.find({}, projection, batch_size=batch_size).sort("_id", 1)
+    else:
+        # Range scan over the updated_at index, oldest change first;
+        # updated_at has millisecond precision, like the watermark
+        query = {"updated_at": {"$gte": from_millis(since + 1)}}
+        cursor = db.profiles.find(query, projection, batch_size=batch_size).sort("updated_at", 1)
+    async for document in cursor:
+        yield document
+
+
+async def _profile_lines(fields, since, batch_size) -> AsyncIterator[str]:
+    async for document in _documents("profiles", fields, since, batch_size):
+        record = {"id": str(document["_id"])}
+        record.update((f, document[f]) for f in fields if f in document)
+        yield json.dumps(record, default=str) + "\n"
+
+
+async def _item_rows(entity, fields, since, batch_size) -> AsyncIterator[dict]:
+    async for document in _documents(entity, fields, since, batch_size):
+        for item in document.get(entity, []):
+            row = {"profile_id": str(document["_id"]), "email": document.get("email")}
+            row.update((f, item.get(f)) for f in fields)
+            yield row
+
+
+async def _item_ndjson(entity, fields, since, batch_size) -> AsyncIterator[str]:
+    async for row in _item_rows(entity, fields, since, batch_size):
+        yield json.dumps(row, default=str) + "\n"
+
+
+async def _item_csv(entity, fields, since, batch_size) -> AsyncIterator[str]:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["profile_id", "email", *fields])
+    async for row in _item_rows(entity, fields, since, batch_size):
+        writer.writerow([_csv_value(row[column]) for column in ["profile_id", "email", *fields]])
+        yield out.getvalue()
+        out.seek(0)
+        out.truncate()
+    yield out.getvalue()
+
+
+@router.get("/export")
+async def export(
+    entity: Literal["profiles", "projects", "work"] = Query("profiles", description="What to export"),
+    format: Literal["ndjson", "csv"] = Query("ndjson", description="csv is available for projects and work"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to include"),
+    since: Optional[int] = Query(None, ge=0, description="Only profiles changed after this X-Export-Watermark value"),
+    batch_size: int = Query(None, ge=1, le=10000, description="Documents per MongoDB cursor batch"),
+    username: str = Depends(require_auth)
+):
+    """
+    Stream profiles, or the projects/work entries inside them, as NDJSON or CSV.
+    Documents come straight off a MongoDB cursor and are written as they
+    arrive, so memory use doesn't grow with the size of the collection.
+    Pass X-Export-Watermark back as ?since= to get only what changed after
+    it. The watermark trails the newest change by EXPORT_WATERMARK_LAG_MS, so
+    writes in flight during an export reach the next one; recent changes may
+    appear in both.
+    Requires HTTP Basic Auth.
+    """
+    batch_size = batch_size or settings.export_batch_size
+
+    if entity == "profiles":
+        if format == "csv":
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="CSV export is only available for projects and work"
+            )
+        lines = _profile_lines(_parse_fields(fields, PROFILE_FIELDS), since, batch_size)
+    elif format == "csv":
+        lines = _item_csv(entity, _parse_fields(fields, ITEM_FIELDS[entity]), since, batch_size)
+    else:
+        lines = _item_ndjson(entity, _parse_fields(fields, ITEM_FIELDS[entity]), since, batch_size)
+
+    watermark = await export_watermark(get_read_database())
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    extension = "csv" if format == "csv" else "ndjson"
+    return StreamingResponse(
+        _chunked(lines),
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="{entity}.{extension}"',
+            "X-Export-Watermark": str(watermark),
+        }
+    )
@@ -1,4 +1,6 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response, status
+from .. import database
+from ..cache import profile_cache
 
 router = APIRouter(tags=["health"])
 
@@ -6,4 +8,30 @@ router = APIRouter(tags=["health"])
 @router.get("/health")
 async def health_check():
     """Health check endpoint for liveness probe."""
-    return {"status": "healthy", "message": "API is running"}
+    return {
+        "status": "healthy",
+        "message": "API is running",
+        "cache": profile_cache.stats()
+    }
+
+
+@router.get("/health/live")
+async def liveness():
+    """Liveness probe: the process is up and serving. Never touches MongoDB."""
+    return {"status": "alive"}
+
+
+@router.get("/health/ready")
+async def readiness(response: Response):
+    """
+    Readiness probe: the connection pool is warm and MongoDB answers a ping.
+    Returns 503 until then, so load balancers hold traffic back.
+    """
+    ready = database.pool_ready and await database.ping()
+    if not ready:
+        response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    return {
+        "status": "ready" if ready else "starting",
+        "pool_ready": database.pool_ready,
+        "schema": database.schema_status
+    }
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from ..cache import profile_cache
+from ..metrics import render_metrics
+
+router = APIRouter(tags=["health"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Request, rate limit, cache and MongoDB metrics in the Prometheus text format."""
+    return PlainTextResponse(
+        render_metrics(profile_cache.stats()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -1,7 +1,16 @@
-from fastapi import APIRouter, HTTPException, status, Depends
-from ..database import get_database
-from ..models import ProfileCreate, ProfileUpdate, ProfileResponse
+from typing import Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
+from ..database import get_write_database
+from ..cache import ProfileSnapshot, profile_cache
+from ..changes import TOUCH, insert_stamped
+from ..compression import snapshot_response
+from ..etag import conditional_snapshot
+from ..fieldsets import PROFILE_PATHS, Fieldset, parse_fieldset
+from ..models import (
+    Education, Links, Project, ProfileCreate, ProfileUpdate, ProfileResponse, WorkExperience, assign_item_ids
+)
 from ..auth import require_auth
+from ..responses import dumps, fast_json
 from bson import ObjectId
 
 router = APIRouter(prefix="/profile", tags=["profile"])
@@ -21,17 +30,79 @@ def profile_helper(profile) -> dict:
     }
 
 
-@router.get("", response_model=ProfileResponse)
-async def get_profile():
-    """Get the candidate profile."""
-    db = get_database()
-    profile = await db.profiles.find_one()
+def sparse_profile(profile: dict, fieldset: Fieldset) -> dict:
+    """The requested fields of a (possibly projected) document, plus its id."""
+    return {"id": str(profile["_id"]), **fieldset.apply(profile)}
+
+
+def _field_defaults(model) -> list:
+    return [(name, field.get_default(call_default_factory=True)) for name, field in model.model_fields.items()]
+
+
+_EDUCATION = _field_defaults(Education)
+_PROJECT = _field_defaults(Project)
+_WORK = _field_defaults(WorkExperience)
+_LINKS = _field_defaults(Links)
+
+
+def _shape(fields: list, item: dict) -> dict:
+    return {name: item.get(name, default) for name, default in fields}
+
+
+def profile_response(profile: dict) -> dict:
+    """
+    The ProfileResponse.model_dump(mode="json") of a stored profile, built
+    without validating it again: every write path validated the document
+    already, so this only fills defaults and keeps the model's field order.
+    """
+    return {
+        "name": profile["name"],
+        "email": profile["email"],
+        "education": [_shape(_EDUCATION, item) for item in profile.get("education") or []],
+        "skills": profile.get("skills") or [],
+        "projects": [_shape(_PROJECT, item) for item in profile.get("projects") or []],
+        "work": [_shape(_WORK, item) for item in profile.get("work") or []],
+        "links": _shape(_LINKS, profile.get("links") or {}),
+        "id": str(profile["_id"]),
+    }
+
+
+def build_profile_json(profile: Optional[dict], previous=None) -> Optional[bytes]:
+    """
+    Snapshot builder: the GET /profile body, encoded once per document
+    version, so requests serve the same bytes.
+    """
     if not profile:
+        return None
+    return dumps(profile_response(profile))
+
+
+@router.get("", response_model=ProfileResponse)
+async def get_profile(
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,links,projects.title"),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+):
+    """
+    Get the candidate profile.
+    With ?fields= only those fields (and id) are returned.
+    """
+    fieldset = parse_fieldset(fields, PROFILE_PATHS, implied=("id",))
+    if fieldset is not None:
+        if not snapshot.document:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found"
+            )
+        return fast_json(sparse_profile(snapshot.document, fieldset), response)
+    served = await snapshot_response(request, response, snapshot, "profile_json", build_profile_json)
+    if served is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Profile not found"
         )
-    return profile_helper(profile)
+    return served
 
 
 @router.post("", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
@@ -40,7 +111,7 @@ async def create_profile(profile: ProfileCreate, username: str = Depends(require
     Create a new profile.
     Requires HTTP Basic Auth.
     """
-    db = get_database()
+    db = get_write_database()
     
     # Check if profile already exists
     existing = await db.profiles.find_one()
@@ -50,10 +121,12 @@ async def create_profile(profile: ProfileCreate, username: str = Depends(require
             detail="Profile already exists. Use PUT to update."
         )
     
-    profile_dict = profile.model_dump()
-    result = await db.profiles.insert_one(profile_dict)
+    profile_dict = assign_item_ids(profile.model_dump())
+    profile_dict["version"] = 1
+    profile_id = await insert_stamped(db.profiles, profile_dict)
     
-    created_profile = await db.profiles.find_one({"_id": result.inserted_id})
+    created_profile = await db.profiles.find_one({"_id": profile_id})
+    profile_cache.publish(created_profile)
     return profile_helper(created_profile)
 
 
@@ -63,7 +136,7 @@ async def update_profile(profile_update: ProfileUpdate, username: str = Depends(
     Update the profile.
     Requires HTTP Basic Auth.
     """
-    db = get_database()
+    db = get_write_database()
     
     existing = await db.profiles.find_one()
     if not existing:
@@ -73,14 +146,16 @@ async def update_profile(profile_update: ProfileUpdate, username: str = Depends(
         )
     
     update_data = {k: v for k, v in profile_update.model_dump().items() if v is not None}
+    assign_item_ids(update_data)
     
     if update_data:
         await db.profiles.update_one(
             {"_id": existing["_id"]},
-            {"$set": update_data}
+            {"$set": update_data, "$currentDate": TOUCH, "$inc": {"version": 1}}
         )
     
     updated_profile = await db.profiles.find_one({"_id": existing["_id"]})
+    profile_cache.publish(updated_profile)
     return profile_helper(updated_profile)
 
 
@@ -90,9 +165,10 @@ async def delete_profile(username: str = Depends(require_auth)):
     Delete the profile.
     Requires HTTP Basic Auth.
     """
-    db = get_database()
+    db = get_write_database()
     
     result = await db.profiles.delete_one({})
+    profile_cache.publish(None)
     if result.deleted_count == 0:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -0,0 +1,170 @@
+"""
+Sub-resources for the profile's projects, work and education entries.
+Each write is a single find_one_and_update ($push, positional $set or
+$pull) that projects only the affected entry, so neither the request nor
+the reply grows with the size of the profile.
+"""
+from typing import List, Optional, Type
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from pydantic import BaseModel
+from pymongo import ReturnDocument, UpdateOne
+from ..auth import require_auth
+from ..cache import ProfileSnapshot, profile_cache
+from ..changes import TOUCH
+from ..compression import snapshot_response
+from ..database import get_write_database
+from ..etag import conditional_snapshot
+from ..models import Education, ItemBatch, Project, WorkExperience, new_item_id
+from ..responses import dumps
+
+router = APIRouter(prefix="/profile", tags=["profile"])
+
+SECTIONS = {
+    "projects": (Project, "Project"),
+    "work": (WorkExperience, "Work experience"),
+    "education": (Education, "Education entry"),
+}
+
+
+def _profile_filter() -> dict:
+    """Target the cached profile when known; otherwise the one find_one() returns, as GET /profile does."""
+    document_id = profile_cache.document_id()
+    return {"_id": document_id} if document_id is not None else {}
+
+
+def _not_found(label: str):
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"{label} not found"
+    )
+
+
+def _item(model: BaseModel, item_id: str) -> dict:
+    return {**model.model_dump(), "id": item_id}
+
+
+def _replace(items: List[dict], item: dict) -> List[dict]:
+    return [item if existing.get("id") == item["id"] else existing for existing in items]
+
+
+def _add_section_routes(section: str, model: Type[BaseModel], label: str):
+    def build_section_json(profile: Optional[dict], previous=None) -> Optional[bytes]:
+        return dumps(profile.get(section, [])) if profile else None
+
+    async def list_items(
+        request: Request,
+        response: Response,
+        snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+    ):
+        served = await snapshot_response(request, response, snapshot, f"{section}_json", build_section_json)
+        if served is None:
+            raise _not_found("Profile")
+        return served
+
+    async def add_item(item: model, username: str = Depends(require_auth)):
+        db = get_write_database()
+        new = _item(item, new_item_id())
+        profile = await db.profiles.find_one_and_update(
+            _profile_filter(),
+            {"$push": {section: new}, "$currentDate": TOUCH, "$inc": {"version": 1}},
+            projection={"version": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not profile:
+            raise _not_found("Profile")
+        profile_cache.apply(
+            profile["_id"], profile["version"],
+            lambda doc: {**doc, section: [*doc.get(section, []), new]},
+            edited=(section, new["id"])
+        )
+        return new
+
+    async def replace_item(item_id: str, item: model, username: str = Depends(require_auth)):
+        db = get_write_database()
+        updated = _item(item, item_id)
+        profile = await db.profiles.find_one_and_update(
+            {**_profile_filter(), f"{section}.id": item_id},
+            {"$set": {f"{section}.$": updated}, "$currentDate": TOUCH, "$inc": {"version": 1}},
+            projection={"version": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not profile:
+            raise _not_found(label)
+        profile_cache.apply(
+            profile["_id"], profile["version"],
+            lambda doc: {**doc, section: _replace(doc.get(section, []), updated)},
+            edited=(section, item_id)
+        )
+        return updated
+
+    async def delete_item(item_id: str, username: str = Depends(require_auth)):
+        db = get_write_database()
+        profile = await db.profiles.find_one_and_update(
+            {**_profile_filter(), f"{section}.id": item_id},
+            {"$pull": {section: {"id": item_id}}, "$currentDate": TOUCH, "$inc": {"version": 1}},
+            projection={"version": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if not profile:
+            raise _not_found(label)
+        profile_cache.apply(
+            profile["_id"], profile["version"],
+            lambda doc: {**doc, section: [i for i in doc.get(section, []) if i.get("id") != item_id]},
+            edited=(section, item_id)
+        )
+
+    async def batch_items(batch: ItemBatch[model], username: str = Depends(require_auth)):
+        missing_ids = [i for i, item in enumerate(batch.update) if not item.id]
+        if missing_ids:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"update[{missing_ids[0]}] has no id"
+            )
+
+        target = _profile_filter()
+        added = [_item(item, new_item_id()) for item in batch.add]
+        operations = []
+        if added:
+            operations.append(UpdateOne(
+                target, {"$push": {section: {"$each": added}}, "$currentDate": TOUCH, "$inc": {"version": 1}}
+            ))
+        for item in batch.update:
+            operations.append(UpdateOne(
+                {**target, f"{section}.id": item.id},
+                {"$set": {f"{section}.$": _item(item, item.id)}, "$currentDate": TOUCH, "$inc": {"version": 1}}
+            ))
+        if batch.remove:
+            operations.append(UpdateOne(
+                target, {"$pull": {section: {"id": {"$in": batch.remove}}}, "$currentDate": TOUCH, "$inc": {"version": 1}}
+            ))
+        if not operations:
+            return {"added": [], "operations": 0, "matched": 0}
+
+        result = await get_write_database().profiles.bulk_write(operations, ordered=True)
+        # Several $inc's landed; let the next read pick up the final document
+        profile_cache.invalidate()
+        return {"added": added, "operations": len(operations), "matched": result.matched_count}
+
+    list_items.__doc__ = f"List the profile's {section} entries."
+    add_item.__doc__ = f"Add one {label.lower()} with a single $push.\nRequires HTTP Basic Auth."
+    replace_item.__doc__ = f"Replace one {label.lower()} by id with a positional $set.\nRequires HTTP Basic Auth."
+    delete_item.__doc__ = f"Delete one {label.lower()} by id with $pull.\nRequires HTTP Basic Auth."
+    batch_items.__doc__ = (
+        f"Add, replace and delete many {section} entries in one ordered bulk_write.\n"
+        "Requires HTTP Basic Auth."
+    )
+
+    path = f"/{section}"
+    router.add_api_route(path, list_items, methods=["GET"], response_model=List[model],
+                         name=f"list_{section}")
+    router.add_api_route(path, add_item, methods=["POST"], response_model=model,
+                         status_code=status.HTTP_201_CREATED, name=f"add_{section}")
+    router.add_api_route(f"{path}/batch", batch_items, methods=["POST"], name=f"batch_{section}")
+    router.add_api_route(f"{path}/{{item_id}}", replace_item, methods=["PUT"], response_model=model,
+                         name=f"replace_{section}")
+    router.add_api_route(f"{path}/{{item_id}}", delete_item, methods=["DELETE"],
+                         status_code=status.HTTP_204_NO_CONTENT, name=f"delete_{section}")
+
+
+for _section, (_model, _label) in SECTIONS.items():
+    _add_section_routes(_section, _model, _label)
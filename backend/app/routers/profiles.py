@@ -0,0 +1,220 @@
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
+from typing import Literal, Optional
+from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from ..database import get_read_database, get_write_database
+from ..cache import profile_cache
+from ..changes import TOUCH, insert_stamped
+from ..config import get_settings
+from ..cursors import decode_cursor, encode_cursor, query_fingerprint
+from ..etag import check_not_modified
+from ..fieldsets import PROFILE_PATHS, parse_fieldset
+from ..responses import fast_json
+from ..models import ProfileCreate, ProfileUpdate, ProfileResponse, assign_item_ids
+from ..auth import require_auth
+from ..bulk_import import import_profiles, iter_lines
+from .profile import profile_helper, sparse_profile
+
+router = APIRouter(prefix="/profiles", tags=["profiles"])
+settings = get_settings()
+
+DEFAULT_LIST_FIELDS = "name,email"
+
+# Sort keys backed by a unique index, so keyset pagination needs no tiebreaker
+SORT_KEYS = {"id": "_id", "email": "email"}
+
+
+def _object_id(profile_id: str) -> ObjectId:
+    if not ObjectId.is_valid(profile_id):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid profile id"
+        )
+    return ObjectId(profile_id)
+
+
+def _not_found():
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail="Profile not found"
+    )
+
+
+def _email_taken():
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="A profile with this email already exists"
+    )
+
+
+@router.get("")
+async def list_profiles(
+    limit: int = Query(None, ge=1, le=100, description="Profiles per page"),
+    sort: Literal["id", "email"] = Query("id", description="Indexed sort key"),
+    skill: Optional[str] = Query(None, description="Only profiles listing this exact skill"),
+    fields: str = Query(DEFAULT_LIST_FIELDS, description="Comma-separated fields to return, e.g. name,projects.title"),
+    cursor: Optional[str] = Query(None, description="Continuation cursor from a previous next_cursor")
+):
+    """
+    List profiles with keyset pagination.
+    Pages are walked with ?cursor=, which continues after the last sort key
+    seen, so every page costs one index range scan.
+    """
+    db = get_read_database()
+    limit = min(limit or settings.default_page_size, settings.max_page_size)
+    sort_field = SORT_KEYS[sort]
+
+    fieldset = parse_fieldset(fields or DEFAULT_LIST_FIELDS, PROFILE_PATHS, implied=("id",))
+    projection = fieldset.projection(sort_field)
+
+    # Served by the (skills, _id) / (skills, email) indexes, already in sort order
+    query = {"skills": skill} if skill else {}
+    fingerprint = query_fingerprint([("sort", sort), ("skill", skill or "")])
+    if cursor:
+        last = decode_cursor(cursor, fingerprint)["after"]
+        query[sort_field] = {"$gt": ObjectId(last) if sort_field == "_id" else last}
+
+    cursor = db.profiles.find(query, projection).sort(sort_field, 1).limit(limit + 1)
+    documents = await cursor.to_list(length=limit + 1)
+    has_more = len(documents) > limit
+    documents = documents[:limit]
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"q": fingerprint, "after": str(documents[-1][sort_field])})
+
+    profiles = [sparse_profile(document, fieldset) for document in documents]
+
+    # An exact count of a filtered query would scan the index, so only
+    # the unfiltered listing reports the collection's estimated size
+    estimated_total = None if skill else await db.profiles.estimated_document_count()
+
+    return {
+        "profiles": profiles,
+        "count": len(profiles),
+        "estimated_total": estimated_total,
+        "next_cursor": next_cursor
+    }
+
+
+@router.post("", response_model=ProfileResponse, status_code=status.HTTP_201_CREATED)
+async def create_profile(profile: ProfileCreate, username: str = Depends(require_auth)):
+    """
+    Create an additional profile.
+    Requires HTTP Basic Auth.
+    """
+    db = get_write_database()
+    profile_dict = assign_item_ids(profile.model_dump())
+    profile_dict["version"] = 1
+    try:
+        profile_dict["_id"] = await insert_stamped(db.profiles, profile_dict)
+    except DuplicateKeyError:
+        raise _email_taken()
+
+    # GET /profile may have cached that no profile exists
+    if profile_cache.is_empty():
+        profile_cache.invalidate()
+    return profile_helper(profile_dict)
+
+
+@router.post("/import")
+async def import_profiles_ndjson(
+    request: Request,
+    batch_size: int = Query(None, ge=1, le=10000, description="Profiles per bulk_write"),
+    concurrency: int = Query(None, ge=1, le=32, description="Batches written in parallel"),
+    upsert: bool = Query(False, description="Update existing profiles matched by email"),
+    username: str = Depends(require_auth)
+):
+    """
+    Bulk import profiles from an NDJSON request body, one profile per line.
+    The body is streamed and written in batches, never held in memory whole.
+    Requires HTTP Basic Auth.
+    """
+    db = get_write_database()
+    report = await import_profiles(
+        db.profiles,
+        iter_lines(request.stream()),
+        batch_size=batch_size,
+        concurrency=concurrency,
+        upsert=upsert
+    )
+    # GET /profile may have cached that no profile exists, or an upserted one
+    profile_cache.invalidate()
+    return report.to_dict()
+
+
+@router.get("/{profile_id}", response_model=ProfileResponse)
+async def get_profile(
+    profile_id: str,
+    request: Request,
+    response: Response,
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. name,links,projects.title")
+):
+    """
+    Get a profile by id.
+    With ?fields= only those fields (and id) are fetched and returned.
+    """
+    db = get_read_database()
+    fieldset = parse_fieldset(fields, PROFILE_PATHS, implied=("id",))
+    # The version is needed for the ETag even when it isn't returned
+    projection = fieldset.projection("version") if fieldset else None
+    profile = await db.profiles.find_one({"_id": _object_id(profile_id)}, projection)
+    if not profile:
+        raise _not_found()
+    check_not_modified(profile, request, response)
+    if fieldset:
+        return fast_json(sparse_profile(profile, fieldset), response)
+    # Trusted document straight from MongoDB: skip response_model re-validation
+    return fast_json(profile_helper(profile), response)
+
+
+@router.put("/{profile_id}", response_model=ProfileResponse)
+async def update_profile(
+    profile_id: str,
+    profile_update: ProfileUpdate,
+    username: str = Depends(require_auth)
+):
+    """
+    Update a profile by id in a single round-trip.
+    Requires HTTP Basic Auth.
+    """
+    db = get_write_database()
+    oid = _object_id(profile_id)
+    update_data = {k: v for k, v in profile_update.model_dump().items() if v is not None}
+    assign_item_ids(update_data)
+
+    try:
+        if update_data:
+            profile = await db.profiles.find_one_and_update(
+                {"_id": oid},
+                {"$set": update_data, "$currentDate": TOUCH, "$inc": {"version": 1}},
+                return_document=ReturnDocument.AFTER
+            )
+        else:
+            profile = await db.profiles.find_one({"_id": oid})
+    except DuplicateKeyError:
+        raise _email_taken()
+    if not profile:
+        raise _not_found()
+
+    if profile_cache.holds(oid):
+        profile_cache.publish(profile)
+    return profile_helper(profile)
+
+
+@router.delete("/{profile_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_profile(profile_id: str, username: str = Depends(require_auth)):
+    """
+    Delete a profile by id.
+    Requires HTTP Basic Auth.
+    """
+    db = get_write_database()
+    oid = _object_id(profile_id)
+    result = await db.profiles.delete_one({"_id": oid})
+    if result.deleted_count == 0:
+        raise _not_found()
+
+    # GET /profile serves whichever profile find_one() returns next
+    if profile_cache.holds(oid):
+        profile_cache.invalidate()
@@ -1,49 +1,194 @@
-from fastapi import APIRouter, Query
-from typing import Optional
-from ..database import get_database
+import re
+from bisect import bisect_right
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from typing import List, Literal, Optional
+from ..cache import ProfileSnapshot, profile_cache
+from ..cursors import decode_cursor, encode_cursor, item_key, query_fingerprint
+from ..database import get_read_database
+from ..etag import conditional_snapshot, conditional_version
+from ..fieldsets import PROJECT_PATHS, Fieldset, parse_fieldset
 from ..config import get_settings
-from collections import Counter
+from ..responses import fast_json
+from ..skill_index import build_skill_index
+from ..search_index import build_search_engine
+from ..fuzzy_index import build_fuzzy_engine
+from ..skill_stats import build_skill_frequency
+from ..similarity import build_executor, build_project_vectors
 
 router = APIRouter(tags=["query"])
 settings = get_settings()
 
+# Project fields item_key() reads to build a continuation cursor
+CURSOR_KEY_FIELDS = ("id", "title", "description")
 
-@router.get("/projects")
-async def get_projects(
-    skill: Optional[str] = Query(None, description="Filter projects by skill"),
-    page: int = Query(1, ge=1, description="Page number"),
-    page_size: int = Query(None, ge=1, le=100, description="Items per page")
-):
+
+def _skill_regex(skill: str) -> dict:
+    """Case-insensitive substring match, mirroring the in-process skill index."""
+    return {"$regex": re.escape(skill), "$options": "i"}
+
+
+def projects_pipeline(
+    skills: Optional[List[str]],
+    mode: str,
+    exclude_skills: Optional[List[str]],
+    start: int,
+    page_size: int,
+    after: Optional[int] = None,
+    fieldset: Optional[Fieldset] = None
+) -> list:
     """
-    Get all projects with optional filtering and pagination.
-    Use ?skill=python to filter projects that use Python.
-    Use ?page=1&page_size=10 for pagination.
+    Aggregation pipeline returning one page of projects plus the total count,
+    so only the requested rows cross the network. Each project carries its
+    array position as _position; after skips to positions past a cursor.
+    A fieldset trims the returned projects to those fields (plus what the
+    next cursor needs).
     """
-    db = get_database()
-    profile = await db.profiles.find_one()
+    conditions = [{"skills": _skill_regex(s)} for s in skills or [] if s]
+    match = {}
+    if conditions:
+        match["$or" if mode == "any" else "$and"] = conditions
+    excluded = [re.compile(re.escape(s), re.IGNORECASE) for s in exclude_skills or [] if s]
+    if excluded:
+        match["skills"] = {"$nin": excluded}
+    
+    items = [{"$skip": start}, {"$limit": page_size}]
+    if fieldset is not None:
+        items.append({"$project": fieldset.projection("_position", *CURSOR_KEY_FIELDS)})
+    if after is not None:
+        items.insert(0, {"$match": {"_position": {"$gt": after}}})
+    
+    return [
+        {"$limit": 1},
+        {"$project": {"_id": 0, "projects": 1}},
+        {"$unwind": {"path": "$projects", "includeArrayIndex": "position"}},
+        {"$addFields": {"projects._position": "$position"}},
+        {"$replaceRoot": {"newRoot": "$projects"}},
+        {"$match": match},
+        {"$facet": {
+            "items": items,
+            "total": [{"$count": "count"}]
+        }}
+    ]
+
+
+async def _projects_page_from_pipeline(skill, mode, exclude_skill, start, page_size, after, fieldset=None):
+    db = get_read_database()
+    pipeline = projects_pipeline(skill, mode, exclude_skill, start, page_size, after, fieldset)
+    result = await db.profiles.aggregate(pipeline).to_list(length=1)
+    facet = result[0] if result else {"items": [], "total": []}
+    total = facet["total"][0]["count"] if facet["total"] else 0
+    return [(item.pop("_position"), item) for item in facet["items"]], total
+
+
+def _projects_page_from_snapshot(snapshot, skill, mode, exclude_skill, start, page_size, after):
+    profile = snapshot.document
     
     if not profile:
-        return {"projects": [], "count": 0, "page": page, "page_size": page_size or settings.default_page_size, "total_pages": 0}
+        return None
     
     projects = profile.get("projects", [])
     
-    # Filter by skill
-    if skill:
-        skill_lower = skill.lower()
-        projects = [
-            p for p in projects
-            if any(skill_lower in s.lower() for s in p.get("skills", []))
-        ]
+    # Filter by skill using the snapshot's bitset index
+    index = snapshot.derive("skill_index", build_skill_index)
+    matches = index.filter(skill, mode, exclude_skill)
+    remaining = matches if after is None else matches & ~((1 << (after + 1)) - 1)
+    positions = index.positions(remaining, start, page_size)
+    return [(i, projects[i]) for i in positions], matches.bit_count()
+
+
+def _build_project_positions(profile: Optional[dict], previous=None) -> dict:
+    positions = {}
+    for position, project in enumerate(profile.get("projects", []) if profile else []):
+        positions.setdefault(item_key(project), position)
+    return positions
+
+
+def _skill_frequency(snapshot: ProfileSnapshot):
+    return snapshot.derive(
+        "skill_frequency", lambda profile, previous: build_skill_frequency(profile, previous, snapshot.edit)
+    )
+
+
+async def _resume_position(payload: dict, snapshot: ProfileSnapshot) -> int:
+    """
+    Array position a cursor continues from.
+    If the profile changed since the cursor was issued, the last-seen project
+    is looked up by key so inserts and deletes elsewhere don't shift the page.
+    """
+    version = (snapshot.document or {}).get("version", 0)
+    if payload["v"] == version:
+        return payload["p"]
+    if snapshot.document and "projects" not in snapshot.document:
+        # Version-only snapshot (pipeline mode): the lookup needs the projects
+        snapshot = await profile_cache.get()
+    positions = snapshot.derive("project_positions", _build_project_positions)
+    return positions.get(payload["k"], payload["p"])
+
+
+def _project_cursor(fingerprint: str, snapshot: ProfileSnapshot, position: int, project: dict, **extra) -> str:
+    return encode_cursor({
+        "q": fingerprint,
+        "v": (snapshot.document or {}).get("version", 0),
+        "p": position,
+        "k": item_key(project),
+        **extra
+    })
+
+
+async def projects_listing(
+    snapshot: ProfileSnapshot,
+    skill: Optional[List[str]] = None,
+    mode: str = "all",
+    exclude_skill: Optional[List[str]] = None,
+    page: int = 1,
+    page_size: Optional[int] = None,
+    cursor: Optional[str] = None,
+    query_mode: Optional[str] = None,
+    fieldset: Optional[Fieldset] = None
+) -> dict:
+    """
+    One page of projects as GET /projects returns it.
+    query_mode overrides settings.projects_query_mode; "memory" answers from
+    the snapshot alone. A fieldset limits each project to those fields.
+    """
+    actual_page_size = min(page_size or settings.default_page_size, settings.max_page_size)
+    fingerprint = query_fingerprint(
+        [("skill", s) for s in skill or []],
+        [("exclude_skill", s) for s in exclude_skill or []],
+        [("mode", mode)]
+    )
     
-    total = len(projects)
+    after = None
+    start = (page - 1) * actual_page_size
+    if cursor:
+        after = await _resume_position(decode_cursor(cursor, fingerprint), snapshot)
+        start = 0
     
-    # Apply pagination
-    actual_page_size = min(page_size or settings.default_page_size, settings.max_page_size)
+    # Fetch one extra row to know whether another page follows
+    if (query_mode or settings.projects_query_mode) == "pipeline":
+        page_result = await _projects_page_from_pipeline(
+            skill, mode, exclude_skill, start, actual_page_size + 1, after, fieldset
+        )
+    else:
+        page_result = _projects_page_from_snapshot(
+            snapshot, skill, mode, exclude_skill, start, actual_page_size + 1, after
+        )
+    
+    if page_result is None:
+        return {"projects": [], "count": 0, "page": page, "page_size": page_size or settings.default_page_size, "total_pages": 0, "next_cursor": None}
+    
+    rows, total = page_result
+    has_more = len(rows) > actual_page_size
+    rows = rows[:actual_page_size]
+    paginated_projects = [project for _, project in rows]
+    if fieldset is not None:
+        paginated_projects = [fieldset.apply(project) for project in paginated_projects]
     total_pages = (total + actual_page_size - 1) // actual_page_size if total > 0 else 0
     
-    start = (page - 1) * actual_page_size
-    end = start + actual_page_size
-    paginated_projects = projects[start:end]
+    next_cursor = None
+    if has_more:
+        position, project = rows[-1]
+        next_cursor = _project_cursor(fingerprint, snapshot, position, project)
     
     return {
         "projects": paginated_projects,
@@ -52,16 +197,15 @@ async def get_projects(
         "page": page,
         "page_size": actual_page_size,
         "total_pages": total_pages,
-        "has_next": page < total_pages,
-        "has_prev": page > 1
+        "has_next": has_more,
+        "has_prev": page > 1 or cursor is not None,
+        "next_cursor": next_cursor
     }
 
 
-@router.get("/skills")
-async def get_skills():
-    """Get all skills from the profile."""
-    db = get_database()
-    profile = await db.profiles.find_one()
+def skills_listing(snapshot: ProfileSnapshot) -> dict:
+    """The profile's skills as GET /skills returns them."""
+    profile = snapshot.document
     
     if not profile:
         return {"skills": [], "count": 0}
@@ -70,87 +214,227 @@ async def get_skills():
     return {"skills": skills, "count": len(skills)}
 
 
-@router.get("/skills/top")
-async def get_top_skills(limit: int = Query(5, ge=1, le=20)):
-    """
-    Get top skills based on frequency in projects.
-    Skills that appear in more projects are ranked higher.
-    """
-    db = get_database()
-    profile = await db.profiles.find_one()
-    
-    if not profile:
+def top_skills_listing(snapshot: ProfileSnapshot, limit: int = 5) -> dict:
+    """The most frequent skills as GET /skills/top returns them."""
+    if not snapshot.document:
         return {"top_skills": []}
     
-    # Count skill occurrences in projects
-    skill_counts = Counter()
-    for project in profile.get("projects", []):
-        for skill in project.get("skills", []):
-            skill_counts[skill.lower()] += 1
-    
-    # Also include profile skills (base count of 1)
-    for skill in profile.get("skills", []):
-        skill_counts[skill.lower()] += 1
-    
-    # Get top skills
+    # Counts include project skills plus profile skills (base count of 1)
+    view = _skill_frequency(snapshot)
     top_skills = [
         {"skill": skill, "count": count}
-        for skill, count in skill_counts.most_common(limit)
+        for skill, count in view.most_common(limit)
     ]
     
     return {"top_skills": top_skills}
 
 
+async def projects_snapshot(request: Request, response: Response) -> ProfileSnapshot:
+    """
+    conditional_snapshot for GET /projects. In pipeline mode the page comes
+    from an aggregation, so only the version is read for the ETag instead
+    of the whole profile.
+    """
+    if settings.projects_query_mode == "pipeline":
+        return await conditional_version(request, response)
+    return await conditional_snapshot(request, response)
+
+
+@router.get("/projects")
+async def get_projects(
+    response: Response,
+    skill: Optional[List[str]] = Query(None, description="Filter projects by skill (repeatable)"),
+    mode: Literal["all", "any"] = Query("all", description="Require all skills or any of them"),
+    exclude_skill: Optional[List[str]] = Query(None, description="Drop projects with this skill (repeatable)"),
+    page: int = Query(1, ge=1, description="Page number"),
+    page_size: int = Query(None, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Continuation cursor from a previous next_cursor"),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return, e.g. title,skills"),
+    snapshot: ProfileSnapshot = Depends(projects_snapshot)
+):
+    """
+    Get all projects with optional filtering and pagination.
+    Use ?skill=python to filter projects that use Python.
+    Use ?skill=python&skill=fastapi&mode=all (or mode=any) to combine skills,
+    and ?exclude_skill=java to drop projects using a skill.
+    Use ?page=1&page_size=10 for pagination, or pass the returned next_cursor
+    as ?cursor= to continue after the last project seen.
+    Use ?fields=title,skills to return only those project fields.
+    """
+    fieldset = parse_fieldset(fields, PROJECT_PATHS)
+    listing = await projects_listing(
+        snapshot, skill, mode, exclude_skill, page, page_size, cursor, fieldset=fieldset
+    )
+    return fast_json(listing, response)
+
+
+def _scored_projects(projects: List[dict], ranked) -> List[dict]:
+    return [{**projects[i], "score": round(score, 4)} for i, score in ranked]
+
+
+@router.get("/projects/recommend")
+async def recommend_projects(
+    response: Response,
+    skill: List[str] = Query(..., description="Skills to match (repeatable)"),
+    limit: int = Query(5, ge=1, le=20, description="Number of projects"),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+):
+    """
+    Recommend projects for a set of skills.
+    Projects are ranked by TF-IDF cosine similarity between the skills and
+    each project's title, description and skills.
+    """
+    profile = snapshot.document
+    if not profile:
+        return fast_json({"skills": skill, "projects": []}, response)
+    
+    vectors = await snapshot.derive_in_executor("project_vectors", build_project_vectors, build_executor)
+    ranked = vectors.recommend(skill, limit)
+    return fast_json({"skills": skill, "projects": _scored_projects(profile.get("projects", []), ranked)}, response)
+
+
+@router.get("/projects/{project_id}/similar")
+async def similar_projects(
+    response: Response,
+    project_id: str,
+    limit: int = Query(5, ge=1, le=20, description="Number of projects"),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+):
+    """
+    Get the projects most similar to one project.
+    Similarity is TF-IDF cosine over titles, descriptions and skills.
+    """
+    profile = snapshot.document
+    positions = snapshot.derive("project_positions", _build_project_positions)
+    position = positions.get(project_id)
+    if not profile or position is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Project not found"
+        )
+    
+    vectors = await snapshot.derive_in_executor("project_vectors", build_project_vectors, build_executor)
+    projects = profile.get("projects", [])
+    return fast_json({
+        "project": projects[position],
+        "similar": _scored_projects(projects, vectors.similar(position, limit))
+    }, response)
+
+
+@router.get("/skills")
+async def get_skills(response: Response, snapshot: ProfileSnapshot = Depends(conditional_snapshot)):
+    """Get all skills from the profile."""
+    return fast_json(skills_listing(snapshot), response)
+
+
+@router.get("/skills/top")
+async def get_top_skills(
+    response: Response,
+    limit: int = Query(5, ge=1, le=20),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+):
+    """
+    Get top skills based on frequency in projects.
+    Skills that appear in more projects are ranked higher.
+    """
+    return fast_json(top_skills_listing(snapshot, limit), response)
+
+
+@router.get("/skills/count")
+async def get_skill_count(
+    response: Response,
+    skill: str = Query(..., min_length=1, description="Skill to count"),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
+):
+    """Get how often a single skill appears across projects and profile skills."""
+    view = _skill_frequency(snapshot)
+    return fast_json({"skill": skill.lower(), "count": view.count(skill)}, response)
+
+
 @router.get("/search")
 async def search(
+    response: Response,
     q: str = Query(..., min_length=1, description="Search query"),
+    mode: Literal["exact", "fuzzy"] = Query("exact", description="fuzzy tolerates typos in skills and titles"),
+    min_similarity: Optional[float] = Query(None, ge=0.5, le=1.0, description="Fuzzy match threshold (0.5-1.0)"),
     page: int = Query(1, ge=1, description="Page number for results"),
-    page_size: int = Query(10, ge=1, le=50, description="Results per page")
+    page_size: int = Query(10, ge=1, le=50, description="Results per page"),
+    cursor: Optional[str] = Query(None, description="Continuation cursor from a previous next_cursor"),
+    snapshot: ProfileSnapshot = Depends(conditional_snapshot)
 ):
     """
     Full-text search across profile data with pagination.
-    Searches name, skills, project titles, and project descriptions.
+    Searches name, skills, project titles/descriptions/skills, and work experience.
+    Results are ranked by relevance. Terms are AND-ed and match word prefixes;
+    use `a OR b`, `"exact phrase"` and `-term` to refine the query.
+    Project matches are paginated with ?page= or with the returned next_cursor.
+    With ?mode=fuzzy, skills, project titles and work titles/companies are
+    matched by edit distance instead ("pytorh" finds PyTorch), scored by
+    similarity and cut to the best FUZZY_SEARCH_TOP_K per list.
     """
-    db = get_database()
-    profile = await db.profiles.find_one()
+    profile = snapshot.document
     
     if not profile:
-        return {"results": [], "query": q}
+        return fast_json({"results": [], "query": q}, response)
     
-    q_lower = q.lower()
+    if mode == "fuzzy":
+        engine = snapshot.derive("fuzzy_engine", build_fuzzy_engine)
+        threshold = min_similarity if min_similarity is not None else settings.fuzzy_search_threshold
+        results = engine.search(q, threshold, settings.fuzzy_search_top_k)
+    else:
+        engine = snapshot.derive("search_engine", build_search_engine)
+        results = engine.search(q)
     
-    # Search in skills
-    matching_skills = [
-        skill for skill in profile.get("skills", [])
-        if q_lower in skill.lower()
-    ]
+    skills = profile.get("skills", [])
+    projects = profile.get("projects", [])
+    work = profile.get("work", [])
     
-    # Search in projects
-    matching_projects = [
-        {"title": p["title"], "description": p["description"], "skills": p.get("skills", [])}
-        for p in profile.get("projects", [])
-        if q_lower in p.get("title", "").lower() or q_lower in p.get("description", "").lower()
-    ]
+    matching_skills = [skills[i] for i, _ in results.skills]
     
-    # Search in work experience
     matching_work = [
-        {"title": w["title"], "company": w["company"], "duration": w.get("duration", "")}
-        for w in profile.get("work", [])
-        if q_lower in w.get("title", "").lower() or 
-           q_lower in w.get("company", "").lower() or
-           q_lower in w.get("description", "").lower()
+        {
+            "title": work[i]["title"],
+            "company": work[i]["company"],
+            "duration": work[i].get("duration", ""),
+            "score": round(score, 4)
+        }
+        for i, score in results.work
     ]
     
-    # Paginate projects
-    total_projects = len(matching_projects)
+    # Paginate projects, either by page or after the (score, position) in the cursor
+    ranked = results.projects
+    total_projects = len(ranked)
+    # Exact-mode cursors keep their original fingerprint
+    fingerprint = query_fingerprint(
+        [("q", q)],
+        [("mode", mode), ("min_similarity", min_similarity)] if mode == "fuzzy" else []
+    )
     start = (page - 1) * page_size
+    if cursor:
+        payload = decode_cursor(cursor, fingerprint)
+        position = await _resume_position(payload, snapshot)
+        start = bisect_right(ranked, (-payload["s"], position), key=lambda r: (-r[1], r[0]))
     end = start + page_size
-    paginated_projects = matching_projects[start:end]
+    page_rows = ranked[start:end]
+    paginated_projects = [
+        {
+            "title": projects[i]["title"],
+            "description": projects[i]["description"],
+            "skills": projects[i].get("skills", []),
+            "score": round(score, 4)
+        }
+        for i, score in page_rows
+    ]
+    
+    next_cursor = None
+    if end < total_projects and page_rows:
+        i, score = page_rows[-1]
+        next_cursor = _project_cursor(fingerprint, snapshot, i, projects[i], s=score)
     
     results = {
         "query": q,
         "matches": {
-            "name": q_lower in profile.get("name", "").lower(),
+            "name": results.name,
             "skills": matching_skills,
             "projects": paginated_projects,
             "work": matching_work
@@ -158,7 +442,8 @@ async def search(
         "total_project_matches": total_projects,
         "page": page,
         "page_size": page_size,
-        "has_more_projects": end < total_projects
+        "has_more_projects": end < total_projects,
+        "next_cursor": next_cursor
     }
     
-    return results
+    return fast_json(results, response)
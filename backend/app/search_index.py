@@ -0,0 +1,292 @@
+"""
+Inverted-index search engine behind GET /search.
+Profile text is tokenized once per profile version into postings
+(term -> document -> field -> positions) and ranked with BM25 using
+per-field boosts. Queries support phrases, OR, and exclusion.
+"""
+import math
+import re
+from bisect import bisect_left
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+TOKEN_RE = re.compile(r"[a-z0-9]+[+#]*")
+QUERY_RE = re.compile(r'(-?)"([^"]*)"|(\S+)')
+
+# Field boosts per document kind: title > skills > description
+PROJECT_FIELDS = {"title": 3.0, "skills": 2.0, "description": 1.0}
+WORK_FIELDS = {"title": 3.0, "company": 2.0, "description": 1.0}
+SKILL_FIELDS = {"skill": 1.0}
+NAME_FIELDS = {"name": 1.0}
+
+# Weight of a vocabulary term reached by prefix expansion ("test" -> "testing")
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+MAX_CACHED_TERMS = 4096
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase terms, keeping suffixes like C++ and C#."""
+    return TOKEN_RE.findall(text.lower())
+
+
+class ParsedQuery(NamedTuple):
+    """A query as AND-ed groups of OR-ed units, plus excluded units."""
+
+    groups: List[List[Tuple[str, ...]]]
+    excluded: List[Tuple[str, ...]]
+
+
+def parse_query(q: str) -> ParsedQuery:
+    """
+    Parse a search query.
+    Terms are AND-ed by default; `a OR b` matches either, `"exact phrase"`
+    matches consecutive terms, and `-term` / `NOT term` excludes matches.
+    """
+    groups: List[List[Tuple[str, ...]]] = []
+    excluded: List[Tuple[str, ...]] = []
+    pending_or = False
+    negate_next = False
+
+    for match in QUERY_RE.finditer(q):
+        negate = negate_next
+        if match.group(3) is not None:
+            word = match.group(3)
+            if word == "OR":
+                pending_or = True
+                continue
+            if word == "AND":
+                continue
+            if word == "NOT":
+                negate_next = True
+                continue
+            if word.startswith("-") and len(word) > 1:
+                negate = True
+                word = word[1:]
+            unit = tuple(tokenize(word))
+        else:
+            negate = negate or match.group(1) == "-"
+            unit = tuple(tokenize(match.group(2)))
+
+        negate_next = False
+        if not unit:
+            continue
+        if negate:
+            excluded.append(unit)
+        elif pending_or and groups:
+            groups[-1].append(unit)
+        else:
+            groups.append([unit])
+        pending_or = False
+
+    return ParsedQuery(groups, excluded)
+
+
+class InvertedIndex:
+    """Positional postings for one kind of document, scored with BM25."""
+
+    k1 = 1.2
+    b = 0.75
+
+    def __init__(self, boosts: Dict[str, float]):
+        self.boosts = boosts
+        self.postings: Dict[str, Dict[int, Dict[str, List[int]]]] = {}
+        self.lengths: List[Dict[str, int]] = []
+        self.vocabulary: List[str] = []
+        self.avg_lengths: Dict[str, float] = {}
+        self._total_lengths = dict.fromkeys(boosts, 0)
+        self._score_cache: Dict[str, Dict[int, float]] = {}
+
+    @property
+    def doc_count(self) -> int:
+        return len(self.lengths)
+
+    def add(self, analyzed: Dict[str, List[str]]) -> int:
+        """Add a tokenized document and return its id."""
+        doc_id = len(self.lengths)
+        lengths = {}
+        for field, tokens in analyzed.items():
+            lengths[field] = len(tokens)
+            self._total_lengths[field] += len(tokens)
+            for position, token in enumerate(tokens):
+                fields = self.postings.setdefault(token, {}).setdefault(doc_id, {})
+                fields.setdefault(field, []).append(position)
+        self.lengths.append(lengths)
+        return doc_id
+
+    def finalize(self):
+        """Compute the sorted vocabulary and average field lengths."""
+        self.vocabulary = sorted(self.postings)
+        count = self.doc_count or 1
+        self.avg_lengths = {
+            field: (total / count) or 1.0 for field, total in self._total_lengths.items()
+        }
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        """The term itself plus vocabulary terms it is a prefix of."""
+        expansions = [(term, 1.0)] if term in self.postings else []
+        i = bisect_left(self.vocabulary, term)
+        while (
+            i < len(self.vocabulary)
+            and self.vocabulary[i].startswith(term)
+            and len(expansions) < MAX_PREFIX_EXPANSIONS
+        ):
+            if self.vocabulary[i] != term:
+                expansions.append((self.vocabulary[i], PREFIX_WEIGHT))
+            i += 1
+        return expansions
+
+    def _term_scores(self, term: str, weight: float = 1.0) -> Dict[int, float]:
+        scores = self._score_cache.get(term)
+        if scores is None:
+            scores = self._bm25(term)
+            if len(self._score_cache) >= MAX_CACHED_TERMS:
+                self._score_cache.clear()
+            self._score_cache[term] = scores
+        if weight != 1.0:
+            return {doc_id: weight * score for doc_id, score in scores.items()}
+        return scores
+
+    def _bm25(self, term: str) -> Dict[int, float]:
+        postings = self.postings.get(term)
+        if not postings:
+            return {}
+        df = len(postings)
+        idf = math.log(1 + (self.doc_count - df + 0.5) / (df + 0.5))
+        scores = {}
+        for doc_id, fields in postings.items():
+            score = 0.0
+            for field, positions in fields.items():
+                tf = len(positions)
+                norm = 1 - self.b + self.b * self.lengths[doc_id][field] / self.avg_lengths[field]
+                score += self.boosts[field] * tf * (self.k1 + 1) / (tf + self.k1 * norm)
+            scores[doc_id] = idf * score
+        return scores
+
+    def _phrase_scores(self, terms: Tuple[str, ...]) -> Dict[int, float]:
+        postings = [self.postings.get(term) for term in terms]
+        if not all(postings):
+            return {}
+        candidates = set.intersection(*(set(p) for p in sorted(postings, key=len)))
+        matched = []
+        for doc_id in candidates:
+            for field, first_positions in postings[0][doc_id].items():
+                later = [set(p[doc_id].get(field, ())) for p in postings[1:]]
+                if any(
+                    all(start + offset in positions for offset, positions in enumerate(later, 1))
+                    for start in first_positions
+                ):
+                    matched.append(doc_id)
+                    break
+
+        term_scores = [self._term_scores(term) for term in terms]
+        return {doc_id: sum(scores[doc_id] for scores in term_scores) for doc_id in matched}
+
+    def unit_scores(self, unit: Tuple[str, ...]) -> Dict[int, float]:
+        """Score documents matching a single term (with prefixes) or a phrase."""
+        if len(unit) > 1:
+            return self._phrase_scores(unit)
+        scores: Dict[int, float] = {}
+        for term, weight in self._expand(unit[0]):
+            for doc_id, score in self._term_scores(term, weight).items():
+                scores[doc_id] = scores.get(doc_id, 0.0) + score
+        return scores
+
+    def search(self, query: ParsedQuery) -> List[Tuple[int, float]]:
+        """
+        Return (doc_id, score) pairs matching the query, best first.
+        Exclusions only narrow the positive terms; a query with nothing
+        else matches nothing.
+        """
+        if not query.groups:
+            return []
+
+        result: Optional[Dict[int, float]] = None
+        for group in query.groups:
+            group_scores: Dict[int, float] = {}
+            for unit in group:
+                for doc_id, score in self.unit_scores(unit).items():
+                    group_scores[doc_id] = group_scores.get(doc_id, 0.0) + score
+            if result is None:
+                result = group_scores
+            else:
+                result = {
+                    doc_id: score + group_scores[doc_id]
+                    for doc_id, score in result.items()
+                    if doc_id in group_scores
+                }
+            if not result:
+                return []
+
+        for unit in query.excluded:
+            for doc_id in self.unit_scores(unit):
+                result.pop(doc_id, None)
+
+        return sorted(result.items(), key=lambda item: (-item[1], item[0]))
+
+
+class SearchResults(NamedTuple):
+    """Ranked (position, score) pairs into the profile's lists."""
+
+    name: bool
+    skills: List[Tuple[int, float]]
+    projects: List[Tuple[int, float]]
+    work: List[Tuple[int, float]]
+
+
+class SearchEngine:
+    """Inverted indexes over the name, skills, projects and work of a profile."""
+
+    def __init__(self, profile: Optional[dict], previous: Optional["SearchEngine"] = None):
+        profile = profile or {}
+        # Tokenized documents keyed by their text, reused from the previous
+        # engine so a profile edit only re-tokenizes entries that changed
+        self._reuse = previous._analyzed if previous else {}
+        self._analyzed: Dict[tuple, Dict[str, List[str]]] = {}
+
+        self.name = self._build(NAME_FIELDS, [{"name": profile.get("name", "")}])
+        self.skills = self._build(
+            SKILL_FIELDS, [{"skill": skill} for skill in profile.get("skills", [])]
+        )
+        self.projects = self._build(PROJECT_FIELDS, [
+            {
+                "title": p.get("title", ""),
+                "skills": " ".join(p.get("skills", [])),
+                "description": p.get("description", ""),
+            }
+            for p in profile.get("projects", [])
+        ])
+        self.work = self._build(WORK_FIELDS, [
+            {
+                "title": w.get("title", ""),
+                "company": w.get("company", ""),
+                "description": w.get("description") or "",
+            }
+            for w in profile.get("work", [])
+        ])
+        self._reuse = {}
+
+    def _build(self, boosts: Dict[str, float], documents: List[Dict[str, str]]) -> InvertedIndex:
+        index = InvertedIndex(boosts)
+        for document in documents:
+            key = tuple(document.items())
+            analyzed = self._reuse.get(key) or self._analyzed.get(key)
+            if analyzed is None:
+                analyzed = {field: tokenize(text) for field, text in document.items()}
+            self._analyzed[key] = analyzed
+            index.add(analyzed)
+        index.finalize()
+        return index
+
+    def search(self, q: str) -> SearchResults:
+        query = parse_query(q)
+        return SearchResults(
+            name=bool(self.name.search(query)),
+            skills=self.skills.search(query),
+            projects=self.projects.search(query),
+            work=self.work.search(query),
+        )
+
+
+def build_search_engine(profile: Optional[dict], previous: Optional[SearchEngine] = None) -> SearchEngine:
+    """Build the search engine for a profile document, reusing previous tokenization."""
+    return SearchEngine(profile, previous)
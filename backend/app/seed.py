@@ -4,11 +4,15 @@ Run with: python -m app.seed
 """
 import asyncio
 from motor.motor_asyncio import AsyncIOMotorClient
+from .changes import insert_stamped
 from .config import get_settings
+from .migrations import apply_migrations
+from .models import assign_item_ids
 
 settings = get_settings()
 
 SEED_DATA = {
+    "version": 1,
     "name": "Priyanshu Chourasiya",
     "title": "Machine Learning Engineer & Full Stack Developer",
     "email": "priyanshuchourasiya32198@gmail.com",
@@ -178,19 +182,12 @@ async def seed_database():
     await db.profiles.delete_many({})
     
     # Insert seed data
-    result = await db.profiles.insert_one(SEED_DATA)
-    print(f"✓ Seeded profile with ID: {result.inserted_id}")
+    profile_id = await insert_stamped(db.profiles, assign_item_ids(SEED_DATA))
+    print(f"✓ Seeded profile with ID: {profile_id}")
     
-    # Create indexes
-    await db.profiles.create_index("email", unique=True)
-    await db.profiles.create_index([("skills", 1)])
-    await db.profiles.create_index([
-        ("name", "text"),
-        ("skills", "text"),
-        ("projects.title", "text"),
-        ("projects.description", "text")
-    ])
-    print("✓ Created indexes")
+    # Build indexes through the versioned migrations (no-op if already applied)
+    applied = await apply_migrations(db)
+    print(f"✓ Applied migrations: {applied}" if applied else "✓ Indexes up to date")
     
     client.close()
     print("✓ Database seeded successfully!")
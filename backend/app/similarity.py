@@ -0,0 +1,99 @@
+"""
+TF-IDF project vectors behind /projects/{id}/similar and /projects/recommend.
+Each profile version gets one sparse matrix (a row per project, built from
+its title, description and skills), with rows L2-normalized so cosine
+similarity against every project is a single sparse matrix-vector product.
+Builds run in a small thread pool, off the event loop.
+"""
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from scipy import sparse
+from .search_index import tokenize
+
+# Term weight per field, as repeated occurrences
+FIELD_WEIGHTS = {"title": 2.0, "skills": 2.0, "description": 1.0}
+
+build_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="similarity")
+
+
+def _project_terms(project: dict) -> Counter:
+    counts = Counter()
+    for field, weight in FIELD_WEIGHTS.items():
+        value = project.get(field) or ""
+        text = " ".join(value) if isinstance(value, list) else value
+        for term in tokenize(text):
+            counts[term] += weight
+    return counts
+
+
+def _normalize_rows(matrix: sparse.csr_matrix) -> sparse.csr_matrix:
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    norms[norms == 0] = 1.0
+    return sparse.diags(1.0 / norms) @ matrix
+
+
+class ProjectVectors:
+    """L2-normalized TF-IDF rows for a profile's projects."""
+
+    def __init__(self, projects: List[dict]):
+        vocabulary: Dict[str, int] = {}
+        rows, cols, values = [], [], []
+        document_frequency = Counter()
+        for row, project in enumerate(projects):
+            counts = _project_terms(project)
+            document_frequency.update(counts.keys())
+            for term, count in counts.items():
+                rows.append(row)
+                cols.append(vocabulary.setdefault(term, len(vocabulary)))
+                values.append(count)
+
+        n = len(projects)
+        self.vocabulary = vocabulary
+        # Smoothed idf: terms in every project still count a little
+        self.idf = np.ones(len(vocabulary))
+        for term, column in vocabulary.items():
+            self.idf[column] = math.log((1 + n) / (1 + document_frequency[term])) + 1.0
+        tf = np.log1p(np.asarray(values, dtype=np.float64))
+        weights = tf * self.idf[np.asarray(cols, dtype=np.int64)] if values else tf
+        matrix = sparse.csr_matrix((weights, (rows, cols)), shape=(n, len(vocabulary)))
+        self.matrix = _normalize_rows(matrix).tocsr()
+
+    @property
+    def count(self) -> int:
+        return self.matrix.shape[0]
+
+    def _top(self, scores: np.ndarray, limit: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+        """Best (position, score) pairs, best first; ties keep array order."""
+        if exclude is not None:
+            scores[exclude] = 0.0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return [(int(i), float(scores[i])) for i in candidates[order]]
+
+    def similar(self, position: int, limit: int) -> List[Tuple[int, float]]:
+        """Projects most similar to the one at position, by cosine."""
+        scores = (self.matrix @ self.matrix[position].T).toarray().ravel()
+        return self._top(scores, limit, exclude=position)
+
+    def recommend(self, skills: Iterable[str], limit: int) -> List[Tuple[int, float]]:
+        """Projects closest to a set of skills, by cosine."""
+        query = np.zeros(len(self.vocabulary))
+        for term in tokenize(" ".join(skills)):
+            column = self.vocabulary.get(term)
+            if column is not None:
+                query[column] = self.idf[column]
+        norm = np.linalg.norm(query)
+        if not norm or not self.count:
+            return []
+        scores = self.matrix @ (query / norm)
+        return self._top(scores, limit)
+
+
+def build_project_vectors(profile: Optional[dict], previous: Optional[ProjectVectors] = None) -> ProjectVectors:
+    """Snapshot builder for the project vectors; meant for derive_in_executor()."""
+    return ProjectVectors((profile or {}).get("projects", []))
@@ -0,0 +1,90 @@
+"""
+Skill to project index used for filtering on GET /projects.
+Each skill maps to a bitset of project positions, so multi-skill filters
+become integer AND/OR/NOT operations instead of nested string scans.
+"""
+from typing import Dict, Iterable, List, Optional
+
+
+class SkillIndex:
+    """Bitset index over the projects of one profile snapshot."""
+
+    max_resolved_terms = 1024
+
+    def __init__(self, projects: List[dict]):
+        self.size = len(projects)
+        self.all_bits = (1 << self.size) - 1
+        self._postings: Dict[str, int] = {}
+        self._resolved: Dict[str, int] = {}
+
+        for position, project in enumerate(projects):
+            bit = 1 << position
+            for skill in project.get("skills", []):
+                key = skill.lower()
+                self._postings[key] = self._postings.get(key, 0) | bit
+
+    def match(self, term: str) -> int:
+        """
+        Bitset of projects with a skill containing term (case-insensitive).
+        Substring matching keeps ?skill=py matching "Python", as before.
+        """
+        term = term.lower()
+        bits = self._resolved.get(term)
+        if bits is None:
+            bits = self._postings.get(term, 0)
+            for key, key_bits in self._postings.items():
+                if term in key:
+                    bits |= key_bits
+            if len(self._resolved) >= self.max_resolved_terms:
+                self._resolved.clear()
+            self._resolved[term] = bits
+        return bits
+
+    def filter(
+        self,
+        include: Optional[Iterable[str]] = None,
+        mode: str = "all",
+        exclude: Optional[Iterable[str]] = None,
+    ) -> int:
+        """
+        Combine skill terms into a single bitset.
+        mode="all" intersects the included skills, mode="any" unions them;
+        projects matching any excluded skill are removed.
+        """
+        include = [term for term in include or [] if term]
+        if not include:
+            bits = self.all_bits
+        elif mode == "any":
+            bits = 0
+            for term in include:
+                bits |= self.match(term)
+        else:
+            bits = self.all_bits
+            for term in include:
+                bits &= self.match(term)
+                if not bits:
+                    break
+
+        for term in exclude or []:
+            if term:
+                bits &= ~self.match(term)
+        return bits & self.all_bits
+
+    @staticmethod
+    def positions(bits: int, start: int = 0, limit: Optional[int] = None) -> List[int]:
+        """Project positions set in bits, in order, skipping the first start."""
+        result = []
+        skipped = 0
+        while bits and (limit is None or len(result) < limit):
+            lowest = bits & -bits
+            if skipped < start:
+                skipped += 1
+            else:
+                result.append(lowest.bit_length() - 1)
+            bits ^= lowest
+        return result
+
+
+def build_skill_index(profile: Optional[dict], previous: Optional[SkillIndex] = None) -> SkillIndex:
+    """Build the skill index for a profile document (None builds an empty index)."""
+    return SkillIndex(profile.get("projects", []) if profile else [])
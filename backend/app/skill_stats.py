@@ -0,0 +1,112 @@
+"""
+Materialized skill frequency view behind GET /skills/top.
+Counts are carried from one profile snapshot to the next. A single-entry
+write (ProfileCache.apply) hands over the entry before and after, so only
+that entry's skills are counted; any other change diffs the project skill
+lists of both versions. The top skills are kept pre-sorted (by count, then
+name) so reads are a slice.
+"""
+import heapq
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+from .cache import ItemEdit
+
+
+def _project_skills(profile: Optional[dict]) -> Counter:
+    """Multiset of project skill lists, so unchanged projects cancel out in a diff."""
+    if not profile:
+        return Counter()
+    return Counter(tuple(p.get("skills", [])) for p in profile.get("projects", []))
+
+
+def _profile_skills(profile: Optional[dict]) -> Counter:
+    return Counter(profile.get("skills", []) if profile else [])
+
+
+def _entry_skills(item: Optional[dict]) -> List[str]:
+    return item.get("skills", []) if item else []
+
+
+class SkillFrequencyView:
+    """Skill -> occurrence count over project skills plus profile skills."""
+
+    # Matches the largest limit accepted by /skills/top
+    max_top = 20
+
+    def __init__(self):
+        self.counts: Dict[str, int] = {}
+        self.top: List[Tuple[str, int]] = []
+        # The document these counts describe, diffed against when no edit is known
+        self._profile: Optional[dict] = None
+
+    @classmethod
+    def build(cls, profile: Optional[dict]) -> "SkillFrequencyView":
+        """Build the view from scratch."""
+        return cls().advance(profile)
+
+    def advance(self, profile: Optional[dict], edit: Optional[ItemEdit] = None) -> "SkillFrequencyView":
+        """
+        Return a view for a newer version of the profile; this view is left
+        untouched. `edit` is the one entry that changed since this view's
+        version: with it, only that entry's skills are counted.
+        """
+        deltas: Counter = Counter()
+        if edit is not None:
+            if edit.section == "projects":
+                for skill in _entry_skills(edit.new):
+                    deltas[skill.lower()] += 1
+                for skill in _entry_skills(edit.old):
+                    deltas[skill.lower()] -= 1
+        else:
+            old_projects, projects = _project_skills(self._profile), _project_skills(profile)
+            old_skills, skills = _profile_skills(self._profile), _profile_skills(profile)
+            for skill_list, n in (projects - old_projects).items():
+                for skill in skill_list:
+                    deltas[skill.lower()] += n
+            for skill_list, n in (old_projects - projects).items():
+                for skill in skill_list:
+                    deltas[skill.lower()] -= n
+            for skill, n in (skills - old_skills).items():
+                deltas[skill.lower()] += n
+            for skill, n in (old_skills - skills).items():
+                deltas[skill.lower()] -= n
+
+        view = SkillFrequencyView()
+        view.counts = dict(self.counts)
+        view._profile = profile
+        for skill, delta in deltas.items():
+            if not delta:
+                continue
+            count = view.counts.get(skill, 0) + delta
+            if count > 0:
+                view.counts[skill] = count
+            else:
+                view.counts.pop(skill, None)
+        view.top = self.top
+        if any(deltas.values()):
+            view._refresh_top()
+        return view
+
+    def _refresh_top(self):
+        # Ties go alphabetically: insertion order depends on write history,
+        # and views built differently for one version must agree
+        self.top = heapq.nsmallest(self.max_top, self.counts.items(), key=lambda item: (-item[1], item[0]))
+
+    def most_common(self, limit: int) -> List[Tuple[str, int]]:
+        """Top skills by count, read from the pre-sorted list."""
+        return self.top[:limit]
+
+    def count(self, skill: str) -> int:
+        """Occurrences of a single skill (case-insensitive)."""
+        return self.counts.get(skill.lower(), 0)
+
+
+def build_skill_frequency(
+    profile: Optional[dict],
+    previous: Optional[SkillFrequencyView] = None,
+    edit: Optional[ItemEdit] = None,
+) -> SkillFrequencyView:
+    """Advance the previous snapshot's view, or build one from scratch."""
+    if previous is None:
+        return SkillFrequencyView.build(profile)
+    return previous.advance(profile, edit)
@@ -0,0 +1,59 @@
+"""
+Microbenchmark: fuzzy (trigram + edit distance) query latency.
+Builds a synthetic profile whose skills and project/work titles add up to
+the requested number of indexed terms, then times typo'd queries against
+it. Also reports how many candidates survive trigram pruning.
+
+Run with: python -m benchmarks.fuzzy_search [--terms N] [--iterations N]
+"""
+import argparse
+import random
+import string
+import time
+
+from app.fuzzy_index import FuzzyEngine, squash, trigrams
+
+QUERIES = ["pytorh", "fast api", "mongdb", "kubernets", "reactjs", "machine lerning"]
+REAL_TERMS = ["PyTorch", "FastAPI", "MongoDB", "Kubernetes", "React", "Machine Learning"]
+
+
+def synthetic_profile(terms: int) -> dict:
+    rng = random.Random(7)
+
+    def word():
+        return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10)))
+
+    skills = REAL_TERMS + [word() for _ in range(terms // 2)]
+    projects = [{"title": f"{word()} {word()}"} for _ in range(terms // 6)]
+    work = [{"title": word(), "company": word()} for _ in range(terms // 12)]
+    return {"skills": skills, "projects": projects, "work": work}
+
+
+def main(terms: int, iterations: int, threshold: float, top_k: int):
+    profile = synthetic_profile(terms)
+    start = time.perf_counter()
+    engine = FuzzyEngine(profile)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"indexed terms: {len(engine.index.terms)}  build: {build_ms:.0f} ms")
+
+    print(f"{'query':<18}{'candidates':>12}{'matches':>10}{'ms':>10}")
+    for q in QUERIES:
+        candidates = set()
+        for gram in trigrams(squash(q)):
+            candidates.update(engine.index.postings.get(gram, ()))
+        start = time.perf_counter()
+        for _ in range(iterations):
+            results = engine.search(q, threshold, top_k)
+        elapsed_ms = (time.perf_counter() - start) / iterations * 1000
+        found = len(results.skills) + len(results.projects) + len(results.work)
+        print(f"{q:<18}{len(candidates):>12}{found:>10}{elapsed_ms:>10.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark fuzzy search")
+    parser.add_argument("--terms", type=int, default=50000)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--threshold", type=float, default=0.7)
+    parser.add_argument("--top-k", type=int, default=10)
+    args = parser.parse_args()
+    main(args.terms, args.iterations, args.threshold, args.top_k)
@@ -0,0 +1,141 @@
+"""
+Microbenchmark: requests/sec through the middleware stack.
+Compares the previous BaseHTTPMiddleware implementations with the pure ASGI
+ones by calling the app in-process, so the numbers reflect framework and
+middleware overhead rather than network or MongoDB latency.
+
+Run with: python -m benchmarks.middleware [--requests N]
+"""
+import argparse
+import asyncio
+import math
+import os
+import time
+from bson import ObjectId
+from fastapi import FastAPI, HTTPException, Request, status
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.cache import profile_cache
+from app.etag import NotModified, not_modified_response
+from app.logging_config import LoggingMiddleware, log_listener, logger
+from app.rate_limit import RateLimiter, RateLimitMiddleware
+from app.routers import health, query
+from app.seed import SEED_DATA
+
+# Large enough that no benchmark request is ever rejected
+LIMITER = RateLimiter(requests_per_minute=10**9)
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware rate limiter, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path == "/health":
+            return await call_next(request)
+
+        allowed, remaining, retry_after = LIMITER.consume(
+            request.client.host if request.client else "unknown", LIMITER.cost_of(request.url.path)
+        )
+        if not allowed:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Rate limit exceeded. Please try again later.",
+                headers={"Retry-After": str(math.ceil(retry_after))}
+            )
+
+        response = await call_next(request)
+        response.headers["X-RateLimit-Limit"] = str(LIMITER.requests_per_minute)
+        response.headers["X-RateLimit-Remaining"] = str(remaining)
+        return response
+
+
+class LegacyLoggingMiddleware(BaseHTTPMiddleware):
+    """The BaseHTTPMiddleware request logger, kept for comparison."""
+
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.time()
+        method = request.method
+        url = str(request.url.path)
+        query = str(request.url.query) if request.url.query else ""
+        client_ip = request.client.host if request.client else "unknown"
+        logger.info(f"➡️  {method} {url}{'?' + query if query else ''} | IP: {client_ip}")
+
+        response = await call_next(request)
+        duration = (time.time() - start_time) * 1000
+        status_emoji = "✅" if response.status_code < 400 else "❌"
+        logger.info(f"{status_emoji} {method} {url} | Status: {response.status_code} | {duration:.2f}ms")
+        return response
+
+
+def build_app(legacy: bool) -> FastAPI:
+    app = FastAPI()
+    if legacy:
+        app.add_middleware(LegacyRateLimitMiddleware)
+        app.add_middleware(LegacyLoggingMiddleware)
+    else:
+        app.add_middleware(RateLimitMiddleware, limiter=LIMITER)
+        app.add_middleware(LoggingMiddleware)
+    app.add_exception_handler(NotModified, lambda request, exc: not_modified_response(exc.etag))
+    app.include_router(health.router)
+    app.include_router(query.router)
+    return app
+
+
+async def run(app: FastAPI, path: str, requests: int) -> float:
+    """Send requests straight through the ASGI interface; returns requests/sec."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode("latin-1"),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            raise RuntimeError(f"{path} returned {message['status']}")
+
+    for _ in range(min(requests // 10, 500)):
+        await app(dict(scope), receive, send)
+
+    start = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), receive, send)
+    return requests / (time.perf_counter() - start)
+
+
+async def main(requests: int):
+    # Serve /skills from the snapshot cache so MongoDB isn't involved
+    profile_cache.ttl_seconds = 24 * 3600.0
+    profile_cache.publish({"_id": ObjectId(), **SEED_DATA})
+
+    # Keep formatting log records but don't print them
+    devnull = open(os.devnull, "w")
+    for handler in log_listener.handlers:
+        handler.setStream(devnull)
+
+    apps = {"BaseHTTPMiddleware": build_app(legacy=True), "pure ASGI": build_app(legacy=False)}
+    print(f"{'path':<10}{'stack':<22}{'req/s':>10}")
+    for path in ("/health", "/skills"):
+        results = {name: await run(app, path, requests) for name, app in apps.items()}
+        for name, rate in results.items():
+            print(f"{path:<10}{name:<22}{rate:>10.0f}")
+        gain = results["pure ASGI"] / results["BaseHTTPMiddleware"] - 1
+        print(f"{path:<10}{'gain':<22}{gain:>+10.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the middleware stack")
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
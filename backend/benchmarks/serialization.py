@@ -0,0 +1,70 @@
+"""
+Microbenchmark: serialization CPU per response on /profile and /projects.
+"Before" mirrors what FastAPI does for a returned dict: response_model
+validation (for /profile), jsonable_encoder and stdlib json. "After" is the
+fast path: cached bytes per snapshot for /profile, orjson for /projects.
+"/profile (uncached)" times build_profile_json itself, the work done once
+per profile version when the snapshot has no body yet.
+
+Run with: python -m benchmarks.serialization [--iterations N]
+"""
+import argparse
+import json
+import timeit
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+
+from app.cache import ProfileSnapshot
+from app.models import ProfileResponse
+from app.responses import dumps
+from app.routers.profile import build_profile_json, profile_helper
+from app.seed import SEED_DATA
+
+
+def stdlib_json(content) -> bytes:
+    # Starlette's JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def main(iterations: int):
+    document = {"_id": ObjectId(), **SEED_DATA}
+    snapshot = ProfileSnapshot(document, 1)
+    page = {
+        "projects": document["projects"][:10],
+        "count": len(document["projects"][:10]),
+        "total": len(document["projects"]),
+        "page": 1,
+        "page_size": 10,
+        "total_pages": 1,
+        "has_next": False,
+        "has_prev": False,
+        "next_cursor": None,
+    }
+
+    cases = {
+        "/profile": (
+            lambda: stdlib_json(jsonable_encoder(ProfileResponse.model_validate(profile_helper(document)))),
+            lambda: snapshot.derive("profile_json", build_profile_json),
+        ),
+        "/profile (uncached)": (
+            lambda: stdlib_json(jsonable_encoder(ProfileResponse.model_validate(profile_helper(document)))),
+            lambda: build_profile_json(document),
+        ),
+        "/projects": (
+            lambda: stdlib_json(jsonable_encoder(page)),
+            lambda: dumps(page),
+        ),
+    }
+
+    print(f"{'response':<22}{'before µs':>12}{'after µs':>12}{'speedup':>10}")
+    for name, (before, after) in cases.items():
+        before_us = min(timeit.repeat(before, number=iterations, repeat=3)) / iterations * 1e6
+        after_us = min(timeit.repeat(after, number=iterations, repeat=3)) / iterations * 1e6
+        print(f"{name:<22}{before_us:>12.1f}{after_us:>12.2f}{before_us / after_us:>9.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark response serialization")
+    parser.add_argument("--iterations", type=int, default=2000)
+    args = parser.parse_args()
+    main(args.iterations)
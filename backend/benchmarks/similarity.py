@@ -0,0 +1,71 @@
+"""
+Microbenchmark: "similar projects" scoring.
+"Before" scores every project against the target with Python dict-based
+cosine loops; "after" is the TF-IDF matrix's single sparse product.
+Also reports the (off-loop) build time of the matrix.
+
+Run with: python -m benchmarks.similarity [--projects N] [--iterations N]
+"""
+import argparse
+import math
+import random
+import time
+import timeit
+
+from app.similarity import ProjectVectors, _project_terms
+
+SKILLS = ["Python", "FastAPI", "MongoDB", "React", "PyTorch", "Docker", "Kubernetes", "Go", "Rust", "SQL"]
+
+
+def synthetic_projects(count: int) -> list:
+    rng = random.Random(3)
+    words = [f"word{i}" for i in range(5000)]
+    return [
+        {
+            "title": " ".join(rng.choices(words, k=3)),
+            "description": " ".join(rng.choices(words, k=40)),
+            "skills": rng.sample(SKILLS, 3),
+        }
+        for _ in range(count)
+    ]
+
+
+def loop_similar(vectors, target, limit):
+    """Cosine over {term: weight} dicts, one project at a time."""
+    def norm(vector):
+        return math.sqrt(sum(w * w for w in vector.values())) or 1.0
+
+    target_norm = norm(vectors[target])
+    scores = []
+    for i, vector in enumerate(vectors):
+        if i == target:
+            continue
+        dot = sum(w * vector.get(term, 0.0) for term, w in vectors[target].items())
+        scores.append((dot / (target_norm * norm(vector)), i))
+    scores.sort(reverse=True)
+    return scores[:limit]
+
+
+def main(projects: int, iterations: int):
+    documents = synthetic_projects(projects)
+    start = time.perf_counter()
+    vectors = ProjectVectors(documents)
+    build_ms = (time.perf_counter() - start) * 1000
+    print(f"projects: {projects}  terms: {len(vectors.vocabulary)}  build: {build_ms:.0f} ms")
+
+    dict_vectors = [
+        {term: math.log1p(count) * vectors.idf[vectors.vocabulary[term]] for term, count in _project_terms(d).items()}
+        for d in documents
+    ]
+    loop_ms = min(timeit.repeat(lambda: loop_similar(dict_vectors, 0, 10), number=1, repeat=3)) * 1000
+    matmul_ms = min(timeit.repeat(lambda: vectors.similar(0, 10), number=iterations, repeat=3)) / iterations * 1000
+    print(f"{'python loops':<16}{loop_ms:>10.2f} ms")
+    print(f"{'sparse matmul':<16}{matmul_ms:>10.2f} ms  ({loop_ms / matmul_ms:.0f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark similar-project scoring")
+    parser.add_argument("--projects", type=int, default=5000)
+    parser.add_argument("--iterations", type=int, default=100)
+    args = parser.parse_args()
+    main(args.projects, args.iterations)
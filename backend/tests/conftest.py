@@ -15,6 +15,8 @@ os.environ["ADMIN_PASSWORD"] = "secret123"
 
 from app.main import app
 from app.database import connect_to_mongo, close_mongo_connection, get_database
+from app.migrations import apply_migrations
+from app.rate_limit import rate_limiter
 
 
 @pytest.fixture(scope="session")
@@ -29,6 +31,7 @@ def event_loop():
 async def setup_database():
     """Setup test database connection."""
     await connect_to_mongo()
+    await apply_migrations(get_database())
     yield
     # Cleanup: drop test database
     db = get_database()
@@ -36,6 +39,13 @@ async def setup_database():
     await close_mongo_connection()
 
 
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Give every test a fresh rate limit budget."""
+    rate_limiter.reset()
+    yield
+
+
 @pytest.fixture
 async def client(setup_database):
     """HTTP client for testing API endpoints."""
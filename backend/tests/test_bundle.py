@@ -0,0 +1,59 @@
+"""
+Tests for the combined GET /bundle read endpoint.
+"""
+import pytest
+from app.rate_limit import rate_limiter
+
+
+@pytest.mark.asyncio
+async def test_bundle_matches_individual_endpoints(client, seed_profile):
+    """Test that each part has the same body as its own endpoint."""
+    response = await client.get("/bundle")
+    assert response.status_code == 200
+    bundle = response.json()
+    assert bundle["profile"] == (await client.get("/profile")).json()
+    assert bundle["skills"] == (await client.get("/skills")).json()
+    assert bundle["top_skills"] == (await client.get("/skills/top?limit=5")).json()
+    assert bundle["projects"] == (await client.get("/projects")).json()
+
+
+@pytest.mark.asyncio
+async def test_bundle_include_and_parameters(client, seed_profile):
+    """Test selecting parts and passing through their parameters."""
+    response = await client.get("/bundle?include=top_skills,projects&top_limit=1&skill=java")
+    bundle = response.json()
+    assert set(bundle) == {"top_skills", "projects"}
+    assert len(bundle["top_skills"]["top_skills"]) == 1
+    assert bundle["projects"]["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_bundle_rejects_unknown_parts(client, seed_profile):
+    """Test that unknown parts are a 400."""
+    response = await client.get("/bundle?include=profile,secrets")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_bundle_without_profile(auth_client):
+    """Test that a missing profile is null, not a 404."""
+    await auth_client.delete("/profile")
+    bundle = (await auth_client.get("/bundle?include=profile,skills")).json()
+    assert bundle == {"profile": None, "skills": {"skills": [], "count": 0}}
+
+
+@pytest.mark.asyncio
+async def test_bundle_is_one_weighted_hit(client, seed_profile):
+    """Test that the bundle is charged its route cost once."""
+    before = int((await client.get("/skills")).headers["X-RateLimit-Remaining"])
+    after = int((await client.get("/bundle")).headers["X-RateLimit-Remaining"])
+    assert before - after == rate_limiter.cost_of("/bundle") == 2
+
+
+@pytest.mark.asyncio
+async def test_bundle_etag(client, seed_profile):
+    """Test conditional GET on the bundle."""
+    response = await client.get("/bundle")
+    etag = response.headers["ETag"]
+    response = await client.get("/bundle", headers={"If-None-Match": etag})
+    assert response.status_code == 304
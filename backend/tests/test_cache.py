@@ -0,0 +1,61 @@
+"""
+Tests for the in-process profile snapshot cache.
+"""
+import asyncio
+import pytest
+from app.cache import profile_cache
+
+
+@pytest.mark.asyncio
+async def test_repeated_reads_hit_cache(client, seed_profile):
+    """Test that consecutive reads are served from the snapshot."""
+    await client.get("/profile")
+    hits = profile_cache.hits
+    misses = profile_cache.misses
+
+    await client.get("/skills")
+    await client.get("/projects")
+
+    assert profile_cache.hits == hits + 2
+    assert profile_cache.misses == misses
+
+
+@pytest.mark.asyncio
+async def test_update_invalidates_cache(auth_client, seed_profile):
+    """Test that a write is visible on the next read."""
+    await auth_client.get("/profile")
+    response = await auth_client.put("/profile", json={"skills": ["Rust"]})
+    assert response.status_code == 200
+
+    response = await auth_client.get("/skills")
+    assert response.json()["skills"] == ["Rust"]
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_cache(auth_client, seed_profile):
+    """Test that a deleted profile is not served from the snapshot."""
+    await auth_client.get("/profile")
+    await auth_client.delete("/profile")
+
+    response = await auth_client.get("/profile")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_disabled_cache_reads_without_lock(client, seed_profile, monkeypatch):
+    """Test that with TTL 0 reads go straight to MongoDB instead of queuing on the refresh lock."""
+    monkeypatch.setattr(profile_cache, "ttl_seconds", 0)
+    misses = profile_cache.misses
+    async with profile_cache._lock:
+        snapshots = await asyncio.wait_for(asyncio.gather(*(profile_cache.get() for _ in range(3))), 1)
+    assert [s.document["name"] for s in snapshots] == ["Test User"] * 3
+    assert profile_cache.misses == misses + 3
+
+
+@pytest.mark.asyncio
+async def test_health_reports_cache_stats(client):
+    """Test that the health endpoint exposes cache counters."""
+    response = await client.get("/health")
+    cache = response.json()["cache"]
+    assert "hits" in cache
+    assert "misses" in cache
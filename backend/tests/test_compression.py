@@ -0,0 +1,103 @@
+"""
+Tests for negotiated response compression and the precompressed snapshot bodies.
+"""
+import gzip
+import json
+import pytest
+from httpx import AsyncClient, ASGITransport
+from starlette.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from app.cache import profile_cache
+from app.compression import CODECS, CompressionMiddleware, negotiate, settings
+
+LARGE = {"projects": [{"title": f"Project {i}", "description": "x" * 200} for i in range(20)]}
+
+
+def make_client(app, **options):
+    transport = ASGITransport(app=CompressionMiddleware(app, **options))
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+def test_negotiate():
+    """Test that q-values win and ties follow server preference."""
+    encodings = ["zstd", "br", "gzip"]
+    assert negotiate(None, encodings) is None
+    assert negotiate("identity", encodings) is None
+    assert negotiate("gzip, br", encodings) == "br"
+    assert negotiate("gzip;q=1.0, br;q=0.5", encodings) == "gzip"
+    assert negotiate("*", encodings) == "zstd"
+    assert negotiate("*, zstd;q=0", encodings) == "br"
+    assert negotiate("gzip;q=0", encodings) is None
+
+
+async def test_large_json_is_compressed():
+    """Test that bodies over the threshold are compressed and still decode."""
+    async with make_client(JSONResponse(LARGE), minimum_size=100, encodings=["gzip"]) as client:
+        response = await client.get("/profile", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(json.dumps(LARGE))
+    assert response.json() == LARGE
+
+
+async def test_small_and_binary_bodies_pass_through():
+    """Test the minimum size and content-type checks."""
+    async with make_client(JSONResponse({"ok": True}), minimum_size=100, encodings=["gzip"]) as client:
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    png = PlainTextResponse(b"\x89PNG" * 100, media_type="image/png")
+    async with make_client(png, minimum_size=100, encodings=["gzip"]) as client:
+        response = await client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+async def test_streaming_body_is_compressed():
+    """Test that streamed bodies are compressed chunk by chunk."""
+    async def lines():
+        for i in range(50):
+            yield f'{{"n": {i}}}\n'
+
+    app = StreamingResponse(lines(), media_type="application/x-ndjson")
+    async with make_client(app, minimum_size=100, encodings=["gzip"]) as client:
+        response = await client.get("/export", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert len(response.text.splitlines()) == 50
+
+
+@pytest.mark.parametrize("encoding", sorted(CODECS))
+def test_codecs_round_trip(encoding):
+    """Test one-shot and streaming output of every available codec."""
+    data = json.dumps(LARGE).encode()
+    codec = CODECS[encoding]
+    stream = codec.stream()
+    streamed = stream.process(data[:1000]) + stream.process(data[1000:]) + stream.finish()
+    for compressed in (codec.compress(data), streamed):
+        if encoding == "gzip":
+            assert gzip.decompress(compressed) == data
+        assert len(compressed) < len(data)
+
+
+@pytest.mark.asyncio
+async def test_profile_body_is_compressed_once(client, seed_profile, monkeypatch):
+    """Test that GET /profile serves compressed bytes cached per version."""
+    monkeypatch.setattr(settings, "compression_minimum_size", 0)
+    monkeypatch.setattr(settings, "compression_encodings", "gzip")
+
+    first = await client.get("/profile", headers={"Accept-Encoding": "gzip"})
+    assert first.headers["content-encoding"] == "gzip"
+    assert first.headers["etag"].startswith("W/")
+    assert first.json()["name"] == "Test User"
+
+    snapshot = await profile_cache.get()
+    cached = snapshot.derive("profile_json.gzip", None)
+    second = await client.get("/profile", headers={"Accept-Encoding": "gzip"})
+    assert gzip.decompress(cached) == second.content
+
+    response = await client.get("/profile", headers={"If-None-Match": first.headers["etag"]})
+    assert response.status_code == 304
+
+    plain = await client.get("/profile", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == first.json()
@@ -0,0 +1,31 @@
+"""
+Tests for MongoDB client configuration.
+"""
+from pymongo import ReadPreference
+from app import database
+from app.database import client_options, get_read_database, get_write_database, write_concern
+
+
+def test_client_options(monkeypatch):
+    """Test that pool and compression settings reach the client options."""
+    monkeypatch.setattr(database.settings, "mongo_max_pool_size", 20)
+    monkeypatch.setattr(database.settings, "mongo_wait_queue_timeout_ms", 0)
+    monkeypatch.setattr(database.settings, "mongo_compressors", "zstd,zlib")
+    options = client_options()
+    assert options["maxPoolSize"] == 20
+    assert options["waitQueueTimeoutMS"] is None
+    assert options["compressors"] == "zstd,zlib"
+
+
+def test_write_concern(monkeypatch):
+    """Test that numeric write concerns become node counts."""
+    monkeypatch.setattr(database.settings, "mongo_write_concern", "2")
+    assert write_concern().document["w"] == 2
+    monkeypatch.setattr(database.settings, "mongo_write_concern", "majority")
+    assert write_concern().document["w"] == "majority"
+
+
+async def test_read_and_write_handles(setup_database):
+    """Test that read-only and write handles point at the same database."""
+    assert get_read_database().name == get_write_database().name
+    assert database.READ_PREFERENCES[database.settings.mongo_read_preference] == ReadPreference.PRIMARY
@@ -0,0 +1,47 @@
+"""
+Tests for ETag / If-None-Match conditional GETs.
+"""
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_get_returns_etag(client, seed_profile):
+    """Test that read endpoints emit an ETag."""
+    for url in ["/profile", "/skills", "/skills/top", "/projects", "/search?q=python"]:
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.headers["etag"].startswith('"')
+
+
+@pytest.mark.asyncio
+async def test_if_none_match_returns_304(client, seed_profile):
+    """Test that a matching If-None-Match short-circuits with 304."""
+    response = await client.get("/projects?skill=python")
+    etag = response.headers["etag"]
+
+    response = await client.get("/projects?skill=python", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+async def test_etag_depends_on_query(client, seed_profile):
+    """Test that different query params produce different ETags."""
+    first = await client.get("/projects?page=1")
+    second = await client.get("/projects?page=2")
+    assert first.headers["etag"] != second.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_etag_changes_after_update(auth_client, seed_profile):
+    """Test that a write bumps the version and invalidates old ETags."""
+    response = await auth_client.get("/profile")
+    etag = response.headers["etag"]
+
+    await auth_client.put("/profile", json={"name": "Renamed"})
+
+    response = await auth_client.get("/profile", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["name"] == "Renamed"
@@ -0,0 +1,84 @@
+"""
+Tests for ?fields= sparse fieldsets and their MongoDB projections.
+"""
+import pytest
+from fastapi import HTTPException
+from app.fieldsets import PROFILE_PATHS, PROJECT_PATHS, Fieldset, parse_fieldset
+
+
+def test_paths_follow_the_models():
+    """Test that nested model fields are addressable."""
+    assert {"name", "links.github", "projects.title", "work.company"} <= PROFILE_PATHS
+    assert "id" not in PROFILE_PATHS
+    assert {"id", "title", "skills"} <= PROJECT_PATHS
+
+
+def test_projection_and_trim_agree():
+    """Test the projection and the in-process trim of the same fieldset."""
+    fieldset = Fieldset(["name", "projects.title", "projects", "links.github"])
+    assert fieldset.paths == ["links.github", "name", "projects"]
+    assert fieldset.projection("version") == {"_id": 1, "links.github": 1, "name": 1, "projects": 1, "version": 1}
+
+    fieldset = Fieldset(["name", "projects.title", "links.github"])
+    document = {
+        "_id": 1, "name": "A", "email": "a@example.com",
+        "projects": [{"title": "P", "description": "D"}],
+        "links": {"github": "g", "linkedin": "l"}
+    }
+    assert fieldset.apply(document) == {"name": "A", "projects": [{"title": "P"}], "links": {"github": "g"}}
+
+
+def test_parse_fieldset():
+    """Test validation and the implied id."""
+    assert parse_fieldset(None, PROFILE_PATHS) is None
+    assert parse_fieldset("id", PROFILE_PATHS, implied=("id",)).projection() == {"_id": 1}
+    with pytest.raises(HTTPException) as error:
+        parse_fieldset("name,password", PROFILE_PATHS)
+    assert error.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_profile_fields(client, seed_profile):
+    """Test that GET /profile returns only the requested fields."""
+    response = await client.get("/profile?fields=name,links.github,projects.title")
+    assert response.status_code == 200
+    assert response.json() == {
+        "id": seed_profile["id"],
+        "name": "Test User",
+        "links": {"github": "https://github.com/test"},
+        "projects": [{"title": "Test Project"}]
+    }
+
+    response = await client.get("/profile?fields=password")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_profile_by_id_fields(client, seed_profile):
+    """Test the projected read by id, including its ETag."""
+    url = f"/profiles/{seed_profile['id']}?fields=name,work.company"
+    response = await client.get(url)
+    assert response.json() == {"id": seed_profile["id"], "name": "Test User", "work": [{"company": "Test Corp"}]}
+
+    response = await client.get(url, headers={"If-None-Match": response.headers["ETag"]})
+    assert response.status_code == 304
+
+
+@pytest.mark.asyncio
+async def test_profiles_listing_nested_fields(client, seed_profile):
+    """Test nested paths in the /profiles listing."""
+    response = await client.get("/profiles?fields=projects.title&sort=email")
+    [profile] = [p for p in response.json()["profiles"] if p["id"] == seed_profile["id"]]
+    assert profile == {"id": seed_profile["id"], "projects": [{"title": "Test Project"}]}
+
+
+@pytest.mark.asyncio
+async def test_projects_fields_in_both_modes(client, seed_profile, monkeypatch):
+    """Test that both /projects backends return the same sparse projects."""
+    from app.routers.query import settings
+
+    expected = (await client.get("/projects?fields=title,skills")).json()
+    assert expected["projects"] == [{"title": "Test Project", "skills": ["Python", "FastAPI"]}]
+
+    monkeypatch.setattr(settings, "projects_query_mode", "pipeline")
+    assert (await client.get("/projects?fields=title,skills")).json() == expected
@@ -0,0 +1,83 @@
+"""
+Tests for the trigram fuzzy search engine and /search?mode=fuzzy.
+"""
+import pytest
+from app.fuzzy_index import FuzzyEngine, Pattern, squash
+
+PROFILE = {
+    "skills": ["Python", "FastAPI", "PyTorch", "MongoDB"],
+    "projects": [
+        {"title": "Image Classifier"},
+        {"title": "Machine Learning Pipeline"},
+    ],
+    "work": [
+        {"title": "Developer", "company": "Kubernetes Labs"}
+    ]
+}
+
+
+def _levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+def test_bit_parallel_distance_matches_levenshtein():
+    """Test the bit-parallel distance against the textbook DP."""
+    pairs = [("pytorh", "pytorch"), ("", "abc"), ("kitten", "sitting"), ("fastapi", "fastapi"), ("ab", "ba")]
+    for a, b in pairs:
+        assert Pattern(a).distance(b) == _levenshtein(a, b)
+
+
+def test_typos_and_spacing():
+    """Test that typos and split words still find the entry."""
+    engine = FuzzyEngine(PROFILE)
+    assert engine.search("pytorh", 0.7, 10).skills[0][0] == 2
+    assert engine.search("fast api", 0.7, 10).skills[0] == (1, 1.0)
+    assert engine.search("mongdb", 0.7, 10).skills[0][0] == 3
+    assert engine.search("machin lerning", 0.7, 10).projects[0][0] == 1
+    assert engine.search("kubernets", 0.7, 10).work[0][0] == 0
+
+
+def test_threshold_and_top_k():
+    """Test the similarity cut-off and per-list limit."""
+    engine = FuzzyEngine(PROFILE)
+    assert engine.search("pytorh", 0.9, 10).skills == []
+    assert engine.search("zzzzzz", 0.5, 10).skills == []
+    assert len(FuzzyEngine({"skills": ["react", "reacts", "reactjs"]}).search("react", 0.7, 2).skills) == 2
+
+
+def test_threshold_boundary():
+    """Test that a term exactly at the threshold matches despite float error."""
+    engine = FuzzyEngine({"skills": ["Kubernetes"]})
+    # One edit in ten characters: similarity is exactly 0.9
+    assert engine.search("kubernetez", 0.9, 10).skills == [(0, 0.9)]
+    assert engine.search("kubernetez", 0.91, 10).skills == []
+
+
+def test_squash():
+    assert squash("Fast API") == "fastapi"
+    assert squash("C++") == "c++"
+
+
+@pytest.mark.asyncio
+async def test_search_fuzzy_mode(client, seed_profile):
+    """Test that fuzzy mode finds what exact mode misses."""
+    response = await client.get("/search?q=fastapu")
+    assert response.json()["matches"]["skills"] == []
+
+    response = await client.get("/search?q=fastapu&mode=fuzzy")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["matches"]["skills"] == ["FastAPI"]
+    assert data["matches"]["name"] is False
+
+    response = await client.get("/search?q=tset projet&mode=fuzzy")
+    assert [p["title"] for p in response.json()["matches"]["projects"]] == ["Test Project"]
+
+    response = await client.get("/search?q=fastapu&mode=fuzzy&min_similarity=0.2")
+    assert response.status_code == 422
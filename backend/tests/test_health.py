@@ -22,3 +22,52 @@ async def test_root_endpoint(client):
     assert "message" in data
     assert "docs" in data
     assert "health" in data
+
+
+@pytest.mark.asyncio
+async def test_liveness(client):
+    """Test that liveness doesn't depend on MongoDB."""
+    response = await client.get("/health/live")
+    assert response.status_code == 200
+    assert response.json()["status"] == "alive"
+
+
+@pytest.mark.asyncio
+async def test_readiness_waits_for_pool(client, monkeypatch):
+    """Test that readiness is 503 until the pool is warm."""
+    from app import database
+
+    monkeypatch.setattr(database, "pool_ready", False)
+    response = await client.get("/health/ready")
+    assert response.status_code == 503
+    assert response.json()["status"] == "starting"
+
+    await database.prepare_database()
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["status"] == "ready"
+    assert data["schema"]["missing_indexes"] == []
+
+
+@pytest.mark.asyncio
+async def test_readiness_recovers_after_failed_warm_up(client, monkeypatch):
+    """Test that warm-up is retried until MongoDB answers."""
+    from app import database
+
+    attempts = []
+    warm_up_pool = database.warm_up_pool
+
+    async def flaky_warm_up(connections):
+        attempts.append(connections)
+        if len(attempts) < 3:
+            return False
+        return await warm_up_pool(connections)
+
+    monkeypatch.setattr(database, "pool_ready", False)
+    monkeypatch.setattr(database, "warm_up_pool", flaky_warm_up)
+    monkeypatch.setattr(database, "WARMUP_RETRY_SECONDS", 0)
+    await database.prepare_database()
+    assert len(attempts) == 3
+    response = await client.get("/health/ready")
+    assert response.status_code == 200
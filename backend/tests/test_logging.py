@@ -0,0 +1,107 @@
+"""
+Tests for structured, sampled request logging.
+"""
+import json
+import logging
+import queue
+import sys
+from httpx import AsyncClient, ASGITransport
+from starlette.responses import PlainTextResponse
+from app.logging_config import JsonFormatter, LocalQueueHandler, LoggingMiddleware
+
+
+def make_client(app, **options):
+    transport = ASGITransport(app=LoggingMiddleware(app, **options), raise_app_exceptions=False)
+    return AsyncClient(transport=transport, base_url="http://test")
+
+
+def request_records(caplog):
+    return [r for r in caplog.records if r.name == "app.requests"]
+
+
+async def test_successful_requests_are_sampled(caplog):
+    """Test that a zero sample rate drops successful requests."""
+    caplog.set_level(logging.INFO, logger="app.requests")
+    async with make_client(PlainTextResponse("ok"), sample_rate=0.0) as client:
+        await client.get("/skills")
+    assert request_records(caplog) == []
+
+    async with make_client(PlainTextResponse("ok"), sample_rate=1.0) as client:
+        await client.get("/skills?q=1")
+    [record] = request_records(caplog)
+    assert record.levelno == logging.INFO
+    assert record.fields["path"] == "/skills"
+    assert record.fields["query"] == "q=1"
+    assert record.fields["status"] == 200
+
+
+async def test_errors_are_always_logged(caplog):
+    """Test that server errors bypass sampling."""
+    caplog.set_level(logging.INFO, logger="app.requests")
+    async with make_client(PlainTextResponse("boom", status_code=503), sample_rate=0.0) as client:
+        await client.get("/skills")
+    [record] = request_records(caplog)
+    assert record.levelno == logging.ERROR
+    assert record.fields["status"] == 503
+
+
+async def test_client_errors_are_always_logged(caplog):
+    """Test that 4xx responses bypass sampling and are logged as warnings."""
+    caplog.set_level(logging.INFO, logger="app.requests")
+    async with make_client(PlainTextResponse("slow down", status_code=429), sample_rate=0.0) as client:
+        await client.get("/skills")
+    [record] = request_records(caplog)
+    assert record.levelno == logging.WARNING
+    assert record.fields["status"] == 429
+    assert "sample_rate" not in record.fields
+
+
+async def test_exceptions_are_logged(caplog):
+    """Test that an exception escaping the app is logged as a 500."""
+    caplog.set_level(logging.INFO, logger="app.requests")
+
+    async def failing_app(scope, receive, send):
+        raise RuntimeError("broken")
+
+    async with make_client(failing_app, sample_rate=0.0) as client:
+        await client.get("/skills")
+    [record] = request_records(caplog)
+    assert record.fields["status"] == 500
+    assert record.fields["error"] == "broken"
+
+
+async def test_slow_requests_are_always_logged(caplog):
+    """Test that requests over the threshold bypass sampling."""
+    caplog.set_level(logging.INFO, logger="app.requests")
+    async with make_client(PlainTextResponse("ok"), sample_rate=0.0, slow_request_ms=0) as client:
+        await client.get("/skills")
+    [record] = request_records(caplog)
+    assert record.levelno == logging.WARNING
+    assert record.fields["slow"] is True
+
+
+def test_json_formatter():
+    """Test that records render as one JSON object including their fields."""
+    record = logging.LogRecord("app.requests", logging.INFO, __file__, 1, "request", None, None)
+    record.fields = {"path": "/skills", "status": 200}
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "request"
+    assert entry["level"] == "INFO"
+    assert entry["path"] == "/skills"
+    assert entry["status"] == 200
+
+
+def test_queued_records_keep_message_and_exception():
+    """Test that queued records reach the formatter unprefixed and with exc_info."""
+    log_queue = queue.SimpleQueue()
+    handler = LocalQueueHandler(log_queue)
+    handler.setFormatter(logging.Formatter(logging.BASIC_FORMAT))
+    try:
+        raise ValueError("bad")
+    except ValueError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "failed %s", ("twice",), sys.exc_info())
+    handler.emit(record)
+
+    entry = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+    assert entry["message"] == "failed twice"
+    assert "ValueError: bad" in entry["exception"]
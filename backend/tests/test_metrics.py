@@ -0,0 +1,56 @@
+"""
+Tests for the /metrics endpoint and metric primitives.
+"""
+import threading
+from bson import ObjectId
+from app.metrics import Counter, Histogram
+
+
+async def test_metrics_endpoint(client, seed_profile):
+    """Test that requests are counted by route template, not raw path."""
+    await client.get("/skills")
+    await client.get(f"/profiles/{ObjectId()}")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    body = response.text
+
+    assert 'http_requests_total{method="GET",route="/skills",status="200"}' in body
+    assert 'http_requests_total{method="GET",route="/profiles/{profile_id}",status="404"}' in body
+    assert 'http_request_duration_seconds_bucket{method="GET",route="/skills",le="+Inf"}' in body
+    assert "# TYPE http_requests_in_flight gauge" in body
+    assert "profile_cache_hit_ratio" in body
+    assert "mongodb_command_duration_seconds" in body
+
+
+def test_histogram_render():
+    """Test cumulative buckets, sum and count."""
+    histogram = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.5, 0.5, 2.0):
+        histogram.observe(value, "/a")
+
+    lines = histogram.render()
+    assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/a",le="1.0"} 3' in lines
+    assert 'latency_seconds_bucket{route="/a",le="+Inf"} 4' in lines
+    assert 'latency_seconds_sum{route="/a"} 3.05' in lines
+    assert 'latency_seconds_count{route="/a"} 4' in lines
+
+
+def test_counter_shards_across_threads():
+    """Test that per-thread shards add up without locking."""
+    counter = Counter("events_total", "Events.", ("kind",))
+
+    def work():
+        for _ in range(1000):
+            counter.inc("x")
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert counter.values() == {("x",): 4000}
+    assert len(counter._shards) == 4
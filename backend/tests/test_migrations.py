@@ -0,0 +1,31 @@
+"""
+Tests for versioned index migrations.
+"""
+from datetime import datetime
+from app.database import get_database
+from app.migrations import LATEST_VERSION, MIGRATIONS, applied_versions, apply_migrations, verify_schema
+
+
+async def test_migrations_are_recorded_once(setup_database):
+    """Test that applied versions are recorded and not re-applied."""
+    db = get_database()
+    await apply_migrations(db)
+    assert (await applied_versions(db))[-1] == LATEST_VERSION
+    assert await apply_migrations(db) == []
+
+
+async def test_verify_schema(setup_database):
+    """Test that the background check sees the migrated indexes."""
+    status = await verify_schema(get_database())
+    assert status["version"] == LATEST_VERSION
+    assert status["missing_indexes"] == []
+
+
+async def test_updated_at_backfill(setup_database):
+    """Test that profiles written before updated_at existed get one."""
+    db = get_database()
+    await db.profiles.insert_one({"name": "Legacy", "email": "legacy@example.com", "version": 4})
+    await MIGRATIONS[3].apply(db)
+    legacy = await db.profiles.find_one({"email": "legacy@example.com"})
+    assert isinstance(legacy["updated_at"], datetime)
+    await db.profiles.delete_one({"_id": legacy["_id"]})
@@ -0,0 +1,92 @@
+"""
+Tests for MongoDB command monitoring and the slow-ops log.
+"""
+from types import SimpleNamespace
+from app.metrics import request_scope
+from app.mongo_monitoring import CommandMonitor
+
+
+def make_event(request_id, command_name="find", duration_ms=0.0, **extra):
+    return SimpleNamespace(
+        connection_id=("localhost", 27017),
+        request_id=request_id,
+        command_name=command_name,
+        command={command_name: "profiles", "filter": {}},
+        database_name="candidate_profile_test",
+        duration_micros=int(duration_ms * 1000),
+        reply={"cursor": {"firstBatch": [{"name": "x"}], "id": 0}, "ok": 1},
+        **extra
+    )
+
+
+def test_slow_commands_are_logged_with_route():
+    """Test that only commands over the threshold reach the slow log."""
+    monitor = CommandMonitor(slow_ms=50, slow_log_size=10)
+    token = request_scope.set({"path": "/projects", "route": SimpleNamespace(path="/projects")})
+    try:
+        monitor.started(make_event(1))
+        monitor.started(make_event(2))
+    finally:
+        request_scope.reset(token)
+    monitor.succeeded(make_event(1, duration_ms=5))
+    monitor.succeeded(make_event(2, duration_ms=120))
+
+    [operation] = monitor.recent_slow_ops()
+    assert operation["command"] == "find"
+    assert operation["collection"] == "profiles"
+    assert operation["route"] == "/projects"
+    assert operation["duration_ms"] == 120
+    assert operation["reply_bytes"] > 0
+
+
+def test_fast_replies_are_not_measured(monkeypatch):
+    """Test that only slow commands pay for encoding their reply."""
+    encoded = []
+    monkeypatch.setattr("app.mongo_monitoring.bson.encode", lambda reply: encoded.append(reply) or b"x" * 10)
+    monitor = CommandMonitor(slow_ms=50, slow_log_size=10)
+    monitor.started(make_event(1))
+    monitor.started(make_event(2))
+    monitor.succeeded(make_event(1, duration_ms=5))
+    monitor.succeeded(make_event(2, duration_ms=120))
+    assert len(encoded) == 1
+    assert monitor.recent_slow_ops()[0]["reply_bytes"] == 10
+
+
+def test_failures_and_ignored_commands():
+    """Test that failures are recorded and heartbeats are skipped."""
+    monitor = CommandMonitor(slow_ms=0, slow_log_size=10)
+    monitor.started(make_event(3, command_name="ping"))
+    monitor.succeeded(make_event(3, command_name="ping"))
+    assert monitor.recent_slow_ops() == []
+
+    monitor.started(make_event(4, command_name="aggregate"))
+    monitor.failed(make_event(4, command_name="aggregate", failure={"errmsg": "boom"}))
+    [operation] = monitor.recent_slow_ops()
+    assert operation["error"] == "boom"
+    assert operation["route"] is None
+
+    stats = monitor.command_stats()["aggregate"]
+    assert stats["count"] >= 1
+    assert stats["failures"] >= 1
+
+
+def test_slow_log_is_bounded():
+    """Test that the slow log keeps only the most recent entries."""
+    monitor = CommandMonitor(slow_ms=0, slow_log_size=3)
+    for request_id in range(10):
+        monitor.started(make_event(request_id))
+        monitor.succeeded(make_event(request_id, duration_ms=request_id))
+    assert [op["duration_ms"] for op in monitor.recent_slow_ops()] == [9, 8, 7]
+
+
+async def test_admin_mongo_requires_auth(client, auth_client):
+    """Test the admin endpoint."""
+    response = await client.get("/admin/mongo")
+    assert response.status_code == 401
+
+    response = await auth_client.get("/admin/mongo")
+    assert response.status_code == 200
+    data = response.json()
+    assert "commands" in data
+    assert "slow_ops" in data
+    assert data["slow_threshold_ms"] > 0
@@ -0,0 +1,107 @@
+"""
+Tests for the /profile/projects, /profile/work and /profile/education sub-resources.
+"""
+import pytest
+
+NEW_PROJECT = {
+    "title": "Granular Writes",
+    "description": "One project at a time",
+    "skills": ["MongoDB"],
+    "links": []
+}
+
+
+@pytest.mark.asyncio
+async def test_items_have_ids(client, seed_profile):
+    """Test that entries written with the profile get stable ids."""
+    response = await client.get("/profile/projects")
+    assert response.status_code == 200
+    [project] = response.json()
+    assert project["title"] == "Test Project"
+    assert project["id"]
+
+    profile = (await client.get("/profile")).json()
+    assert profile["projects"][0]["id"] == project["id"]
+
+
+@pytest.mark.asyncio
+async def test_add_item_requires_auth(client, seed_profile):
+    """Test that sub-resource writes need auth."""
+    response = await client.post("/profile/projects", json=NEW_PROJECT)
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_add_replace_delete_project(auth_client, seed_profile):
+    """Test the push / positional set / pull round trip."""
+    response = await auth_client.post("/profile/projects", json=NEW_PROJECT)
+    assert response.status_code == 201
+    created = response.json()
+    assert created["title"] == "Granular Writes"
+    project_id = created["id"]
+
+    profile = (await auth_client.get("/profile")).json()
+    assert [p["title"] for p in profile["projects"]] == ["Test Project", "Granular Writes"]
+
+    response = await auth_client.put(
+        f"/profile/projects/{project_id}", json={**NEW_PROJECT, "title": "Renamed"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {**NEW_PROJECT, "title": "Renamed", "id": project_id}
+
+    projects = (await auth_client.get("/profile/projects")).json()
+    assert projects[1]["title"] == "Renamed"
+
+    response = await auth_client.delete(f"/profile/projects/{project_id}")
+    assert response.status_code == 204
+    projects = (await auth_client.get("/profile/projects")).json()
+    assert [p["title"] for p in projects] == ["Test Project"]
+
+    response = await auth_client.delete(f"/profile/projects/{project_id}")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_writes_bump_version(auth_client, seed_profile):
+    """Test that the ETag changes after a sub-resource write."""
+    before = (await auth_client.get("/profile")).headers["ETag"]
+    await auth_client.post("/profile/work", json={
+        "title": "Engineer", "company": "Acme", "duration": "2024"
+    })
+    after = (await auth_client.get("/profile")).headers["ETag"]
+    assert before != after
+
+
+@pytest.mark.asyncio
+async def test_batch(auth_client, seed_profile):
+    """Test adding, replacing and removing entries in one bulk_write."""
+    [existing] = (await auth_client.get("/profile/education")).json()
+
+    response = await auth_client.post("/profile/education/batch", json={
+        "add": [
+            {"degree": "M.Tech", "institution": "Uni", "year": "2026"},
+            {"degree": "PhD", "institution": "Uni", "year": "2030"}
+        ],
+        "update": [{**existing, "year": "2025"}],
+        "remove": []
+    })
+    assert response.status_code == 200
+    data = response.json()
+    assert data["operations"] == 2
+    assert data["matched"] == 2
+    phd_id = data["added"][1]["id"]
+
+    response = await auth_client.post("/profile/education/batch", json={"remove": [phd_id]})
+    assert response.json()["matched"] == 1
+
+    education = (await auth_client.get("/profile/education")).json()
+    assert [(e["degree"], e["year"]) for e in education] == [("B.Tech", "2025"), ("M.Tech", "2026")]
+
+
+@pytest.mark.asyncio
+async def test_batch_update_needs_id(auth_client, seed_profile):
+    """Test that batch replacements must name their entry."""
+    response = await auth_client.post("/profile/work/batch", json={
+        "update": [{"title": "Engineer", "company": "Acme", "duration": "2024"}]
+    })
+    assert response.status_code == 400
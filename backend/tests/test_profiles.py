@@ -0,0 +1,194 @@
+"""
+Tests for id-addressed profile routes and the /profiles listing.
+"""
+import asyncio
+import json
+from types import SimpleNamespace
+import pytest
+from app.bulk_import import import_profiles
+
+
+def _profile(i):
+    return {"name": f"Candidate {i}", "email": f"candidate{i}@example.com", "skills": ["Python"] if i % 2 else ["Go"]}
+
+
+@pytest.fixture
+async def many_profiles(auth_client, seed_profile):
+    """Create a handful of extra profiles and remove them afterwards."""
+    ids = []
+    for i in range(5):
+        response = await auth_client.post("/profiles", json=_profile(i))
+        ids.append(response.json()["id"])
+    yield ids
+    for profile_id in ids:
+        await auth_client.delete(f"/profiles/{profile_id}")
+
+
+@pytest.mark.asyncio
+async def test_create_requires_auth(client):
+    """Test that creating a profile without auth returns 401."""
+    response = await client.post("/profiles", json=_profile(0))
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_duplicate_email_conflicts(auth_client, many_profiles):
+    """Test that the unique email index surfaces as 409."""
+    response = await auth_client.post("/profiles", json=_profile(0))
+    assert response.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_get_update_delete_by_id(auth_client, many_profiles):
+    """Test id-addressed read, update and delete."""
+    profile_id = many_profiles[0]
+    response = await auth_client.get(f"/profiles/{profile_id}")
+    assert response.status_code == 200
+    assert response.json()["name"] == "Candidate 0"
+
+    response = await auth_client.put(f"/profiles/{profile_id}", json={"name": "Renamed"})
+    assert response.status_code == 200
+    assert response.json()["name"] == "Renamed"
+
+    response = await auth_client.get("/profiles/000000000000000000000000")
+    assert response.status_code == 404
+    response = await auth_client.get("/profiles/not-an-id")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_keyset(client, many_profiles):
+    """Test walking the listing with next_cursor and field projection."""
+    seen = []
+    response = await client.get("/profiles?limit=2&sort=email&fields=name")
+    while True:
+        data = response.json()
+        seen += data["profiles"]
+        if not data["next_cursor"]:
+            break
+        response = await client.get(f"/profiles?limit=2&sort=email&fields=name&cursor={data['next_cursor']}")
+
+    assert len(seen) == 6
+    assert all(set(p) == {"id", "name"} for p in seen)
+    assert data["estimated_total"] == 6
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_by_skill(client, many_profiles):
+    """Test filtering the listing by an exact skill."""
+    response = await client.get("/profiles?skill=Go&fields=name,skills")
+    data = response.json()
+    assert data["count"] == 3
+    assert data["estimated_total"] is None
+    assert all("Go" in p["skills"] for p in data["profiles"])
+
+
+@pytest.mark.asyncio
+async def test_list_profiles_rejects_unknown_fields(client):
+    """Test that projection is limited to known fields."""
+    response = await client.get("/profiles?fields=password")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_import_requires_auth(client):
+    """Test that the import endpoint requires auth."""
+    response = await client.post("/profiles/import", content=b"")
+    assert response.status_code == 401
+
+
+@pytest.mark.asyncio
+async def test_import_ndjson(auth_client, seed_profile):
+    """Test streaming import with per-batch error reporting."""
+    import json
+
+    lines = [json.dumps(_profile(i)) for i in range(10, 15)]
+    lines.insert(2, "{not json")
+    lines.insert(4, json.dumps({"name": "No Email"}))
+    lines.append(json.dumps(_profile(10)))  # duplicate email
+    body = ("\n".join(lines) + "\n").encode()
+
+    response = await auth_client.post("/profiles/import?batch_size=3&concurrency=2", content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["summary"]["lines"] == 8
+    assert data["summary"]["written"] == 5
+    assert data["summary"]["failed"] == 3
+    errors = [e for b in data["batches"] for e in b["validation_errors"] + b["write_errors"]]
+    assert sorted(e["line"] for e in errors) == [3, 5, 8]
+
+    listing = (await auth_client.get("/profiles?limit=100&fields=email")).json()
+    for profile in listing["profiles"]:
+        if profile["email"].startswith("candidate1"):
+            await auth_client.delete(f"/profiles/{profile['id']}")
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_invalid_utf8(auth_client, seed_profile):
+    """Test that a line with invalid UTF-8 is reported, not a server error."""
+    import json
+
+    body = b'{"name": "B\xff", "email": "b@example.com"}\n' + json.dumps(_profile(20)).encode() + b"\n"
+    response = await auth_client.post("/profiles/import", content=body)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["summary"]["written"] == 1
+    [error] = data["batches"][0]["validation_errors"]
+    assert error["line"] == 1
+    assert error["error"].startswith("Invalid UTF-8")
+
+    listing = (await auth_client.get("/profiles?limit=100&fields=email")).json()
+    for profile in listing["profiles"]:
+        if profile["email"] == "candidate20@example.com":
+            await auth_client.delete(f"/profiles/{profile['id']}")
+
+
+async def _lines(count, fail_after=None):
+    for i in range(count):
+        if i == fail_after:
+            # Let the batches already handed off reach bulk_write
+            await asyncio.sleep(0.05)
+            raise ConnectionResetError("client went away")
+        yield i + 1, json.dumps(_profile(100 + i)).encode()
+
+
+class FlakyCollection:
+    """bulk_write fails with a network error on the first call, or hangs when told to."""
+
+    def __init__(self, hang=False):
+        self.calls = 0
+        self.hang = hang
+        self.cancelled = 0
+
+    async def bulk_write(self, operations, ordered):
+        self.calls += 1
+        if self.hang:
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        if self.calls == 1:
+            raise ConnectionError("connection reset")
+        return SimpleNamespace(inserted_count=0, upserted_count=len(operations), modified_count=0)
+
+
+@pytest.mark.asyncio
+async def test_import_reports_failed_batch_write():
+    """Test that a batch whose bulk_write raises is reported failed, not dropped."""
+    report = await import_profiles(FlakyCollection(), _lines(6), batch_size=2, concurrency=1)
+    summary = report.summary()
+    assert (summary["written"], summary["failed"]) == (4, 2)
+    [failed] = report.to_dict()["batches"]
+    assert [e["line"] for e in failed["write_errors"]] == [1, 2]
+    assert failed["write_errors"][0]["error"] == "Batch failed: connection reset"
+
+
+@pytest.mark.asyncio
+async def test_import_cancels_batches_when_input_fails():
+    """Test that a failing input stream cancels the batches still in flight."""
+    collection = FlakyCollection(hang=True)
+    with pytest.raises(ConnectionResetError):
+        await import_profiles(collection, _lines(6, fail_after=5), batch_size=2, concurrency=4)
+    assert collection.calls == 2
+    assert collection.cancelled == 2
@@ -98,3 +98,150 @@ async def test_search_no_results(client, seed_profile):
     assert data["query"] == "xyz123nonexistent"
     assert len(data["matches"]["skills"]) == 0
     assert len(data["matches"]["projects"]) == 0
+
+
+@pytest.mark.asyncio
+async def test_get_projects_with_multiple_skills(client, seed_profile):
+    """Test combining skill filters with all/any modes."""
+    response = await client.get("/projects?skill=python&skill=fastapi&mode=all")
+    assert response.json()["total"] == 1
+
+    response = await client.get("/projects?skill=python&skill=rust&mode=all")
+    assert response.json()["total"] == 0
+
+    response = await client.get("/projects?skill=python&skill=rust&mode=any")
+    assert response.json()["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_projects_with_excluded_skill(client, seed_profile):
+    """Test excluding projects by skill."""
+    response = await client.get("/projects?exclude_skill=fastapi")
+    assert response.status_code == 200
+    assert response.json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_get_projects_pipeline_mode(client, seed_profile, monkeypatch):
+    """Test that the aggregation pipeline path matches the in-process path."""
+    from app.routers.query import settings
+
+    urls = [
+        "/projects",
+        "/projects?skill=python",
+        "/projects?skill=python&skill=rust&mode=any",
+        "/projects?exclude_skill=fastapi",
+        "/projects?page=2&page_size=1",
+    ]
+    expected = [(await client.get(url)).json() for url in urls]
+
+    monkeypatch.setattr(settings, "projects_query_mode", "pipeline")
+    for url, data in zip(urls, expected):
+        response = await client.get(url)
+        assert response.status_code == 200
+        assert response.json() == data
+
+
+@pytest.mark.asyncio
+async def test_pipeline_mode_etag_reads_only_version(client, seed_profile, monkeypatch):
+    """Test that pipeline mode computes the ETag without loading the cached profile."""
+    from app.cache import profile_cache
+    from app.routers.query import settings
+
+    monkeypatch.setattr(settings, "projects_query_mode", "pipeline")
+    loads = []
+    get = profile_cache.get
+
+    async def counting_get():
+        loads.append(1)
+        return await get()
+
+    monkeypatch.setattr(profile_cache, "get", counting_get)
+    response = await client.get("/projects?page_size=1")
+    assert response.status_code == 200
+    assert response.json()["count"] == 1
+    etag = response.headers["etag"]
+
+    response = await client.get("/projects?page_size=1", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert loads == []
+
+
+@pytest.mark.asyncio
+async def test_get_skill_count(client, seed_profile):
+    """Test counting a single skill."""
+    response = await client.get("/skills/count?skill=Python")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["skill"] == "python"
+    assert data["count"] == 2
+
+
+async def _put_projects(auth_client, count):
+    projects = [
+        {"title": f"Project {i}", "description": f"Python project {i}", "skills": ["Python"]}
+        for i in range(count)
+    ]
+    await auth_client.put("/profile", json={"projects": projects})
+
+
+@pytest.mark.asyncio
+async def test_get_projects_cursor_pagination(auth_client, seed_profile):
+    """Test walking all projects with next_cursor."""
+    await _put_projects(auth_client, 5)
+
+    titles = []
+    response = await auth_client.get("/projects?page_size=2")
+    while True:
+        data = response.json()
+        titles += [p["title"] for p in data["projects"]]
+        if not data["next_cursor"]:
+            break
+        response = await auth_client.get(f"/projects?page_size=2&cursor={data['next_cursor']}")
+
+    assert titles == [f"Project {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_get_projects_cursor_stable_under_writes(auth_client, seed_profile):
+    """Test that a cursor resumes after the last-seen project after an insert."""
+    await _put_projects(auth_client, 4)
+    data = (await auth_client.get("/projects?page_size=2")).json()
+
+    profile = (await auth_client.get("/profile")).json()
+    projects = [{"title": "New", "description": "Inserted first", "skills": []}] + profile["projects"]
+    await auth_client.put("/profile", json={"projects": projects})
+
+    response = await auth_client.get(f"/projects?page_size=2&cursor={data['next_cursor']}")
+    assert [p["title"] for p in response.json()["projects"]] == ["Project 2", "Project 3"]
+
+
+@pytest.mark.asyncio
+async def test_cursor_rejected_for_other_query(auth_client, seed_profile):
+    """Test that tampered or mismatched cursors are rejected."""
+    await _put_projects(auth_client, 3)
+    data = (await auth_client.get("/projects?page_size=1")).json()
+
+    response = await auth_client.get(f"/projects?skill=python&cursor={data['next_cursor']}")
+    assert response.status_code == 400
+
+    response = await auth_client.get("/projects?cursor=not-a-cursor")
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_search_cursor_pagination(auth_client, seed_profile):
+    """Test walking ranked search results with next_cursor."""
+    await _put_projects(auth_client, 5)
+
+    titles = []
+    response = await auth_client.get("/search?q=python&page_size=2")
+    while True:
+        data = response.json()
+        titles += [p["title"] for p in data["matches"]["projects"]]
+        if not data["next_cursor"]:
+            break
+        response = await auth_client.get(f"/search?q=python&page_size=2&cursor={data['next_cursor']}")
+
+    assert sorted(titles) == [f"Project {i}" for i in range(5)]
+    assert len(titles) == 5
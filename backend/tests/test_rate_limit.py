@@ -0,0 +1,228 @@
+"""
+Tests for the token bucket rate limiter.
+"""
+import logging
+import time
+from datetime import datetime, timezone
+import pytest
+from httpx import AsyncClient, ASGITransport
+from pymongo.errors import ServerSelectionTimeoutError
+from starlette.responses import PlainTextResponse
+from app.rate_limit import RateLimiter, RateLimitMiddleware, SharedRateLimiter
+from app.rate_limit_store import MongoRateLimitStore, RateLimitStoreFull, SharedMemoryRateLimitStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_bucket_exhausts_and_refills():
+    """Test that a client is limited, then refilled over time."""
+    clock = FakeClock()
+    limiter = RateLimiter(requests_per_minute=60, clock=clock)
+
+    for expected_remaining in range(59, -1, -1):
+        allowed, remaining, _ = limiter.consume("ip")
+        assert allowed
+        assert remaining == expected_remaining
+
+    allowed, remaining, retry_after = limiter.consume("ip")
+    assert not allowed
+    assert remaining == 0
+    assert retry_after == 1.0
+
+    clock.now += 1
+    allowed, _, _ = limiter.consume("ip")
+    assert allowed
+
+
+def test_route_costs():
+    """Test that weighted routes consume more tokens."""
+    limiter = RateLimiter(requests_per_minute=10, route_costs={"/search": 4}, clock=FakeClock())
+    assert limiter.cost_of("/search") == 4
+    assert limiter.cost_of("/skills") == 1
+
+    assert limiter.consume("ip", 4)[1] == 6
+    assert limiter.consume("ip", 4)[1] == 2
+    assert limiter.consume("ip", 4)[0] is False
+    assert limiter.consume("ip", 1)[0] is True
+
+
+def test_tracked_clients_are_bounded():
+    """Test that idle clients are evicted least recently used first."""
+    limiter = RateLimiter(requests_per_minute=60, max_clients=3, clock=FakeClock())
+    for key in ["a", "b", "c"]:
+        limiter.consume(key)
+    limiter.consume("a")
+    limiter.consume("d")
+
+    assert len(limiter.buckets) == 3
+    assert list(limiter.buckets) == ["c", "a", "d"]
+
+
+class FakeStore:
+    """Counts leases the way the shared stores do."""
+
+    def __init__(self):
+        self.used = {}
+        self.calls = 0
+
+    async def lease(self, key, window, want, limit):
+        self.calls += 1
+        used = self.used.get((key, window), 0)
+        granted = max(0, min(want, limit - used))
+        self.used[(key, window)] = used + granted
+        return granted, used + granted
+
+
+async def test_shared_limiter_leases_tokens():
+    """Test that workers share one budget and only hit the store per lease."""
+    clock = FakeClock()
+    store = FakeStore()
+    workers = [
+        SharedRateLimiter(store, lease_size=5, requests_per_minute=20, clock=clock, wall_clock=clock)
+        for _ in range(2)
+    ]
+
+    allowed = 0
+    for i in range(40):
+        ok, _, _ = await workers[i % 2].consume_shared("ip")
+        allowed += ok
+    assert allowed == 20
+    assert store.calls <= 6
+
+    clock.now += 60
+    ok, _, _ = await workers[0].consume_shared("ip")
+    assert ok
+
+
+async def test_shared_memory_store(tmp_path):
+    """Test that the shared memory store caps leases per window."""
+    store = SharedMemoryRateLimitStore(f"rl_test_{tmp_path.name}", slots=16)
+    try:
+        assert await store.lease("ip", 1, 8, 10) == (8, 8)
+        assert await store.lease("ip", 1, 8, 10) == (2, 10)
+        assert await store.lease("ip", 1, 8, 10) == (0, 10)
+        assert await store.lease("ip", 2, 8, 10) == (8, 8)
+    finally:
+        store.close(unlink=True)
+
+
+class DownStore:
+    """A shared store whose backend is unreachable."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def lease(self, key, window, want, limit):
+        self.calls += 1
+        raise ServerSelectionTimeoutError("mongo is down")
+
+
+async def test_shared_limiter_falls_back_when_store_fails(caplog):
+    """Test that a failing store degrades to the local bucket instead of failing requests."""
+    clock = FakeClock()
+    store = DownStore()
+    limiter = SharedRateLimiter(store, lease_size=5, requests_per_minute=3, clock=clock)
+
+    with caplog.at_level(logging.WARNING, logger="app.rate_limit"):
+        results = [(await limiter.consume_shared("ip"))[0] for _ in range(4)]
+    assert results == [True, True, True, False]
+    # The store is left alone until the retry delay passes
+    assert store.calls == 1
+    assert len([r for r in caplog.records if r.name == "app.rate_limit"]) == 1
+
+    clock.now += limiter.store_retry_seconds
+    await limiter.consume_shared("other")
+    assert store.calls == 2
+
+
+async def test_middleware_survives_store_failure():
+    """Test that a shared store outage doesn't turn requests into 500s."""
+    limiter = SharedRateLimiter(DownStore(), requests_per_minute=2, clock=FakeClock())
+    app = RateLimitMiddleware(PlainTextResponse("ok"), limiter=limiter)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        assert (await client.get("/skills")).status_code == 200
+        assert (await client.get("/skills")).status_code == 200
+        assert (await client.get("/skills")).status_code == 429
+
+
+async def test_shared_memory_store_rejects_when_full(tmp_path):
+    """Test that a full table refuses a new client instead of resetting another's count."""
+    store = SharedMemoryRateLimitStore(f"rl_full_{tmp_path.name}", slots=1)
+    try:
+        clock = FakeClock()
+        window = int(clock() // 60)
+        assert await store.lease("a", window, 8, 10) == (8, 8)
+        with pytest.raises(RateLimitStoreFull):
+            await store.lease("b", window, 8, 10)
+        assert await store.lease("a", window, 8, 10) == (2, 10)
+
+        # The limiter counts a refused client in its own bucket
+        limiter = SharedRateLimiter(store, requests_per_minute=10, clock=clock, wall_clock=clock)
+        ok, _, _ = await limiter.consume_shared("c")
+        assert ok
+        assert "c" in limiter.buckets
+
+        # Once a's window is over its slot can be taken
+        assert await store.lease("b", window + 1, 8, 10) == (8, 8)
+    finally:
+        store.close(unlink=True)
+
+
+async def test_mongo_store(setup_database):
+    """Test that the MongoDB store caps leases per client and window."""
+    store = MongoRateLimitStore(collection_name="rate_limits_test")
+    assert await store.lease("ip", 1, 8, 10) == (8, 8)
+    assert await store.lease("ip", 1, 8, 10) == (2, 10)
+    assert await store.lease("ip", 1, 8, 10) == (0, 10)
+    assert await store.lease("ip", 2, 8, 10) == (8, 8)
+    assert await store.lease("other", 1, 3, 10) == (3, 3)
+
+
+async def test_mongo_windows_follow_wall_clock(setup_database):
+    """Test that replicas agree on window ids and that expire_at is a real, future date."""
+    from app.database import get_database
+
+    store = MongoRateLimitStore(collection_name="rate_limits_clock_test")
+    replicas = [SharedRateLimiter(store, lease_size=2, requests_per_minute=10) for _ in range(2)]
+    before = time.time()
+    for replica in replicas:
+        await replica.consume_shared("ip")
+
+    window = int(before // 60)
+    if int(time.time() // 60) != window:
+        pytest.skip("crossed a minute boundary mid-test")
+    document = await get_database()["rate_limits_clock_test"].find_one({"_id": f"ip:{window}"})
+    # Both replicas leased from the same window document
+    assert document["count"] == 4
+    expire_at = document["expire_at"]
+    if expire_at.tzinfo is None:
+        expire_at = expire_at.replace(tzinfo=timezone.utc)
+    assert expire_at == datetime.fromtimestamp((window + 2) * 60, tz=timezone.utc)
+    assert expire_at > datetime.now(timezone.utc)
+
+
+async def test_middleware_rejects_with_429():
+    """Test that the middleware answers over-limit requests with 429, not 500."""
+    app = RateLimitMiddleware(
+        PlainTextResponse("ok"), limiter=RateLimiter(requests_per_minute=2, clock=FakeClock())
+    )
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        for expected_remaining in ("1", "0"):
+            response = await client.get("/skills")
+            assert response.status_code == 200
+            assert response.headers["X-RateLimit-Remaining"] == expected_remaining
+
+        response = await client.get("/skills")
+        assert response.status_code == 429
+        assert response.json()["detail"].startswith("Rate limit exceeded")
+        assert response.headers["Retry-After"] == "30"
+
+        response = await client.get("/health")
+        assert response.status_code == 200
@@ -0,0 +1,49 @@
+"""
+Tests for the fast JSON response path.
+"""
+from bson import ObjectId
+from app.models import ProfileResponse
+from app.responses import FastJSONResponse, dumps, fast_json
+from app.routers.profile import build_profile_json, profile_helper
+from app.seed import SEED_DATA
+from fastapi import Response
+
+
+async def test_profile_body_matches_response_model(client, seed_profile):
+    """Test that the cached /profile body equals the validated model output."""
+    response = await client.get("/profile")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert "ETag" in response.headers
+    data = response.json()
+    assert data == ProfileResponse.model_validate(data).model_dump(mode="json")
+
+
+def test_profile_json_skips_validation_but_matches_model():
+    """Test that build_profile_json fills defaults exactly as the response model would."""
+    sparse = {
+        "_id": ObjectId(),
+        "name": "Jane",
+        "email": "jane@example.com",
+        "projects": [{"title": "Site", "description": "Personal site"}],
+        "work": [{"title": "Dev", "company": "Acme", "duration": "2020"}],
+    }
+    for document in ({"_id": ObjectId(), **SEED_DATA}, sparse):
+        expected = ProfileResponse.model_validate(profile_helper(document)).model_dump(mode="json")
+        assert build_profile_json(document) == dumps(expected)
+
+
+def test_fast_json_encodes_object_ids_and_keeps_headers():
+    """Test ObjectId encoding and header carry-over from the injected response."""
+    oid = ObjectId()
+    injected = Response()
+    injected.headers["ETag"] = '"abc"'
+    response = fast_json({"id": oid}, injected)
+    assert response.body == f'{{"id":"{oid}"}}'.encode()
+    assert response.headers["etag"] == '"abc"'
+    assert response.headers["content-length"] == str(len(response.body))
+
+
+def test_pre_encoded_bytes_pass_through():
+    """Test that cached bytes are sent as they are."""
+    assert FastJSONResponse(b'{"a":1}').body == b'{"a":1}'
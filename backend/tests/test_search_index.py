@@ -0,0 +1,79 @@
+"""
+Tests for the inverted-index search engine.
+"""
+from app.search_index import SearchEngine, parse_query
+
+PROFILE = {
+    "name": "Test User",
+    "skills": ["Python", "FastAPI", "C++"],
+    "projects": [
+        {
+            "title": "Python Web API",
+            "description": "A REST service",
+            "skills": ["FastAPI"]
+        },
+        {
+            "title": "Image Classifier",
+            "description": "Deep learning model written in python",
+            "skills": ["PyTorch"]
+        },
+        {
+            "title": "Game Engine",
+            "description": "Rendering engine for web games",
+            "skills": ["C++"]
+        }
+    ],
+    "work": [
+        {"title": "Developer", "company": "Test Corp", "duration": "2023-2024"}
+    ]
+}
+
+
+def titles(engine, q):
+    return [PROFILE["projects"][i]["title"] for i, _ in engine.search(q).projects]
+
+
+def test_parse_query():
+    """Test phrase, OR and exclusion parsing."""
+    query = parse_query('python OR go "web api" -java NOT rust')
+    assert query.groups == [[("python",), ("go",)], [("web", "api")]]
+    assert query.excluded == [("java",), ("rust",)]
+
+
+def test_title_matches_rank_first():
+    """Test that title matches outrank description matches."""
+    engine = SearchEngine(PROFILE)
+    assert titles(engine, "python") == ["Python Web API", "Image Classifier"]
+
+
+def test_phrase_and_boolean_queries():
+    """Test phrase queries, OR and exclusion."""
+    engine = SearchEngine(PROFILE)
+    assert titles(engine, '"web api"') == ["Python Web API"]
+    assert titles(engine, '"api web"') == []
+    assert set(titles(engine, "pytorch OR c++")) == {"Image Classifier", "Game Engine"}
+    assert titles(engine, "web -python") == ["Game Engine"]
+
+
+def test_exclusion_only_query_matches_nothing():
+    """Test that a query of exclusions alone returns no results and no name match."""
+    results = SearchEngine(PROFILE).search("-python")
+    assert results == (False, [], [], [])
+
+
+def test_prefix_matching():
+    """Test that terms match word prefixes."""
+    engine = SearchEngine(PROFILE)
+    assert titles(engine, "classif") == ["Image Classifier"]
+    assert engine.search("dev").work[0][0] == 0
+    assert engine.search("user").name
+
+
+def test_rebuild_reuses_unchanged_documents():
+    """Test that a rebuilt engine reuses tokenization for unchanged entries."""
+    engine = SearchEngine(PROFILE)
+    updated = dict(PROFILE, projects=PROFILE["projects"][:2])
+    rebuilt = SearchEngine(updated, previous=engine)
+    key = next(iter(rebuilt._analyzed))
+    assert rebuilt._analyzed[key] is engine._analyzed[key]
+    assert titles(rebuilt, "engine") == []
@@ -0,0 +1,83 @@
+"""
+Tests for TF-IDF project similarity and the similar/recommend endpoints.
+"""
+import asyncio
+import threading
+import pytest
+from app.cache import ProfileSnapshot
+from app.similarity import ProjectVectors
+
+PROJECTS = [
+    {"title": "REST API", "description": "A web service built with FastAPI and MongoDB", "skills": ["Python", "FastAPI"]},
+    {"title": "Image Classifier", "description": "Deep learning model for photos", "skills": ["Python", "PyTorch"]},
+    {"title": "GraphQL API", "description": "A web service with a typed schema", "skills": ["Python", "FastAPI", "GraphQL"]},
+    {"title": "Game Engine", "description": "Rendering engine", "skills": ["C++"]},
+]
+
+
+def test_similar_projects_rank_by_cosine():
+    """Test that the most similar project comes first and the project itself is excluded."""
+    vectors = ProjectVectors(PROJECTS)
+    ranked = vectors.similar(0, 2)
+    assert [i for i, _ in ranked] == [2, 1]
+    assert 1.0 >= ranked[0][1] > ranked[1][1] > 0
+    # Nothing shares a term with the game engine
+    assert vectors.similar(3, 5) == []
+
+
+def test_recommend_by_skills():
+    """Test skill-based recommendation."""
+    vectors = ProjectVectors(PROJECTS)
+    assert vectors.recommend(["PyTorch"], 5)[0][0] == 1
+    assert [i for i, _ in vectors.recommend(["GraphQL", "FastAPI"], 2)] == [2, 0]
+    assert vectors.recommend(["Haskell"], 5) == []
+    assert ProjectVectors([]).recommend(["Python"], 5) == []
+
+
+@pytest.mark.asyncio
+async def test_derive_in_executor_builds_once_off_the_loop():
+    """Test that concurrent callers share one build running in another thread."""
+    calls = []
+
+    def builder(document, previous):
+        calls.append(threading.get_ident())
+        return len(document["projects"])
+
+    snapshot = ProfileSnapshot({"projects": PROJECTS}, 1)
+    results = await asyncio.gather(*(snapshot.derive_in_executor("count", builder) for _ in range(5)))
+    assert results == [4] * 5
+    assert calls != [threading.get_ident()] and len(calls) == 1
+    assert snapshot.derive("count", builder) == 4
+
+
+@pytest.mark.asyncio
+async def test_similar_endpoint(auth_client, seed_profile):
+    """Test GET /projects/{id}/similar."""
+    for project in PROJECTS[:2]:
+        await auth_client.post("/profile/projects", json=project)
+    projects = (await auth_client.get("/profile/projects")).json()
+
+    response = await auth_client.get(f"/projects/{projects[1]['id']}/similar?limit=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["project"]["title"] == "REST API"
+    [similar] = data["similar"]
+    assert similar["title"] == "Test Project"
+    assert 0 < similar["score"] <= 1
+
+    response = await auth_client.get("/projects/000000000000000000000000/similar")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_recommend_endpoint(auth_client, seed_profile):
+    """Test GET /projects/recommend."""
+    await auth_client.post("/profile/projects", json=PROJECTS[1])
+    response = await auth_client.get("/projects/recommend?skill=pytorch&skill=deep%20learning")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["skills"] == ["pytorch", "deep learning"]
+    assert [p["title"] for p in data["projects"]] == ["Image Classifier"]
+
+    response = await auth_client.get("/projects/recommend")
+    assert response.status_code == 422
@@ -0,0 +1,101 @@
+"""
+Tests for the materialized skill frequency view.
+"""
+from collections import Counter
+from app.cache import ItemEdit, ProfileCache
+from app.skill_stats import SkillFrequencyView, build_skill_frequency
+
+PROFILE = {
+    "skills": ["Python", "React"],
+    "projects": [
+        {"title": "A", "skills": ["Python", "FastAPI"]},
+        {"title": "B", "skills": ["Python", "Docker"]},
+    ]
+}
+
+
+def full_counts(profile):
+    counts = Counter()
+    for project in profile.get("projects", []):
+        for skill in project.get("skills", []):
+            counts[skill.lower()] += 1
+    for skill in profile.get("skills", []):
+        counts[skill.lower()] += 1
+    return dict(counts)
+
+
+def test_build_counts_and_top():
+    """Test counts and top-k ordering of a fresh view."""
+    view = SkillFrequencyView.build(PROFILE)
+    assert view.counts == full_counts(PROFILE)
+    assert view.most_common(1) == [("python", 3)]
+    assert view.count("PYTHON") == 3
+    assert view.count("rust") == 0
+
+
+def test_advance_applies_deltas():
+    """Test that adding, changing and removing projects updates counts."""
+    view = SkillFrequencyView.build(PROFILE)
+    updated = {
+        "skills": ["Python"],
+        "projects": [
+            {"title": "A", "skills": ["Python", "FastAPI"]},
+            {"title": "C", "skills": ["Rust", "Docker"]},
+            {"title": "D", "skills": ["Rust"]},
+        ]
+    }
+    advanced = view.advance(updated)
+    assert advanced.counts == full_counts(updated)
+    assert advanced.most_common(2) == [("python", 2), ("rust", 2)]
+    assert "react" not in advanced.counts
+    # The original view is left untouched
+    assert view.counts == full_counts(PROFILE)
+
+
+def test_advance_to_deleted_profile():
+    """Test that a deleted profile empties the view."""
+    view = SkillFrequencyView.build(PROFILE).advance(None)
+    assert view.counts == {}
+    assert view.most_common(5) == []
+
+
+def test_ties_do_not_depend_on_history():
+    """Test that an advanced view and a fresh build order tied skills the same way."""
+    first = {"projects": [{"title": "A", "skills": ["Rust"]}]}
+    second = {"projects": [{"title": "A", "skills": ["Rust"]}, {"title": "B", "skills": ["Go"]}]}
+    advanced = SkillFrequencyView.build(first).advance(second)
+    fresh = SkillFrequencyView.build(second)
+    assert advanced.most_common(2) == fresh.most_common(2) == [("go", 1), ("rust", 1)]
+
+
+def test_advance_with_edit_counts_only_the_entry(monkeypatch):
+    """Test that a single-entry edit updates counts without diffing the profile."""
+    view = SkillFrequencyView.build(PROFILE)
+    replaced = {"title": "B", "skills": ["Go", "Docker"]}
+    updated = {**PROFILE, "projects": [PROFILE["projects"][0], replaced]}
+    monkeypatch.setattr("app.skill_stats._project_skills", None)
+    advanced = view.advance(updated, ItemEdit("projects", PROFILE["projects"][1], replaced))
+    assert advanced.counts == full_counts(updated)
+    # Entries outside projects don't count
+    assert advanced.advance(updated, ItemEdit("work", None, {"title": "Dev"})).counts == advanced.counts
+
+
+def test_cache_apply_hands_the_edit_to_the_view():
+    """Test that ProfileCache.apply records the entry before and after."""
+    cache = ProfileCache(ttl_seconds=60)
+    projects = [{**project, "id": str(i)} for i, project in enumerate(PROFILE["projects"])]
+    cache.publish({"_id": 1, "version": 1, **PROFILE, "projects": projects})
+    snapshot = cache._snapshot
+    # Reads the edit of whichever snapshot `snapshot` names when it runs
+    frequency = lambda profile, previous: build_skill_frequency(profile, previous, snapshot.edit)
+    snapshot.derive("skill_frequency", frequency)
+
+    added = {"id": "2", "title": "C", "skills": ["Rust"]}
+    cache.apply(1, 2, lambda doc: {**doc, "projects": [*doc["projects"], added]}, edited=("projects", "2"))
+    snapshot = cache._snapshot
+    assert snapshot.edit == ItemEdit("projects", None, added)
+    assert snapshot.derive("skill_frequency", frequency).counts == full_counts(snapshot.document)
+
+    # A version gap means other writes landed: no edit to trust
+    cache.apply(1, 5, lambda doc: doc, edited=("projects", "0"))
+    assert cache._snapshot is None
@@ -655,14 +655,13 @@ function App() {
   const loadData = async () => {
     try {
       setLoading(true);
-      const [profileData, projectsData, topSkillsData] = await Promise.all([
-        api.getProfile(),
-        api.getProjects(),
-        api.getTopSkills(5),
-      ]);
-      setProfile(profileData);
-      setProjects(projectsData.projects || []);
-      setTopSkills(topSkillsData.top_skills || []);
+      const bundle = await api.getBundle(['profile', 'projects', 'top_skills']);
+      if (!bundle.profile) {
+        throw new Error('Profile not found');
+      }
+      setProfile(bundle.profile);
+      setProjects(bundle.projects.projects || []);
+      setTopSkills(bundle.top_skills.top_skills || []);
       setError(null);
     } catch (err) {
       setError('Failed to load data. Make sure the backend is running.');
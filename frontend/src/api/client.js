@@ -103,6 +103,13 @@ class ApiClient {
         return this.request(`/skills/top?limit=${limit}`);
     }
 
+    // Several reads in one round trip; parts: profile, skills, top_skills, projects
+    async getBundle(include = ['profile', 'projects', 'top_skills'], { topLimit = 5, page = 1, pageSize = 10 } = {}) {
+        return this.request(
+            `/bundle?include=${include.join(',')}&top_limit=${topLimit}&page=${page}&page_size=${pageSize}`
+        );
+    }
+
     async search(query, page = 1, pageSize = 10) {
         return this.request(`/search?q=${encodeURIComponent(query)}&page=${page}&page_size=${pageSize}`);
     }